@@ -0,0 +1,494 @@
+import os
+import gc
+import json
+import time
+import argparse
+import sys
+import platform
+import subprocess
+import tempfile
+import tracemalloc
+from utils.corpus_utils import build_vocabulary, generate_corpus, generate_queries
+from utils.dense_vsm_utils import (
+    DENSE_METHODS,
+    build_dense_model,
+    recall_at_k,
+    search_top_k_dense,
+)
+from utils.document_reader_utils import (
+    DocumentError,
+    load_dict,
+    load_stopwords,
+    read_file,
+)
+from utils.index_utils import build_inverted_index, compute_index_weights, search_top_k
+from utils.sparse_vsm_utils import build_tf_idf_matrix
+from utils.stem_cache_utils import CachedStemmer
+from utils.stem_table_utils import create_base_stemmer
+from utils.text_utils import compute_similarity, list_files, preprocess, process_query
+from utils.tokenizer_utils import DEFAULT_TOKENIZER, TOKENIZERS
+from utils.vsm_utils import compute_tf_idf
+
+RESULTS_DIR = "./benchmarks"
+# Modul aplikasi yang diimpor main.py (tanpa Streamlit) untuk mengukur waktu start, dan
+# modul berat yang seharusnya baru diimpor saat pertama dibutuhkan.
+STARTUP_MODULES = [
+    "build_index",
+    "utils.engine_utils",
+    "utils.job_utils",
+    "utils.profiling_utils",
+    "utils.resource_utils",
+    "utils.result_cache_utils",
+    "utils.storage_utils",
+    "utils.text_utils",
+    "utils.tokenizer_utils",
+]
+LAZY_MODULES = ["scipy", "Sastrawi", "docx", "PyPDF2", "nltk"]
+STARTUP_SCRIPT = """
+import sys, json, time, importlib
+names = json.loads(sys.argv[1])
+start = time.perf_counter()
+for name in names["startup"]:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [name for name in names["lazy"] if name in sys.modules]]))
+"""
+
+
+def percentile(values, fraction):
+    """
+    Menghitung persentil dengan metode nearest-rank.
+
+    Parameters:
+        values (list): Nilai yang sudah diurutkan.
+        fraction (float): Persentil dalam rentang 0 sampai 1.
+
+    Returns:
+        float: Nilai persentil, atau 0 jika daftar kosong.
+    """
+    if not values:
+        return 0.0
+    position = max(0, min(len(values) - 1, int(round(fraction * len(values))) - 1))
+    return values[position]
+
+
+def summarize(latencies, units=None, peak_memory=None):
+    """
+    Meringkas latensi per pemanggilan sebuah tahap.
+
+    Parameters:
+        latencies (list): Durasi setiap pemanggilan dalam detik.
+        units (int, optional): Jumlah unit kerja (misalnya token) untuk menghitung throughput.
+        peak_memory (int, optional): Puncak alokasi memori dalam byte.
+
+    Returns:
+        dict: Jumlah pemanggilan, total waktu, throughput, persentil latensi, dan memori.
+    """
+    total = sum(latencies)
+    ordered = sorted(latencies)
+    units = len(latencies) if units is None else units
+    return {
+        "calls": len(latencies),
+        "units": units,
+        "total_s": total,
+        "throughput_per_s": units / total if total else 0.0,
+        "latency_ms": {
+            "p50": percentile(ordered, 0.5) * 1000,
+            "p90": percentile(ordered, 0.9) * 1000,
+            "p99": percentile(ordered, 0.99) * 1000,
+            "max": ordered[-1] * 1000 if ordered else 0.0,
+        },
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def run_stage(function, inputs, trace_memory=False):
+    """
+    Menjalankan sebuah tahap untuk setiap input sambil mencatat latensinya.
+
+    Parameters:
+        function (callable): Fungsi tahap dengan satu argumen.
+        inputs (list): Daftar input.
+        trace_memory (bool): Catat puncak alokasi memori dengan tracemalloc. Pelacakan
+            memperlambat eksekusi, sehingga latensi pada mode ini tidak dapat dibandingkan.
+
+    Returns:
+        tuple: Daftar output, daftar latensi (detik), dan puncak memori (byte atau None).
+    """
+    outputs, latencies = [], []
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        for item in inputs:
+            start = time.perf_counter()
+            outputs.append(function(item))
+            latencies.append(time.perf_counter() - start)
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return outputs, latencies, peak
+
+
+def measure_startup(runs):
+    """
+    Mengukur waktu impor modul aplikasi pada interpreter Python baru (cold start).
+
+    Streamlit sudah terimpor saat main.py dijalankan ulang, sehingga yang diukur hanya
+    modul aplikasi pada STARTUP_MODULES.
+
+    Parameters:
+        runs (int): Jumlah interpreter baru yang dijalankan.
+
+    Returns:
+        dict: Ringkasan latensi impor dan daftar modul pada LAZY_MODULES yang ikut
+            terimpor saat start.
+    """
+    names = json.dumps({"startup": STARTUP_MODULES, "lazy": LAZY_MODULES})
+    latencies, eager = [], set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT, names],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        elapsed, modules = json.loads(output)
+        latencies.append(elapsed)
+        eager.update(modules)
+    stage = summarize(latencies)
+    stage["eager_modules"] = sorted(eager)
+    return stage
+
+
+def safe_read(file_path):
+    try:
+        # Tanpa cache teks agar yang diukur tetap waktu ekstraksi file.
+        return read_file(file_path, use_cache=False)
+    except DocumentError:
+        return ""
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(
+    directory,
+    dictionary_path,
+    stopwords_path,
+    queries,
+    top_k=10,
+    dense_limit=200,
+    trace_memory=False,
+    tokenizer=DEFAULT_TOKENIZER,
+    dense_dimensions=(),
+    startup_runs=5,
+):
+    """
+    Mengukur setiap tahap pipeline pencarian secara terpisah pada sebuah korpus.
+
+    Tahap yang diukur: impor modul aplikasi saat start (lihat measure_startup), read_file, preprocess, stemming, compute_tf_idf (referensi dense,
+    hanya untuk korpus kecil), build_index, compute_similarity, dan pengurutan hasil
+    (pengurutan penuh dibandingkan search_top_k). Untuk setiap metode pada DENSE_METHODS
+    dan setiap jumlah dimensi pada dense_dimensions, pembangunan model dense dan pencarian
+    perkiraan juga diukur beserta recall@k terhadap top-k eksak compute_similarity.
+
+    Parameters:
+        directory (str): Direktori korpus.
+        dictionary_path (str): Path ke file kamus.
+        stopwords_path (str): Path ke file stopwords.
+        queries (list): Daftar query.
+        top_k (int): Jumlah dokumen teratas untuk tahap pengurutan.
+        dense_limit (int): Jumlah dokumen maksimum untuk mengukur compute_tf_idf dense.
+        trace_memory (bool): Ulangi setiap tahap dengan tracemalloc untuk mencatat puncak memori.
+        tokenizer (str): Tokenizer untuk tahap preprocess dan query.
+        dense_dimensions (iterable): Jumlah dimensi model dense yang dibandingkan.
+        startup_runs (int): Jumlah pengukuran waktu start, 0 untuk melewati tahap ini.
+
+    Returns:
+        dict: Ringkasan setiap tahap.
+    """
+    dictionary = load_dict(dictionary_path)
+    stopwords = load_stopwords(stopwords_path)
+    # Cache stemming hanya di memori dan tanpa tabel kata dasar agar hasil tidak
+    # bergantung pada isi cache di disk.
+    stemmer = CachedStemmer(create_base_stemmer())
+    files = list_files(directory)
+
+    def stem_tokens(tokens):
+        # Urutan sama seperti process_document dan process_query: token disaring dengan
+        # kamus lebih dulu, baru di-stem.
+        return [stemmer.stem(token) for token in tokens if token in dictionary]
+
+    stages = {}
+    if startup_runs:
+        stages["startup_import"] = measure_startup(startup_runs)
+
+    def measure(name, function, inputs, units=None):
+        outputs, latencies, _ = run_stage(function, inputs)
+        peak = None
+        if trace_memory:
+            peak = run_stage(function, inputs, trace_memory=True)[2]
+        total_units = units(outputs, inputs) if units else None
+        stages[name] = summarize(latencies, total_units, peak)
+        return outputs
+
+    texts = measure(
+        "read_file",
+        safe_read,
+        files,
+        units=lambda outputs, _: sum(len(text) for text in outputs),
+    )
+    tokens = measure(
+        "preprocess",
+        lambda text: preprocess(text, stopwords, tokenizer),
+        texts,
+        units=lambda outputs, _: sum(len(item) for item in outputs),
+    )
+    stemmed = measure(
+        "stemming",
+        stem_tokens,
+        tokens,
+        units=lambda _, inputs: sum(len(item) for item in inputs),
+    )
+    documents = {file_path: terms for file_path, terms in zip(files, stemmed) if terms}
+
+    if len(documents) <= dense_limit:
+        measure("compute_tf_idf", compute_tf_idf, [list(documents.values())])
+    else:
+        stages["compute_tf_idf"] = {"skipped": f"lebih dari {dense_limit} dokumen"}
+
+    def build(items):
+        index = build_inverted_index(items)
+        compute_index_weights(index)
+        return index
+
+    index = measure("build_index", build, [documents])[0]
+
+    query_terms = [
+        process_query(query, stopwords, dictionary, stemmer, tokenizer)
+        for query in queries
+    ]
+    similarities = measure(
+        "compute_similarity",
+        lambda terms: compute_similarity(index, terms),
+        query_terms,
+    )
+    measure(
+        "sort_results",
+        lambda scores: sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_k],
+        similarities,
+    )
+    measure(
+        "search_top_k", lambda terms: search_top_k(index, terms, top_k), query_terms
+    )
+
+    if dense_dimensions:
+        exact = [
+            [
+                doc_id
+                for doc_id, score in sorted(
+                    scores.items(), key=lambda x: x[1], reverse=True
+                )[:top_k]
+                if score > 0
+            ]
+            for scores in similarities
+        ]
+        model = build_tf_idf_matrix(index)
+        for method in DENSE_METHODS:
+            for dimensions in dense_dimensions:
+                name = f"{method}_{dimensions}"
+                dense = measure(
+                    f"build_{name}",
+                    lambda item: build_dense_model(item, method, dimensions),
+                    [model],
+                )[0]
+                approximate = measure(
+                    f"search_{name}",
+                    lambda terms: search_top_k_dense(dense, terms, top_k),
+                    query_terms,
+                )
+                stages[f"search_{name}"]["recall_at_k"] = recall_at_k(
+                    exact,
+                    [[doc_id for doc_id, _ in ranked] for ranked in approximate],
+                    top_k,
+                )
+
+    return {
+        "documents": len(files),
+        "indexed_documents": len(documents),
+        "terms": len(index["postings"]),
+        "queries": len(queries),
+        "stages": stages,
+    }
+
+
+def compare_results(current, baseline):
+    """
+    Membandingkan total waktu setiap tahap dengan hasil benchmark sebelumnya.
+
+    Parameters:
+        current (dict): Hasil benchmark saat ini.
+        baseline (dict): Hasil benchmark pembanding yang dimuat dari JSON.
+
+    Returns:
+        dict: Rasio total waktu saat ini terhadap pembanding per tahap (> 1 berarti lebih lambat).
+    """
+    ratios = {}
+    for name, stage in current["stages"].items():
+        previous = baseline.get("stages", {}).get(name, {})
+        if stage.get("total_s") and previous.get("total_s"):
+            ratios[name] = stage["total_s"] / previous["total_s"]
+    return ratios
+
+
+def print_report(result, ratios=None):
+    print(
+        f"{result['documents']} dokumen ({result['indexed_documents']} terindeks), "
+        f"{result['terms']} term, {result['queries']} query"
+    )
+    for name, stage in result["stages"].items():
+        if "skipped" in stage:
+            print(f"  {name:<20} dilewati ({stage['skipped']})")
+            continue
+        latency = stage["latency_ms"]
+        line = (
+            f"  {name:<20} total {stage['total_s']:.4f}s, "
+            f"{stage['throughput_per_s']:.1f} unit/s, "
+            f"p50 {latency['p50']:.3f}ms, p90 {latency['p90']:.3f}ms, "
+            f"p99 {latency['p99']:.3f}ms"
+        )
+        if stage["peak_memory_bytes"] is not None:
+            line += f", memori puncak {stage['peak_memory_bytes'] / 1024:.0f} KiB"
+        if "eager_modules" in stage:
+            line += f", modul berat: {', '.join(stage['eager_modules']) or '-'}"
+        if stage.get("recall_at_k") is not None:
+            line += f", recall@k {stage['recall_at_k']:.3f}"
+        if ratios and name in ratios:
+            line += f", {ratios[name]:.2f}x pembanding"
+        print(line)
+
+
+def parse_formats(value):
+    """
+    Mengubah argumen seperti "txt=6,docx=2,pdf=2" menjadi bobot per format.
+    """
+    formats = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        formats[name.strip()] = float(weight or 1)
+    return formats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark setiap tahap pipeline pencarian pada korpus sintetis."
+    )
+    parser.add_argument(
+        "--directory",
+        help="Korpus yang sudah ada. Jika tidak diberikan, korpus sintetis dibuat.",
+    )
+    parser.add_argument("--dictionary", default="./helper/dictionary.txt")
+    parser.add_argument("--stopwords", default="./helper/stopword.csv")
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument(
+        "--words", type=int, default=500, help="Rata-rata kata per dokumen."
+    )
+    parser.add_argument("--formats", default="txt=6,docx=2,pdf=2")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-k", "--top-k", type=int, default=10)
+    parser.add_argument("--dense-limit", type=int, default=200)
+    parser.add_argument(
+        "--tokenizer", choices=sorted(TOKENIZERS), default=DEFAULT_TOKENIZER
+    )
+    parser.add_argument(
+        "--dense-dimensions",
+        default="",
+        help="Jumlah dimensi model dense (LSA dan random projection) yang dibandingkan "
+        "dengan hasil eksak, misalnya 64,128,256.",
+    )
+    parser.add_argument(
+        "--startup-runs",
+        type=int,
+        default=5,
+        help="Jumlah interpreter baru untuk mengukur waktu impor saat start (0: lewati).",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Ulangi setiap tahap dengan tracemalloc untuk mengukur puncak memori.",
+    )
+    parser.add_argument("--output", help="File JSON hasil benchmark.")
+    parser.add_argument("--compare", help="File JSON hasil benchmark pembanding.")
+    args = parser.parse_args()
+
+    config = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in ("output", "compare")
+    }
+    vocabulary = build_vocabulary(args.dictionary, args.stopwords, seed=args.seed)
+    queries = generate_queries(vocabulary, args.queries, args.seed)
+
+    with tempfile.TemporaryDirectory() as temporary:
+        directory = args.directory
+        if directory is None:
+            directory = temporary
+            generate_corpus(
+                directory,
+                args.documents,
+                vocabulary,
+                args.words,
+                parse_formats(args.formats),
+                args.seed,
+            )
+        result = run_benchmark(
+            directory,
+            args.dictionary,
+            args.stopwords,
+            queries,
+            args.top_k,
+            args.dense_limit,
+            args.memory,
+            args.tokenizer,
+            [int(value) for value in args.dense_dimensions.split(",") if value],
+            args.startup_runs,
+        )
+
+    result = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "config": config,
+        **result,
+    }
+
+    ratios = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            ratios = compare_results(result, json.load(file))
+    print_report(result, ratios)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{result['revision'] or 'benchmark'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(result, file, indent=2)
+    print(f"Hasil disimpan di {output}")
+
+
+if __name__ == "__main__":
+    main()
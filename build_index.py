@@ -0,0 +1,273 @@
+import os
+import shutil
+import argparse
+from contextlib import nullcontext
+from utils.discovery_utils import NEAR_DUPLICATE_THRESHOLD, normalize_filters
+from utils.incremental_utils import file_fingerprint, indexed_files, update_index
+from utils.index_utils import build_inverted_index
+from utils.merge_utils import merge_index
+from utils.profiling_utils import profile_stage
+from utils.shard_utils import load_sharded_arrays, shard_count_of
+from utils.storage_utils import (
+    index_lock,
+    index_signature,
+    load_index_arrays,
+    pack_index,
+    read_index_metadata,
+)
+from utils.text_utils import list_files
+from utils.tokenizer_utils import DEFAULT_TOKENIZER, TOKENIZER_REVISIONS, TOKENIZERS
+
+
+def load_previous_index(output, settings):
+    """
+    Memuat array index sebelumnya jika dibangun dengan pengaturan dan sumber daya yang
+    sama.
+
+    Args:
+        output (str): Direktori index.
+        settings (dict): Direktori, path kamus dan stopwords, serta fingerprint keduanya.
+
+    Returns:
+        tuple: Array-array setiap shard index sebelumnya (list, satu untuk index yang
+            tidak dibagi) dan metadata index sebelumnya (berisi fingerprint file pada key
+            files), atau (None, None) jika index harus dibangun ulang dari awal.
+    """
+    if index_signature(output) is None:
+        return None, None
+    try:
+        if shard_count_of(output) > 1:
+            shards, metadata = load_sharded_arrays(output)
+        else:
+            arrays, stored = load_index_arrays(output)
+            shards, metadata = [arrays], stored["metadata"]
+    except ValueError:
+        return None, None
+    if any(metadata.get(key) != value for key, value in settings.items()):
+        return None, None
+    return shards, metadata
+
+
+def build_index(
+    directory,
+    dictionary_path,
+    stopwords_path,
+    output,
+    incremental=True,
+    workers=1,
+    tokenizer=DEFAULT_TOKENIZER,
+    shards=None,
+    progress=None,
+    filters=None,
+    near_duplicates=None,
+    profiler=None,
+):
+    """
+    Memproses dokumen dalam direktori dan menyimpan index ke disk.
+
+    Pada mode inkremental, hanya file yang ditambahkan atau diubah sejak index terakhir
+    yang diproses ulang, lalu digabungkan dengan array index sebelumnya tanpa memuatnya
+    ke dictionary (lihat merge_index). Index dibangun ulang dari awal jika belum ada atau
+    jika kamus, stopwords, tokenizer (termasuk revisi aturannya), maupun pengaturan
+    dokumen yang hampir sama berubah. Jika shards lebih dari 1, index disimpan sebagai
+    beberapa shard berdasarkan dokumen dengan IDF global. File dicari di seluruh
+    subdirektori, dan file duplikat hanya diindeks sekali (lihat update_index). Build
+    pada direktori index yang sama dijalankan bergantian (lihat index_lock).
+
+    Args:
+        directory (str): Direktori yang berisi dokumen.
+        dictionary_path (str): Path ke file kamus.
+        stopwords_path (str): Path ke file stopwords.
+        output (str): Direktori tujuan penyimpanan index.
+        incremental (bool): Gunakan index sebelumnya dan proses hanya file yang berubah.
+        workers (int): Jumlah proses worker untuk membaca dan memproses file.
+        tokenizer (str): Nama tokenizer, "regex" atau "nltk".
+        shards (int, optional): Jumlah shard. Bawaan: sama seperti index sebelumnya,
+            atau 1 jika index belum ada.
+        progress (callable, optional): Dipanggil sebagai progress(stage, done, total)
+            pada tahap "scan", "process" (lihat update_index), dan "save".
+        filters (dict, optional): Pola include dan exclude serta batas ukuran file, lihat
+            scan_files.
+        near_duplicates (float, optional): Batas kemiripan Jaccard untuk menggabungkan
+            dokumen yang hampir sama. None untuk menonaktifkan.
+        profiler (RequestProfiler, optional): Mencatat seluruh build sebagai satu
+            permintaan beserta waktu setiap file (lihat update_index) dan tahap "save".
+
+    Returns:
+        tuple: Jumlah dokumen (key documents) dan term (key terms) pada index (dict) dan
+            ringkasan perubahan file (dict).
+    """
+    # Build lain pada index yang sama (misalnya dari aplikasi) ditunggu sampai selesai,
+    # sehingga index sebelumnya dibaca setelah versi barunya aktif.
+    with index_lock(output), profiler.request() if profiler else nullcontext():
+        settings = {
+            "directory": os.path.abspath(directory),
+            "dictionary_path": os.path.abspath(dictionary_path),
+            "stopwords_path": os.path.abspath(stopwords_path),
+            "dictionary": file_fingerprint(dictionary_path)["hash"],
+            "stopwords": file_fingerprint(stopwords_path)["hash"],
+            "tokenizer": tokenizer,
+            "tokenizer_revision": TOKENIZER_REVISIONS[tokenizer],
+            "near_duplicates": near_duplicates,
+        }
+
+        previous_shards = None
+        if index_signature(output) is not None:
+            try:
+                previous_shards = shard_count_of(output)
+            except ValueError:
+                pass
+        shards = shards or previous_shards or 1
+
+        arrays, previous = None, None
+        if incremental:
+            arrays, previous = load_previous_index(output, settings)
+        previous = previous or {}
+        previous_records = previous.get("files")
+
+        filters = normalize_filters(filters)
+        files = list_files(directory, filters)
+        # Teks dokumen baru ditulis ke file teks sementara oleh worker, bukan ke memori.
+        text_dir = f"{output.rstrip(os.sep)}.texts"
+        if os.path.exists(text_dir):
+            shutil.rmtree(text_dir)
+        os.makedirs(text_dir)
+        try:
+            batch = build_inverted_index({})
+            records, changes = update_index(
+                batch,
+                previous_records or {},
+                files,
+                dictionary_path,
+                stopwords_path,
+                workers,
+                tokenizer,
+                text_dir=text_dir,
+                progress=progress,
+                near_duplicates=near_duplicates,
+                profiler=profiler,
+            )
+
+            if (
+                records != previous_records
+                or shards != previous_shards
+                or previous.get("filters", normalize_filters()) != filters
+            ):
+                if progress:
+                    progress("save", 0, 1)
+                # Dokumen index sebelumnya yang tidak lagi diindeks atau baru diproses ulang.
+                removed = (
+                    indexed_files(previous_records or {}) - indexed_files(records)
+                ) | set(batch["doc_lengths"])
+                metadata = {**settings, "filters": filters, "files": records}
+                with profile_stage(profiler, "save"):
+                    counts = merge_index(
+                        output,
+                        arrays or [],
+                        pack_index(batch)[0],
+                        removed,
+                        shards,
+                        metadata,
+                    )
+                if progress:
+                    progress("save", 1, 1)
+                return counts, changes
+        finally:
+            shutil.rmtree(text_dir, ignore_errors=True)
+        stored = read_index_metadata(output)
+        return {
+            "documents": stored["doc_count"],
+            "terms": stored["term_count"],
+        }, changes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Bangun index dokumen dan simpan ke disk."
+    )
+    parser.add_argument("--directory", default="./documents")
+    parser.add_argument("--dictionary", default="./helper/dictionary.txt")
+    parser.add_argument("--stopwords", default="./helper/stopword.csv")
+    parser.add_argument("--output", default="./index")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Bangun ulang seluruh index tanpa memakai index sebelumnya.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Jumlah proses worker untuk membaca dan memproses file.",
+    )
+    parser.add_argument(
+        "--tokenizer",
+        choices=sorted(TOKENIZERS),
+        default=DEFAULT_TOKENIZER,
+        help="Tokenizer untuk dokumen dan query.",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        help="Jumlah shard index. Bawaan: sama seperti index sebelumnya, atau 1.",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        help="Pola glob file yang diindeks, misalnya '*.pdf' (dapat diulang). "
+        "Bawaan: seluruh file.",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        help="Pola glob file atau direktori yang dilewati, misalnya 'arsip/*' "
+        "(dapat diulang).",
+    )
+    parser.add_argument(
+        "--min-size", type=int, default=0, help="Ukuran file minimum dalam byte."
+    )
+    parser.add_argument("--max-size", type=int, help="Ukuran file maksimum dalam byte.")
+    parser.add_argument(
+        "--near-duplicates",
+        type=float,
+        nargs="?",
+        const=NEAR_DUPLICATE_THRESHOLD,
+        metavar="THRESHOLD",
+        help="Indeks dokumen yang hampir sama (kemiripan Jaccard shingle kata dasar "
+        f"berdasarkan MinHash) hanya sekali. Bawaan batas: {NEAR_DUPLICATE_THRESHOLD}.",
+    )
+    args = parser.parse_args()
+
+    filters = {
+        "include": args.include,
+        "exclude": args.exclude,
+        "min_size": args.min_size,
+        "max_size": args.max_size,
+    }
+    counts, changes = build_index(
+        args.directory,
+        args.dictionary,
+        args.stopwords,
+        args.output,
+        incremental=not args.full,
+        workers=args.workers,
+        tokenizer=args.tokenizer,
+        shards=args.shards,
+        filters=filters,
+        near_duplicates=args.near_duplicates,
+    )
+    for error in changes["errors"]:
+        print(f"Gagal memproses {error['file_path']}: {error['message']}")
+    print(
+        f"Index dengan {counts['documents']} dokumen dan "
+        f"{counts['terms']} term disimpan di {args.output} "
+        f"({len(changes['added'])} ditambahkan, {len(changes['modified'])} diubah, "
+        f"{len(changes['removed'])} dihapus, "
+        f"{len(changes['duplicates'])} duplikat dilewati)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import os
+import sys
+import argparse
+from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+from utils.document_reader_utils import DocumentError, iter_file, load_dict
+from utils.stem_table_utils import (
+    STEM_TABLE_PATH,
+    build_stem_table,
+    load_stem_table,
+    save_stem_table,
+)
+from utils.text_utils import list_files
+from utils.tokenizer_utils import align_chunks, iter_tokens
+
+
+def corpus_vocabulary(directory):
+    """
+    Mengumpulkan seluruh token unik (huruf kecil) dari dokumen dalam direktori.
+
+    Args:
+        directory (str): Direktori yang berisi dokumen.
+
+    Returns:
+        set: Token unik dalam korpus.
+    """
+    vocabulary = set()
+    for file_path in list_files(directory):
+        try:
+            for chunk in align_chunks(iter_file(file_path)):
+                vocabulary.update(token for token, _, _ in iter_tokens(chunk))
+        except DocumentError as e:
+            print(f"Gagal membaca {file_path}: {e.message}")
+    return vocabulary
+
+
+def verify_stem_table(table, words):
+    """
+    Membandingkan tabel dengan stemmer.stem Sastrawi bawaan (tanpa perubahan apa pun).
+
+    Args:
+        table (dict): Tabel kata -> kata dasar.
+        words (iterable): Kata yang diperiksa.
+
+    Returns:
+        tuple: Jumlah kata yang tidak ada di tabel dan daftar (kata, hasil tabel,
+            hasil Sastrawi) yang berbeda.
+    """
+    stemmer = StemmerFactory().create_stemmer()
+    missing, mismatches = 0, []
+    for word in sorted(words):
+        if word not in table:
+            missing += 1
+        elif table[word] != stemmer.stem(word):
+            mismatches.append((word, table[word], stemmer.stem(word)))
+    return missing, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Hitung tabel kata -> kata dasar agar stemming cukup satu pencarian "
+        "di tabel; Sastrawi hanya dipanggil untuk kata yang tidak ada di tabel."
+    )
+    parser.add_argument("--directory", default="./documents")
+    parser.add_argument("--dictionary", default="./helper/dictionary.txt")
+    parser.add_argument("--output", default=STEM_TABLE_PATH)
+    parser.add_argument(
+        "--affixes",
+        action="store_true",
+        help="Tambahkan kata berimbuhan umum dari setiap kata dasar di kamus "
+        "(ratusan ribu kata, beberapa menit per core).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Jumlah proses worker untuk stemming.",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Jangan membangun tabel, tetapi bandingkan tabel tersimpan dengan "
+        "stemmer.stem Sastrawi untuk setiap token dokumen dalam direktori.",
+    )
+    args = parser.parse_args()
+
+    vocabulary = corpus_vocabulary(args.directory)
+    if args.verify:
+        table = load_stem_table(args.output, args.dictionary)
+        if not table:
+            sys.exit(f"Tabel {args.output} belum ada atau dibangun dengan kamus lain.")
+        missing, mismatches = verify_stem_table(table, vocabulary)
+        for word, stem, expected in mismatches:
+            print(f"{word}: tabel {stem}, Sastrawi {expected}")
+        print(
+            f"{len(vocabulary)} token diperiksa: {len(vocabulary) - missing} ada di "
+            f"tabel, {missing} tidak ada, {len(mismatches)} berbeda."
+        )
+        sys.exit(1 if mismatches else 0)
+
+    # Entri kamus yang berisi spasi tidak pernah menjadi token.
+    roots = {word for word in load_dict(args.dictionary) if " " not in word}
+    table = build_stem_table(
+        roots | vocabulary,
+        roots,
+        roots if args.affixes else (),
+        args.workers,
+    )
+    save_stem_table(table, args.output, args.dictionary)
+    print(f"Tabel dengan {len(table)} kata disimpan di {args.output}")
+
+
+if __name__ == "__main__":
+    main()
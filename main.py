@@ -1,5 +1,30 @@
+import os
 import streamlit as st
-from utils.text_utils import process_documents
+from build_index import build_index
+from utils.engine_utils import SearchEngine
+from utils.discovery_utils import (
+    NEAR_DUPLICATE_THRESHOLD,
+    normalize_filters,
+    parse_patterns,
+)
+from utils.job_utils import get_background_jobs
+from utils.profiling_utils import RequestProfiler, enable_log_file
+from utils.resource_utils import warm_up_resources
+from utils.result_cache_utils import get_shared_result_cache
+from utils.storage_utils import index_signature
+from utils.text_utils import validate_inputs
+from utils.tokenizer_utils import DEFAULT_TOKENIZER, TOKENIZERS
+from utils.ui_utils import (
+    display_diagnostics,
+    display_indexing_progress,
+    display_indexing_result,
+    display_saved_results,
+    process_documents,
+    show_message,
+)
+
+PENDING_SEARCH_KEY = "pending_search"
+SEEN_JOB_KEY = "seen_indexing_job"
 
 st.set_page_config(
     page_title="Information Retrieval (IR)",
@@ -12,6 +37,96 @@ st.set_page_config(
 )
 
 
+@st.cache_resource(
+    show_spinner="Memuat index...",
+    max_entries=4,
+    on_release=lambda engine: engine.close(),
+)
+def load_saved_engine(index_dir, signature, dictionary_path, stopwords_path):
+    """
+    Memuat index tersimpan ke SearchEngine sekali per proses, dimuat ulang jika index
+    dibangun ulang.
+
+    Args:
+        index_dir (str): Direktori index hasil build_index.py.
+        signature (float): Waktu modifikasi metadata index, digunakan sebagai key cache.
+        dictionary_path (str): Path ke file kamus.
+        stopwords_path (str): Path ke file stopwords.
+
+    Returns:
+        SearchEngine: Engine dengan index tersimpan.
+    """
+    engine = SearchEngine(
+        dictionary_path, stopwords_path, result_cache=get_shared_result_cache()
+    )
+    engine.load(index_dir)
+    return engine
+
+
+def start_indexing(
+    index_dir,
+    directory,
+    dictionary_path,
+    stopwords_path,
+    workers,
+    tokenizer,
+    filters,
+    near_duplicates,
+    profiler=None,
+):
+    """
+    Menjalankan build_index di latar belakang. Pekerjaan dipakai bersama oleh seluruh sesi:
+    jika index yang sama sedang dibangun, pekerjaan tersebut yang dikembalikan.
+
+    Args:
+        index_dir (str): Direktori index.
+        directory (str): Direktori yang berisi dokumen.
+        dictionary_path (str): Path ke file kamus.
+        stopwords_path (str): Path ke file stopwords.
+        workers (int): Jumlah proses worker.
+        tokenizer (str): Nama tokenizer.
+        filters (dict): Pola include dan exclude serta batas ukuran file.
+        near_duplicates (float | None): Batas kemiripan dokumen yang hampir sama.
+        profiler (RequestProfiler, optional): Profiler build, ditampilkan bersama
+            ringkasan pekerjaan (lihat display_indexing_result).
+
+    Returns:
+        tuple: Pekerjaan build_index dan apakah pekerjaan baru dijalankan.
+    """
+    return get_background_jobs().start(
+        os.path.abspath(index_dir),
+        build_index,
+        directory=directory,
+        dictionary_path=dictionary_path,
+        stopwords_path=stopwords_path,
+        output=index_dir,
+        workers=workers,
+        tokenizer=tokenizer,
+        filters=filters,
+        near_duplicates=near_duplicates,
+        profiler=profiler,
+    )
+
+
+def indexing_profiler(directory, enabled):
+    """
+    Membuat profiler untuk pekerjaan build_index jika diagnostik ditampilkan. Build tidak
+    diprofil dengan cProfile karena berjalan bersamaan dengan permintaan pencarian,
+    sedangkan hanya satu profiler yang dapat aktif dalam satu proses.
+
+    Args:
+        directory (str): Direktori yang berisi dokumen.
+        enabled (bool): Apakah diagnostik ditampilkan.
+
+    Returns:
+        RequestProfiler | None: Profiler build, atau None jika diagnostik tidak aktif.
+    """
+    if not enabled:
+        return None
+    enable_log_file()
+    return RequestProfiler(f"build_index {directory}")
+
+
 # Streamlit UI
 st.title("Aplikasi Temu Balik Dokumen")
 st.write(
@@ -46,9 +161,214 @@ stopwords_path = (
     )
     or "./helper/stopword.csv"
 )
+warm_up_resources(dictionary_path, stopwords_path)
+backend = st.sidebar.selectbox(
+    "Metode perhitungan kemiripan:",
+    ["index", "sparse", "lsa", "random"],
+    format_func=lambda option: {
+        "index": "Inverted index",
+        "sparse": "Matriks sparse (NumPy/SciPy)",
+        "lsa": "Perkiraan LSA (vektor dense)",
+        "random": "Perkiraan random projection (vektor dense)",
+    }[option],
+)
+top_k = st.sidebar.number_input(
+    "Jumlah hasil teratas:",
+    min_value=1,
+    value=10,
+    help="Hanya *k* dokumen dengan kemiripan tertinggi yang dihitung dan ditampilkan.",
+)
+tokenizer = st.sidebar.selectbox(
+    "Tokenizer:",
+    sorted(TOKENIZERS),
+    index=sorted(TOKENIZERS).index(DEFAULT_TOKENIZER),
+    format_func=lambda option: {
+        "regex": "Regex (cepat)",
+        "nltk": "NLTK word_tokenize",
+    }[option],
+)
 query = st.sidebar.text_area("Masukan query yang ingin dicari:")
 
+index_dir = st.sidebar.text_input(
+    "Masukkan path index tersimpan:",
+    "./index",
+    help="Bangun index dengan `python build_index.py`. Jika belum ada, index dibangun "
+    "di latar belakang saat tombol **Proses** ditekan.",
+)
+
+workers = st.sidebar.number_input(
+    "Jumlah proses indexing:",
+    min_value=1,
+    max_value=os.cpu_count() or 1,
+    value=1,
+    help="Jumlah proses yang digunakan saat membaca dan memproses dokumen.",
+)
+
+with st.sidebar.expander("Pencarian file"):
+    include = st.text_input(
+        "Pola file yang diindeks:",
+        help="Pola glob dipisah koma, misalnya `*.pdf, laporan/*`. Kosong: seluruh "
+        "file dalam direktori dan subdirektorinya.",
+    )
+    exclude = st.text_input(
+        "Pola file atau direktori yang dilewati:",
+        help="Pola glob dipisah koma, misalnya `arsip/*, *.tmp`.",
+    )
+    max_size_mb = st.number_input(
+        "Ukuran file maksimum (MB):",
+        min_value=0,
+        value=0,
+        help="0 berarti tanpa batas.",
+    )
+    collapse_near_duplicates = st.checkbox(
+        "Indeks dokumen yang hampir sama sekali saja",
+        help="File yang isinya sama persis selalu diindeks sekali. Dengan pilihan ini, "
+        "dokumen yang kata dasarnya hampir sama (MinHash, kemiripan "
+        f"{NEAR_DUPLICATE_THRESHOLD:.0%}) juga hanya diindeks sekali.",
+    )
+filters = normalize_filters(
+    {
+        "include": parse_patterns(include),
+        "exclude": parse_patterns(exclude),
+        "max_size": max_size_mb * 1024 * 1024 or None,
+    }
+)
+near_duplicates = NEAR_DUPLICATE_THRESHOLD if collapse_near_duplicates else None
+
+show_diagnostics = st.sidebar.checkbox(
+    "Tampilkan diagnostik",
+    help="Catat waktu setiap tahap untuk permintaan ini dan waktu setiap file saat "
+    "index dibangun, juga ditulis ke *logs/diagnostics.jsonl*.",
+)
+use_cprofile = st.sidebar.checkbox(
+    "Profil dengan cProfile",
+    disabled=not show_diagnostics,
+    help="Profil lengkap satu permintaan (hanya proses utama, lebih lambat).",
+)
+
+if st.sidebar.button(
+    "Perbarui index",
+    help="Proses hanya file yang berubah di latar belakang; pencarian tetap memakai "
+    "index terakhir sampai index baru selesai.",
+):
+    start_indexing(
+        index_dir,
+        directory,
+        dictionary_path,
+        stopwords_path,
+        workers,
+        tokenizer,
+        filters,
+        near_duplicates,
+        indexing_profiler(directory, show_diagnostics),
+    )
+
+job = get_background_jobs().get(os.path.abspath(index_dir))
+if job is not None:
+    with st.sidebar:
+        if job.running:
+            display_indexing_progress(job)
+        elif st.session_state.get(SEEN_JOB_KEY) != job.id:
+            # Ringkasan pekerjaan yang sudah selesai ditampilkan sekali per sesi.
+            st.session_state[SEEN_JOB_KEY] = job.id
+            display_indexing_result(job)
+
+saved_engine = None
+signature = index_signature(index_dir)
+if signature is not None:
+    try:
+        engine = load_saved_engine(
+            index_dir, signature, dictionary_path, stopwords_path
+        )
+        if engine.metadata.get("directory") != os.path.abspath(directory):
+            st.sidebar.info(
+                "Index tersimpan dibangun dari direktori lain, index dibangun ulang "
+                "saat tombol **Proses** ditekan.",
+                icon="ℹ️",
+            )
+        elif engine.tokenizer != tokenizer:
+            st.sidebar.info(
+                "Index tersimpan dibangun dengan tokenizer lain, index dibangun ulang "
+                "saat tombol **Proses** ditekan.",
+                icon="ℹ️",
+            )
+        elif (
+            engine.metadata.get("filters", normalize_filters()) != filters
+            or engine.metadata.get("near_duplicates") != near_duplicates
+        ):
+            st.sidebar.info(
+                "Index tersimpan dibangun dengan pengaturan pencarian file lain, index "
+                "diperbarui saat tombol **Proses** ditekan.",
+                icon="ℹ️",
+            )
+        else:
+            saved_engine = engine
+    except Exception as e:
+        st.sidebar.warning(f"Index tersimpan tidak dapat dimuat: {e}", icon="⚠️")
+
 st.divider()
 
-if st.sidebar.button("Proses", type="primary"):
-    process_documents(directory, dictionary_path, stopwords_path, query)
+search_requested = st.sidebar.button("Proses", type="primary")
+if (
+    job is not None
+    and not job.running
+    and st.session_state.pop(PENDING_SEARCH_KEY, None)
+):
+    # Pencarian yang menunggu index selesai dibangun dijalankan otomatis.
+    search_requested = saved_engine is not None
+
+if search_requested and saved_engine is None:
+    error = validate_inputs(directory, dictionary_path, stopwords_path, query)
+    if error:
+        show_message(error)
+    else:
+        job, started = start_indexing(
+            index_dir,
+            directory,
+            dictionary_path,
+            stopwords_path,
+            workers,
+            tokenizer,
+            filters,
+            near_duplicates,
+            indexing_profiler(directory, show_diagnostics),
+        )
+        if started or job.kwargs["directory"] == directory:
+            st.session_state[PENDING_SEARCH_KEY] = True
+            st.rerun()
+        show_message(
+            "Index sedang dibangun untuk direktori lain, coba lagi setelah selesai.",
+            "warning",
+        )
+elif search_requested:
+    if job is not None and job.running:
+        show_message(
+            "Index sedang diperbarui di latar belakang, hasil diambil dari index "
+            "terakhir yang lengkap.",
+            "info",
+        )
+    profiler = None
+    if show_diagnostics:
+        enable_log_file()
+        profiler = RequestProfiler(query, use_cprofile=use_cprofile)
+    process_documents(
+        directory,
+        dictionary_path,
+        stopwords_path,
+        query,
+        saved_engine,
+        backend,
+        top_k,
+        profiler,
+    )
+    if profiler:
+        display_diagnostics(profiler)
+elif st.session_state.get(PENDING_SEARCH_KEY):
+    show_message(
+        "Index sedang dibangun di latar belakang, hasil pencarian ditampilkan setelah "
+        "selesai.",
+        "info",
+    )
+else:
+    # Rerun karena pindah halaman atau membuka detail dokumen: tampilkan hasil terakhir.
+    display_saved_results()
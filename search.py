@@ -0,0 +1,76 @@
+import json
+import argparse
+from utils.engine_utils import SearchEngine
+from utils.shard_utils import SHARD_AUTHKEY_ENV, shard_authkey
+
+
+def read_queries(file_name):
+    """
+    Membaca query dari file teks, satu query per baris.
+
+    Args:
+        file_name (str): Path ke file query.
+
+    Returns:
+        list: Daftar query yang tidak kosong.
+    """
+    with open(file_name, "r", encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cari dokumen pada index tersimpan tanpa antarmuka Streamlit."
+    )
+    parser.add_argument("queries", help="File teks berisi satu query per baris.")
+    parser.add_argument("--index", default="./index")
+    parser.add_argument("--dictionary", default="./helper/dictionary.txt")
+    parser.add_argument("--stopwords", default="./helper/stopword.csv")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument(
+        "--output", help="File JSON Lines tujuan. Bawaan: ditulis ke stdout."
+    )
+    parser.add_argument(
+        "--shard-servers",
+        help="Alamat shard server (host:port) dipisah koma, sesuai urutan shard. "
+        "Bawaan: shard server dijalankan sebagai proses lokal.",
+    )
+    parser.add_argument(
+        "--authkey",
+        help="Kunci autentikasi shard server pada --shard-servers. Bawaan: isi "
+        f"variabel lingkungan {SHARD_AUTHKEY_ENV}.",
+    )
+    args = parser.parse_args()
+
+    addresses = None
+    authkey = shard_authkey(args.authkey)
+    if args.shard_servers:
+        if authkey is None:
+            parser.error(
+                f"--authkey atau variabel lingkungan {SHARD_AUTHKEY_ENV} wajib diisi "
+                "untuk --shard-servers."
+            )
+        addresses = [
+            (host, int(port))
+            for host, port in (
+                address.rsplit(":", 1) for address in args.shard_servers.split(",")
+            )
+        ]
+
+    engine = SearchEngine(args.dictionary, args.stopwords)
+    try:
+        engine.load(args.index, addresses, authkey)
+        results = engine.search_batch(read_queries(args.queries), args.k)
+    finally:
+        engine.close()
+
+    lines = [json.dumps(result, ensure_ascii=False) for result in results]
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+    else:
+        print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import argparse
+from utils.shard_utils import (
+    SHARD_AUTHKEY_ENV,
+    SHARD_DIR,
+    SHARD_HOST,
+    serve_shard,
+    shard_authkey,
+)
+from utils.storage_utils import resolve_index_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Jalankan shard server untuk satu shard index sebagai proses terpisah."
+    )
+    parser.add_argument("index_dir", help="Direktori index, misalnya ./index.")
+    parser.add_argument(
+        "--shard", type=int, required=True, help="Nomor shard yang dilayani."
+    )
+    parser.add_argument("--host", default=SHARD_HOST)
+    parser.add_argument("--port", type=int, default=6000)
+    parser.add_argument(
+        "--authkey",
+        help="Kunci autentikasi koneksi. Bawaan: isi variabel lingkungan "
+        f"{SHARD_AUTHKEY_ENV}. Wajib diisi.",
+    )
+    args = parser.parse_args()
+
+    authkey = shard_authkey(args.authkey)
+    if authkey is None:
+        parser.error(
+            f"--authkey atau variabel lingkungan {SHARD_AUTHKEY_ENV} wajib diisi."
+        )
+    # Versi index aktif dibaca sekali; jalankan ulang server setelah index dibangun ulang.
+    shard_dir = os.path.join(
+        resolve_index_dir(args.index_dir), SHARD_DIR.format(args.shard)
+    )
+    print(f"Melayani {shard_dir} di {args.host}:{args.port}")
+    serve_shard(shard_dir, (args.host, args.port), authkey)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils import resource_utils, text_cache_utils  # noqa: E402
+from utils.stem_table_utils import create_base_stemmer  # noqa: E402
+from utils.text_utils import list_files, load_resources, process_document  # noqa: E402
+
+DOCUMENTS_DIR = os.path.join(ROOT, "documents")
+DICTIONARY_PATH = os.path.join(ROOT, "helper", "dictionary.txt")
+STOPWORDS_PATH = os.path.join(ROOT, "helper", "stopword.csv")
+QUERIES = [
+    "tomat buah merah",
+    "bapak perjuangan kemerdekaan Indonesia",
+    "cara belajar agar pintar",
+    "jago coding dan logika pemrograman",
+    "stemming kata dasar bahasa Indonesia",
+    "manusia ciptaan tuhan",
+    "penyelenggara pemilu",
+]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory):
+    """
+    Direktori sementara pengganti ./cache agar test tidak menulis ke direktori kerja.
+
+    Fixture bercakupan sesi karena fixture sesi lain (misalnya documents) sudah membaca
+    file melalui cache teks. Cache bersama per proses dikosongkan sebelum dan sesudah
+    path diganti.
+    """
+    directory = tmp_path_factory.mktemp("cache")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(
+            text_cache_utils, "TEXT_CACHE_PATH", str(directory / "texts.sqlite3")
+        )
+        patch.setattr(
+            resource_utils, "STEM_CACHE_PATH", str(directory / "stems.sqlite3")
+        )
+        patch.setattr(
+            resource_utils, "STEM_TABLE_PATH", str(directory / "stem_table.tsv.gz")
+        )
+        text_cache_utils.get_shared_text_cache.cache_clear()
+        resource_utils.cached_stemmer.cache_clear()
+        yield directory
+    text_cache_utils.get_shared_text_cache.cache_clear()
+    resource_utils.cached_stemmer.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def resources():
+    """
+    Kamus dan stopwords bawaan aplikasi.
+    """
+    return load_resources(DICTIONARY_PATH, STOPWORDS_PATH)
+
+
+@pytest.fixture(scope="session")
+def stemmer():
+    """
+    Stemmer Sastrawi tanpa cache maupun tabel kata dasar.
+    """
+    return create_base_stemmer()
+
+
+@pytest.fixture(scope="session")
+def documents(resources, stemmer):
+    """
+    Kata dasar setiap dokumen dalam documents/ hasil process_document.
+    """
+    dictionary, stopwords = resources
+    return {
+        file_path: process_document(file_path, stopwords, dictionary, stemmer)[
+            "stemmed"
+        ]
+        for file_path in list_files(DOCUMENTS_DIR)
+    }
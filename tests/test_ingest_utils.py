@@ -0,0 +1,16 @@
+import os
+from conftest import DICTIONARY_PATH, DOCUMENTS_DIR, STOPWORDS_PATH
+from utils.ingest_utils import ingest_file
+from utils.text_utils import list_files
+
+
+def test_ingest_file_with_text_dir_times_analysis(tmp_path):
+    file_path = list_files(DOCUMENTS_DIR)[0]
+    _, document, error, stats = ingest_file(
+        file_path, DICTIONARY_PATH, STOPWORDS_PATH, text_dir=str(tmp_path)
+    )
+    assert error is None
+    text_path, start, end = document["text"]
+    assert os.path.getsize(text_path) == end > start == 0
+    assert 0.0 <= stats["analyze_s"] < 60.0
+    assert stats["tokens"] == sum(document["counts"].values())
@@ -0,0 +1,44 @@
+import pytest
+from build_index import build_index
+from conftest import DICTIONARY_PATH, DOCUMENTS_DIR, QUERIES, STOPWORDS_PATH
+from utils.index_utils import build_inverted_index, search_top_k
+from utils.shard_utils import ShardedSearcher, serve_shard
+from utils.text_utils import process_query
+
+K = 5
+
+
+@pytest.fixture(scope="module")
+def sharded_index_dir(tmp_path_factory):
+    """
+    Index documents/ yang disimpan sebagai 3 shard.
+    """
+    index_dir = str(tmp_path_factory.mktemp("sharded") / "index")
+    build_index(DOCUMENTS_DIR, DICTIONARY_PATH, STOPWORDS_PATH, index_dir, shards=3)
+    return index_dir
+
+
+def test_sharded_rankings_match_search_top_k(
+    documents, resources, stemmer, sharded_index_dir
+):
+    dictionary, stopwords = resources
+    index = build_inverted_index(documents)
+    searcher = ShardedSearcher(sharded_index_dir)
+    try:
+        for query in QUERIES:
+            query = process_query(query, stopwords, dictionary, stemmer)
+            expected = search_top_k(index, query, K)
+            results = searcher.search(query, K)
+            assert [doc_id for doc_id, _ in results] == [
+                doc_id for doc_id, _ in expected
+            ]
+            assert [score for _, score in results] == pytest.approx(
+                [score for _, score in expected], abs=1e-12
+            )
+    finally:
+        searcher.close()
+
+
+def test_serve_shard_requires_authkey(sharded_index_dir):
+    with pytest.raises(ValueError):
+        serve_shard(sharded_index_dir, authkey=None)
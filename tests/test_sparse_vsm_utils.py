@@ -0,0 +1,84 @@
+import pytest
+from build_index import build_index
+from conftest import DICTIONARY_PATH, QUERIES, STOPWORDS_PATH
+from utils.engine_utils import SearchEngine
+from utils.index_utils import build_inverted_index
+from utils.sparse_vsm_utils import build_tf_idf_matrix, score_queries
+from utils.text_utils import process_query
+from utils.vsm_utils import compute_idf, compute_tf, compute_tf_idf, cosine_similarity
+
+
+def reference_scores(documents, query):
+    """
+    Skor cosine similarity dengan fungsi Python murni, seperti compute_similarity awal.
+    """
+    matrix, terms = compute_tf_idf(documents)
+    query_vector = [
+        compute_tf(term, query) * compute_idf(term, documents) for term in terms
+    ]
+    return [cosine_similarity(vector, query_vector) for vector in matrix]
+
+
+def ranking(doc_ids, scores):
+    """
+    Id dokumen dengan skor positif, terurut menurun berdasarkan skor lalu id dokumen.
+    """
+    ranked = sorted(
+        zip(doc_ids, scores), key=lambda item: (-round(item[1], 9), item[0])
+    )
+    return [doc_id for doc_id, score in ranked if score > 0]
+
+
+def test_sparse_scores_match_pure_python(documents, resources, stemmer):
+    dictionary, stopwords = resources
+    doc_ids = list(documents)
+    model = build_tf_idf_matrix(build_inverted_index(documents))
+    rows = [model["doc_ids"].index(doc_id) for doc_id in doc_ids]
+    queries = [
+        process_query(query, stopwords, dictionary, stemmer) for query in QUERIES
+    ]
+
+    for query, scores in zip(queries, score_queries(model, queries)):
+        expected = reference_scores(list(documents.values()), query)
+        scores = scores[rows].tolist()
+        assert scores == pytest.approx(expected, abs=1e-12)
+        assert ranking(doc_ids, scores) == ranking(doc_ids, expected)
+
+
+def test_search_batch_breaks_ties_like_search(tmp_path):
+    # Isi berbeda (hash berbeda) dengan kata dasar yang sama menghasilkan skor sama.
+    directory = tmp_path / "documents"
+    directory.mkdir()
+    contents = [
+        "tomat buah merah",
+        "Tomat buah merah.",
+        "tomat, buah, merah",
+        "TOMAT BUAH MERAH!",
+        "tomat tomat buah",
+        "buah merah",
+    ]
+    # Dokumen lain agar IDF term query positif.
+    contents += ["bunga kata dasar", "kata dasar", "bunga", "dasar bunga", "kata"]
+    for number, content in enumerate(contents):
+        (directory / f"{number}.txt").write_text(content, encoding="utf-8")
+    index_dir = str(tmp_path / "index")
+    build_index(str(directory), DICTIONARY_PATH, STOPWORDS_PATH, index_dir)
+
+    engine = SearchEngine(DICTIONARY_PATH, STOPWORDS_PATH)
+    engine.load(index_dir)
+    try:
+        for k in range(1, len(contents) + 1):
+            single = engine.search("tomat buah", k)["results"]
+            (batch,) = engine.search_batch(["tomat buah"], k)
+            assert [item["file_path"] for item in batch["results"]] == [
+                item["file_path"] for item in single
+            ]
+            assert [item["similarity"] for item in batch["results"]] == pytest.approx(
+                [item["similarity"] for item in single], abs=1e-12
+            )
+        scores = [item["similarity"] for item in single]
+        tied = [item["file_path"] for item in single if item["similarity"] == scores[1]]
+        assert len(tied) == 4
+        assert tied == sorted(tied, reverse=True)
+    finally:
+        engine.close()
@@ -0,0 +1,95 @@
+import shutil
+import pytest
+from build_stem_table import corpus_vocabulary
+from conftest import DICTIONARY_PATH, DOCUMENTS_DIR
+from utils.stem_cache_utils import CachedStemmer
+from utils.stem_table_utils import (
+    build_stem_table,
+    create_base_stemmer,
+    load_stem_table,
+    save_stem_table,
+)
+
+
+@pytest.fixture(scope="module")
+def sastrawi_stemmer():
+    """
+    Stemmer Sastrawi bawaan dari StemmerFactory, tanpa perubahan apa pun.
+    """
+    factory = pytest.importorskip("Sastrawi.Stemmer.StemmerFactory")
+    return factory.StemmerFactory().create_stemmer()
+
+
+def test_stem_table_matches_sastrawi(resources, sastrawi_stemmer, tmp_path):
+    dictionary, _ = resources
+    vocabulary = corpus_vocabulary(DOCUMENTS_DIR)
+    path = str(tmp_path / "stem_table.tsv.gz")
+    save_stem_table(build_stem_table(vocabulary, dictionary), path, DICTIONARY_PATH)
+    table = load_stem_table(path, DICTIONARY_PATH)
+
+    assert set(table) == vocabulary
+    for word in sorted(vocabulary):
+        assert table[word] == sastrawi_stemmer.stem(word), word
+
+
+IRREGULAR_WORDS = [
+    "mempermainkan",
+    "pengeluaran",
+    "memberdayakan",
+    "perekonomian",
+    "mentaati",
+    "menikmati",
+    "pengetahuan",
+    "kemerdekaan",
+]
+
+
+def test_stem_table_lookup_matches_stemmer(resources, sastrawi_stemmer, tmp_path):
+    dictionary, _ = resources
+    path = str(tmp_path / "stem_table.tsv.gz")
+    save_stem_table(
+        build_stem_table(IRREGULAR_WORDS, dictionary), path, DICTIONARY_PATH
+    )
+    cached = CachedStemmer(
+        create_base_stemmer(), table=load_stem_table(path, DICTIONARY_PATH)
+    )
+
+    for word in IRREGULAR_WORDS:
+        assert cached.stem(word) == sastrawi_stemmer.stem(word), word
+    assert cached.table_hits == len(IRREGULAR_WORDS)
+    assert cached.misses == 0
+
+
+def test_stem_table_falls_back_to_stemmer(sastrawi_stemmer):
+    # Hasil tabel sengaja dibuat berbeda dari Sastrawi agar sumbernya terlihat.
+    cached = CachedStemmer(create_base_stemmer(), table={"menyapu": "tabel"})
+
+    assert cached.stem("menyapu") == "tabel"
+    assert cached.stem("berlari") == sastrawi_stemmer.stem("berlari") == "lari"
+    assert cached.stem("berlari") == "lari"
+    assert (cached.table_hits, cached.misses, cached.hits) == (1, 1, 1)
+
+
+def test_stem_table_rebuilt_when_dictionary_changes(resources, tmp_path):
+    dictionary, _ = resources
+    dictionary_path = tmp_path / "dictionary.txt"
+    shutil.copyfile(DICTIONARY_PATH, dictionary_path)
+    path = str(tmp_path / "stem_table.tsv.gz")
+    save_stem_table(
+        build_stem_table(["pengeluaran"], dictionary), path, str(dictionary_path)
+    )
+    assert load_stem_table(path, str(dictionary_path)) == {"pengeluaran": "keluar"}
+
+    with open(dictionary_path, "a", encoding="utf-8") as file:
+        file.write("katabaru\n")
+    assert load_stem_table(path, str(dictionary_path)) == {}
+
+    save_stem_table(
+        build_stem_table(["pengeluaran", "katabaru"], dictionary | {"katabaru"}),
+        path,
+        str(dictionary_path),
+    )
+    assert load_stem_table(path, str(dictionary_path)) == {
+        "katabaru": "katabaru",
+        "pengeluaran": "keluar",
+    }
@@ -0,0 +1,71 @@
+import pytest
+from conftest import DOCUMENTS_DIR
+from utils.document_reader_utils import read_file
+from utils.text_utils import list_files
+from utils.tokenizer_utils import iter_tokens, nltk_tokenize, regex_tokenize
+
+# Hasil word_tokenize NLTK (huruf kecil, hanya token alfanumerik) untuk teks berbahasa
+# Indonesia, sehingga tokenizer regex tetap diuji tanpa model punkt.
+EXPECTED_TOKENS = [
+    (
+        'Tomat, secara ilmiah, adalah buah! Benarkah? (Ya) "tentu"; lalu: selesai... '
+        "[catatan] {kurung} <tag> * bintang.",
+        ["tomat", "secara", "ilmiah", "adalah", "buah", "benarkah", "ya", "tentu"]
+        + ["lalu", "selesai", "catatan", "kurung", "tag", "bintang"],
+    ),
+    (
+        "Harga naik 3.5 persen pada 2023, dari Rp10.000 menjadi Rp 12.500,00 atau "
+        "1,5 kali; skor 8/10 dan 50%.",
+        ["harga", "naik", "persen", "pada", "2023", "dari", "menjadi", "rp", "atau"]
+        + ["kali", "skor", "dan", "50"],
+    ),
+    (
+        "Anak-anak bermain sampai-sampai lupa waktu -- lalu pulang – cepat; e-mail dan "
+        "COVID-19.",
+        ["bermain", "lupa", "waktu", "lalu", "pulang", "cepat", "dan"],
+    ),
+    (
+        "Pada hari Jum'at, Qur'an dibaca. Katanya 'bagus' dan IT'S fine, don't worry.",
+        ["pada", "hari", "dibaca", "katanya", "bagus", "dan", "it", "fine", "do"]
+        + ["worry"],
+    ),
+    (
+        "Belajar matematika, fisika, dll. setiap hari. Surat tsb. dikirim kepada Yth. "
+        "Bapak S. Parman dsb.",
+        ["belajar", "matematika", "fisika", "dll", "setiap", "hari", "surat", "tsb"]
+        + ["dikirim", "kepada", "yth", "bapak", "parman", "dsb"],
+    ),
+    (
+        "Langkah: 1. siapkan bahan 2. masak a. tumis b. rebus. Selesai 3.",
+        ["langkah", "siapkan", "bahan", "masak", "tumis", "rebus", "selesai", "3"],
+    ),
+]
+
+
+@pytest.mark.parametrize("text, expected", EXPECTED_TOKENS)
+def test_regex_tokens_match_expected(text, expected):
+    assert regex_tokenize(text) == expected
+    assert [token for token, _, _ in iter_tokens(text)] == expected
+
+
+@pytest.mark.parametrize("text, expected", EXPECTED_TOKENS)
+def test_expected_tokens_match_nltk(punkt, text, expected):
+    assert nltk_tokenize(text) == expected
+
+
+@pytest.fixture(scope="module")
+def punkt():
+    """
+    Melewati pengujian jika model punkt untuk word_tokenize belum diunduh.
+    """
+    nltk = pytest.importorskip("nltk")
+    try:
+        nltk.data.find("tokenizers/punkt_tab")
+    except LookupError:
+        pytest.skip("Model punkt_tab NLTK belum tersedia")
+
+
+@pytest.mark.parametrize("file_path", list_files(DOCUMENTS_DIR))
+def test_regex_tokens_match_nltk(punkt, file_path):
+    text = read_file(file_path, use_cache=False)
+    assert regex_tokenize(text) == nltk_tokenize(text)
@@ -0,0 +1,195 @@
+import os
+import random
+from docx import Document
+from utils.document_reader_utils import load_dict, load_stopwords
+
+WORDS_PER_LINE = 12
+LINES_PER_PAGE = 40
+
+
+def build_vocabulary(dictionary_path, stopwords_path, stopword_ratio=0.4, seed=0):
+    """
+    Menyusun kosakata sintetis dari kamus kata dasar dan stopwords.
+
+    Hanya kata kamus berhuruf kecil yang dipakai, lalu urutannya diacak sehingga kata
+    yang paling sering muncul tidak selalu kata-kata awal abjad.
+
+    Parameters:
+        dictionary_path (str): Path ke file kamus.
+        stopwords_path (str): Path ke file stopwords.
+        stopword_ratio (float): Proporsi kata dalam teks yang diambil dari stopwords.
+        seed (int): Seed generator acak untuk urutan kata.
+
+    Returns:
+        dict: Daftar kata kamus, daftar stopwords, dan proporsi stopwords.
+    """
+    words = sorted(
+        word for word in load_dict(dictionary_path) if word.isalpha() and word.islower()
+    )
+    random.Random(seed).shuffle(words)
+    return {
+        "words": words,
+        "stopwords": sorted(load_stopwords(stopwords_path)),
+        "stopword_ratio": stopword_ratio,
+    }
+
+
+def generate_words(vocabulary, count, rng):
+    """
+    Menghasilkan deretan kata acak dengan distribusi mendekati hukum Zipf.
+
+    Parameters:
+        vocabulary (dict): Hasil build_vocabulary.
+        count (int): Jumlah kata.
+        rng (random.Random): Generator bilangan acak.
+
+    Returns:
+        list: Daftar kata.
+    """
+    words = vocabulary["words"]
+    stopwords = vocabulary["stopwords"]
+    result = []
+    for _ in range(count):
+        if stopwords and rng.random() < vocabulary["stopword_ratio"]:
+            result.append(rng.choice(stopwords))
+        else:
+            # Indeks berdistribusi Pareto agar sebagian kecil kata sangat sering muncul.
+            position = int(rng.paretovariate(0.8)) - 1
+            result.append(words[position % len(words)])
+    return result
+
+
+def split_lines(words):
+    return [
+        " ".join(words[start : start + WORDS_PER_LINE])
+        for start in range(0, len(words), WORDS_PER_LINE)
+    ]
+
+
+def write_txt(file_name, lines):
+    with open(file_name, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines))
+
+
+def write_docx(file_name, lines):
+    docx = Document()
+    for line in lines:
+        docx.add_paragraph(line)
+    docx.save(file_name)
+
+
+def write_pdf(file_name, lines):
+    """
+    Menulis PDF sederhana berisi teks dengan font standar Helvetica.
+
+    Parameters:
+        file_name (str): Path file PDF tujuan.
+        lines (list): Baris-baris teks (hanya karakter latin-1).
+    """
+    pages = [
+        lines[start : start + LINES_PER_PAGE]
+        for start in range(0, len(lines), LINES_PER_PAGE)
+    ] or [[]]
+
+    objects = []
+    page_ids = [4 + 2 * position for position in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects.append(
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode("latin-1")
+    )
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for page_id, page_lines in zip(page_ids, pages):
+        objects.append(
+            (
+                "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+            ).encode("latin-1")
+        )
+        text = " T* ".join(f"({line}) Tj" for line in page_lines)
+        stream = f"BT /F1 10 Tf 14 TL 50 760 Td {text} ET".encode("latin-1")
+        objects.append(
+            f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1")
+            + stream
+            + b"\nendstream"
+        )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode("latin-1")
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode("latin-1")
+
+    with open(file_name, "wb") as file:
+        file.write(output)
+
+
+WRITERS = {"txt": write_txt, "docx": write_docx, "pdf": write_pdf}
+
+
+def generate_corpus(
+    output_dir,
+    num_documents,
+    vocabulary,
+    words_per_document=500,
+    formats=None,
+    seed=0,
+):
+    """
+    Membuat korpus dokumen sintetis berbahasa Indonesia.
+
+    Parameters:
+        output_dir (str): Direktori tujuan.
+        num_documents (int): Jumlah dokumen.
+        vocabulary (dict): Hasil build_vocabulary.
+        words_per_document (int): Rata-rata jumlah kata per dokumen.
+        formats (dict, optional): Bobot setiap format, misalnya {"txt": 6, "docx": 2, "pdf": 2}.
+        seed (int): Seed generator acak agar korpus dapat dibuat ulang.
+
+    Returns:
+        list: Daftar path file yang dibuat.
+    """
+    formats = formats or {"txt": 1}
+    rng = random.Random(seed)
+    os.makedirs(output_dir, exist_ok=True)
+
+    names = list(formats)
+    weights = [formats[name] for name in names]
+    files = []
+    for number in range(num_documents):
+        extension = rng.choices(names, weights)[0]
+        count = max(1, int(rng.gauss(words_per_document, words_per_document / 4)))
+        lines = split_lines(generate_words(vocabulary, count, rng))
+        file_name = os.path.join(output_dir, f"dokumen_{number:06d}.{extension}")
+        WRITERS[extension](file_name, lines)
+        files.append(file_name)
+    return files
+
+
+def generate_queries(vocabulary, count, seed=0, max_terms=4):
+    """
+    Membuat query acak dari kata-kata kamus.
+
+    Parameters:
+        vocabulary (dict): Hasil build_vocabulary.
+        count (int): Jumlah query.
+        seed (int): Seed generator acak.
+        max_terms (int): Jumlah kata maksimum per query.
+
+    Returns:
+        list: Daftar query.
+    """
+    rng = random.Random(seed + 1)
+    vocabulary = {**vocabulary, "stopword_ratio": 0}
+    return [
+        " ".join(generate_words(vocabulary, rng.randint(1, max_terms), rng))
+        for _ in range(count)
+    ]
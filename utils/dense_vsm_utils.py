@@ -0,0 +1,145 @@
+import numpy as np
+from collections import Counter
+from utils.sparse_vsm_utils import select_top_k
+
+DENSE_DIMENSIONS = 256
+DENSE_METHODS = ("lsa", "random")
+
+
+def build_dense_model(model, method="lsa", dimensions=DENSE_DIMENSIONS, seed=0):
+    """
+    Mereduksi matriks TF-IDF menjadi vektor dense berdimensi rendah untuk pencarian
+    perkiraan (approximate).
+
+    Metode "lsa" memakai truncated SVD (Latent Semantic Analysis): matriks TF-IDF A
+    didekati dengan U S V^T dan vektor dokumen adalah A V. Metode "random" memakai random
+    projection Gaussian: vektor dokumen adalah A R dengan R matriks acak. Query
+    diproyeksikan dengan matriks yang sama (V atau R), sehingga biaya query hanya satu
+    perkalian matriks-vektor dense terhadap vektor dokumen, tidak lagi bergantung pada
+    ukuran vocabulary.
+
+    Parameters:
+        model (dict): Model hasil build_tf_idf_matrix.
+        method (str): "lsa" atau "random".
+        dimensions (int): Jumlah dimensi. Untuk LSA dibatasi oleh jumlah dokumen dan term.
+        seed (int): Seed matriks acak.
+
+    Returns:
+        dict: Model dense berisi posisi kolom setiap term, nilai IDF, urutan id dokumen,
+            matriks proyeksi term (jumlah term x dimensi), dan vektor dokumen ternormalisasi
+            (jumlah dokumen x dimensi) dalam array float32 yang berurutan di memori.
+    """
+    matrix = model["matrix"]
+    if method == "lsa":
+        if min(matrix.shape) < 2:
+            # svds membutuhkan minimal 2 dokumen dan 2 term; matriks sekecil ini cukup
+            # diuraikan dengan SVD penuh.
+            _, _, vt = np.linalg.svd(matrix.toarray(), full_matrices=False)
+            projection = vt[:dimensions].T
+        else:
+            from scipy.sparse.linalg import svds
+
+            dimensions = max(1, min(dimensions, min(matrix.shape) - 1))
+            # svds membutuhkan vektor awal agar hasilnya sama di setiap pemanggilan.
+            start = np.random.default_rng(seed).standard_normal(min(matrix.shape))
+            _, _, vt = svds(matrix, k=dimensions, v0=start)
+            projection = vt.T
+    elif method == "random":
+        rng = np.random.default_rng(seed)
+        projection = rng.standard_normal((matrix.shape[1], dimensions))
+        projection /= np.sqrt(dimensions)
+    else:
+        raise ValueError(f"Metode reduksi dimensi tidak dikenal: {method}")
+
+    projection = np.ascontiguousarray(projection, dtype=np.float32)
+    doc_vectors = np.ascontiguousarray(matrix @ projection, dtype=np.float32)
+    return {
+        "method": method,
+        "terms": model["terms"],
+        "idf": model["idf"],
+        "doc_ids": model["doc_ids"],
+        "projection": projection,
+        "doc_vectors": normalize_vectors(doc_vectors),
+    }
+
+
+def normalize_vectors(vectors):
+    """
+    Normalisasi L2 setiap baris matriks dense, baris bernilai nol dibiarkan nol.
+
+    Parameters:
+        vectors (numpy.ndarray): Matriks dense.
+
+    Returns:
+        numpy.ndarray: Matriks dengan panjang setiap baris bernilai 1.
+    """
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms != 0)
+
+
+def project_query(dense, query):
+    """
+    Memproyeksikan query ke ruang berdimensi rendah model dense.
+
+    Parameters:
+        dense (dict): Model hasil build_dense_model.
+        query (list): Daftar token query yang sudah di-stem.
+
+    Returns:
+        numpy.ndarray: Vektor query ternormalisasi (float32).
+    """
+    # Vektor query sparse hanya berisi beberapa term, sehingga proyeksinya cukup
+    # menjumlahkan baris matriks proyeksi term tersebut. TF tidak dibagi panjang query
+    # karena vektor hasil proyeksi dinormalisasi.
+    columns, weights = [], []
+    for term, count in Counter(query).items():
+        column = dense["terms"].get(term)
+        if column is not None:
+            columns.append(column)
+            weights.append(count * dense["idf"][column])
+    if not columns:
+        return np.zeros(dense["projection"].shape[1], dtype=np.float32)
+    weights = np.asarray(weights, dtype=np.float32)
+    return normalize_vectors(weights @ dense["projection"][columns])
+
+
+def search_top_k_dense(dense, query, k):
+    """
+    Cari perkiraan k dokumen dengan cosine similarity tertinggi pada ruang berdimensi
+    rendah dengan satu perkalian matriks-vektor.
+
+    Parameters:
+        dense (dict): Model hasil build_dense_model.
+        query (list): Daftar token query yang sudah di-stem.
+        k (int): Jumlah dokumen teratas yang dicari.
+
+    Returns:
+        list: Pasangan (id dokumen, perkiraan nilai kemiripan) dengan skor positif,
+            terurut menurun.
+    """
+    vector = project_query(dense, query)
+    if not vector.any():
+        return []
+    scores = dense["doc_vectors"] @ vector
+    return select_top_k(dense["doc_ids"], np.arange(len(scores)), scores, k)
+
+
+def recall_at_k(exact, approximate, k):
+    """
+    Menghitung recall@k rata-rata hasil perkiraan terhadap hasil eksak.
+
+    Parameters:
+        exact (list): Untuk setiap query, daftar id dokumen hasil eksak terurut menurun.
+        approximate (list): Untuk setiap query, daftar id dokumen hasil perkiraan.
+        k (int): Jumlah dokumen teratas yang dibandingkan.
+
+    Returns:
+        float | None: Rata-rata proporsi k dokumen teratas eksak yang juga ditemukan oleh
+            hasil perkiraan, None jika tidak ada query dengan hasil eksak.
+    """
+    recalls = [
+        len(set(expected[:k]) & set(found[:k])) / len(expected[:k])
+        for expected, found in zip(exact, approximate)
+        if expected
+    ]
+    return sum(recalls) / len(recalls) if recalls else None
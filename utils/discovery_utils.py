@@ -0,0 +1,316 @@
+import os
+import zlib
+import base64
+import fnmatch
+import numpy as np
+from utils.document_reader_utils import file_hash
+
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+MINHASH_SEED = 0
+MINHASH_BATCH_SIZE = 8192
+NEAR_DUPLICATE_THRESHOLD = 0.9
+
+# Koefisien hash universal multiply-shift: setiap permutasi MinHash adalah
+# ((a * h + b) mod 2^64) >> 32 dengan a ganjil.
+MINHASH_A, MINHASH_B = np.random.default_rng(MINHASH_SEED).integers(
+    1, 2**63, (2, MINHASH_PERMUTATIONS), dtype=np.uint64
+)
+MINHASH_A |= 1
+# Pengali untuk menggabungkan hash term dalam satu shingle sesuai urutannya.
+SHINGLE_MULTIPLIERS = np.array(
+    [0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64
+)
+
+
+def matches_any(path, name, patterns):
+    """
+    Memeriksa apakah path relatif atau nama file cocok dengan salah satu pola glob.
+
+    Parameters:
+        path (str): Path relatif terhadap direktori korpus dengan pemisah "/".
+        name (str): Nama file atau direktori.
+        patterns (iterable): Pola glob, misalnya "*.pdf" atau "arsip/*".
+
+    Returns:
+        bool: True jika ada pola yang cocok.
+    """
+    return any(
+        fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(name, pattern)
+        for pattern in patterns
+    )
+
+
+def scan_files(directory, include=(), exclude=(), min_size=0, max_size=None):
+    """
+    Menelusuri direktori beserta seluruh subdirektorinya dengan os.scandir.
+
+    Pola glob dicocokkan dengan path relatif terhadap directory (pemisah "/") maupun nama
+    file. Direktori yang cocok dengan pola exclude tidak ditelusuri. Symlink ke direktori
+    tidak diikuti agar penelusuran tidak berputar, dan subdirektori yang tidak dapat
+    dibaca dilewati.
+
+    Parameters:
+        directory (str): Direktori yang berisi dokumen.
+        include (iterable): Hanya file yang cocok dengan salah satu pola ini yang diambil.
+            Kosong berarti seluruh file.
+        exclude (iterable): File dan direktori yang cocok dengan salah satu pola ini
+            dilewati.
+        min_size (int): Ukuran file minimum dalam byte.
+        max_size (int, optional): Ukuran file maksimum dalam byte.
+
+    Returns:
+        list: Path file yang terurut.
+
+    Raises:
+        OSError: Jika directory tidak dapat dibaca.
+    """
+    files = []
+    pending = [(directory, "")]
+    while pending:
+        path, relative = pending.pop()
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            if path == directory:
+                raise
+            continue
+        for entry in entries:
+            entry_relative = f"{relative}{entry.name}"
+            if exclude and matches_any(entry_relative, entry.name, exclude):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, f"{entry_relative}/"))
+                    continue
+                if not entry.is_file():
+                    continue
+                if include and not matches_any(entry_relative, entry.name, include):
+                    continue
+                if min_size or max_size is not None:
+                    size = entry.stat().st_size
+                    if size < min_size or (max_size is not None and size > max_size):
+                        continue
+            except OSError:
+                continue
+            files.append(os.path.join(directory, *entry_relative.split("/")))
+    return sorted(files)
+
+
+def parse_patterns(value):
+    """
+    Mengubah pola glob yang dipisah koma, misalnya "*.pdf, arsip/*", menjadi list.
+    """
+    return [pattern.strip() for pattern in value.split(",") if pattern.strip()]
+
+
+def normalize_filters(filters=None):
+    """
+    Melengkapi pengaturan scan_files dengan nilai bawaannya agar dapat dibandingkan dan
+    disimpan di metadata index.
+
+    Parameters:
+        filters (dict, optional): Sebagian atau seluruh argumen include, exclude,
+            min_size, dan max_size.
+
+    Returns:
+        dict: Seluruh argumen scan_files, pola glob dalam bentuk list.
+    """
+    filters = filters or {}
+    return {
+        "include": list(filters.get("include") or []),
+        "exclude": list(filters.get("exclude") or []),
+        "min_size": filters.get("min_size") or 0,
+        "max_size": filters.get("max_size"),
+    }
+
+
+def find_duplicates(files, hashes=None):
+    """
+    Mencari file yang isinya sama persis dengan file lain sebelum teksnya diekstrak.
+
+    Tanpa hashes, file dikelompokkan berdasarkan ukuran lebih dulu sehingga hash konten
+    hanya dihitung untuk file yang ukurannya sama dengan file lain.
+
+    Parameters:
+        files (list): Daftar path file. File pertama dalam urutan ini yang dipertahankan.
+        hashes (dict, optional): Hash konten setiap file, misalnya dari fingerprint index.
+
+    Returns:
+        dict: Path file duplikat -> path file asli yang dipertahankan.
+    """
+    if hashes is None:
+        by_size = {}
+        for file_path in files:
+            try:
+                by_size.setdefault(os.path.getsize(file_path), []).append(file_path)
+            except OSError:
+                continue
+        hashes = {}
+        for group in by_size.values():
+            if len(group) > 1:
+                for file_path in group:
+                    try:
+                        hashes[file_path] = file_hash(file_path)
+                    except OSError:
+                        continue
+
+    originals, duplicates = {}, {}
+    for file_path in files:
+        content_hash = hashes.get(file_path)
+        if content_hash is None:
+            continue
+        original = originals.setdefault(content_hash, file_path)
+        if original != file_path:
+            duplicates[file_path] = original
+    return duplicates
+
+
+def recorded_duplicates(records):
+    """
+    Mengambil file duplikat yang dicatat pada fingerprint file sebuah index.
+
+    Parameters:
+        records (dict): Fingerprint setiap file, lihat update_index.
+
+    Returns:
+        dict: Path file duplikat -> path file asli, baik yang isinya sama persis maupun
+            yang hampir sama.
+    """
+    return {
+        file_path: record.get("duplicate_of") or record["near_duplicate_of"]
+        for file_path, record in records.items()
+        if "duplicate_of" in record or "near_duplicate_of" in record
+    }
+
+
+def minhash_signature(terms):
+    """
+    Menghitung signature MinHash dari shingle kata dasar sebuah dokumen.
+
+    Shingle adalah SHINGLE_SIZE kata dasar berurutan. Hash term dihitung dengan CRC32
+    sehingga signature sama di setiap proses dan setiap kali index dibangun.
+
+    Parameters:
+        terms (list): Kata dasar dokumen sesuai urutan kemunculannya.
+
+    Returns:
+        numpy.ndarray | None: Signature berupa MINHASH_PERMUTATIONS bilangan uint32, atau
+            None jika dokumen tidak memiliki kata dasar.
+    """
+    if not terms:
+        return None
+    term_hashes = {}
+    hashes = np.fromiter(
+        (
+            term_hashes.setdefault(term, zlib.crc32(term.encode("utf-8")))
+            for term in terms
+        ),
+        dtype=np.uint64,
+        count=len(terms),
+    )
+    size = min(SHINGLE_SIZE, len(hashes))
+    shingles = np.zeros(len(hashes) - size + 1, dtype=np.uint64)
+    for offset in range(size):
+        shingles += (
+            hashes[offset : offset + len(shingles)] * SHINGLE_MULTIPLIERS[offset]
+        )
+
+    signature = np.full(MINHASH_PERMUTATIONS, np.iinfo(np.uint32).max, dtype=np.uint64)
+    for start in range(0, len(shingles), MINHASH_BATCH_SIZE):
+        batch = shingles[start : start + MINHASH_BATCH_SIZE]
+        permuted = (MINHASH_A[:, None] * batch + MINHASH_B[:, None]) >> np.uint64(32)
+        np.minimum(signature, permuted.min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+def encode_signature(signature):
+    """
+    Mengubah signature MinHash menjadi string agar dapat disimpan di metadata index.
+    """
+    return base64.b64encode(signature.astype("<u4").tobytes()).decode("ascii")
+
+
+def decode_signature(value):
+    """
+    Mengembalikan signature MinHash dari hasil encode_signature.
+    """
+    return np.frombuffer(base64.b64decode(value), dtype="<u4").astype(np.uint32)
+
+
+class NearDuplicateDetector:
+    """
+    Pendeteksi dokumen yang hampir sama berdasarkan signature MinHash.
+
+    Signature dibagi menjadi MINHASH_BANDS band (locality-sensitive hashing), sehingga
+    setiap dokumen baru hanya dibandingkan dengan dokumen yang memiliki band yang sama.
+    Dua dokumen dianggap hampir sama jika perkiraan kemiripan Jaccard shingle-nya
+    (proporsi nilai signature yang sama) paling sedikit threshold. Dari setiap kelompok,
+    dokumen dengan path terkecil yang dipertahankan, apa pun urutan dokumen ditambahkan.
+    """
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD, bands=MINHASH_BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.buckets = {}
+        self.signatures = {}
+        self.duplicates = {}
+
+    def band_keys(self, signature):
+        return [
+            (band, chunk.tobytes())
+            for band, chunk in enumerate(np.array_split(signature, self.bands))
+        ]
+
+    def insert(self, doc_id, signature):
+        """
+        Mencatat dokumen yang dipertahankan tanpa membandingkannya dengan dokumen lain.
+
+        Parameters:
+            doc_id (str): Id dokumen.
+            signature (numpy.ndarray): Signature MinHash dokumen.
+        """
+        self.signatures[doc_id] = signature
+        for key in self.band_keys(signature):
+            self.buckets.setdefault(key, set()).add(doc_id)
+
+    def remove(self, doc_id):
+        signature = self.signatures.pop(doc_id)
+        for key in self.band_keys(signature):
+            self.buckets[key].discard(doc_id)
+
+    def add(self, doc_id, signature):
+        """
+        Membandingkan dokumen baru dengan dokumen yang dipertahankan.
+
+        Parameters:
+            doc_id (str): Id dokumen.
+            signature (numpy.ndarray): Signature MinHash dokumen.
+
+        Returns:
+            tuple: Id dokumen asli jika doc_id hampir sama dengan dokumen yang path-nya
+                lebih kecil (None jika doc_id dipertahankan), dan daftar dokumen yang
+                sebelumnya dipertahankan tetapi kini menjadi duplikat doc_id.
+        """
+        candidates = set()
+        for key in self.band_keys(signature):
+            candidates.update(self.buckets.get(key, ()))
+        matches = sorted(
+            candidate
+            for candidate in candidates
+            if np.mean(self.signatures[candidate] == signature) >= self.threshold
+        )
+        if matches and matches[0] < doc_id:
+            self.duplicates[doc_id] = matches[0]
+            return matches[0], []
+
+        for replaced in matches:
+            self.remove(replaced)
+            self.duplicates[replaced] = doc_id
+        if matches:
+            for duplicate, original in self.duplicates.items():
+                if original in matches:
+                    self.duplicates[duplicate] = doc_id
+        self.insert(doc_id, signature)
+        return None, matches
@@ -1,7 +1,31 @@
+import os
 import csv
-import streamlit as st
-from docx import Document
-from PyPDF2 import PdfReader
+import hashlib
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from utils.text_cache_utils import get_shared_text_cache
+
+HASH_CHUNK_SIZE = 1024 * 1024
+TEXT_CHUNK_SIZE = 64 * 1024
+# Paket dan revisi ekstraktor yang menjadi bagian key cache teks (lihat
+# extractor_version): naikkan revisi jika cara iter_docx atau iter_pdf mengekstrak teks
+# berubah.
+EXTRACTORS = {".docx": ("python-docx", 1), ".pdf": ("PyPDF2", 1)}
+# Pemisah paragraf DOCX; halaman PDF digabungkan tanpa pemisah.
+DOCX_SEPARATOR = "\n"
+UNSUPPORTED_FORMAT_MESSAGE = "Format file tidak didukung, hanya file dengan ekstensi **.txt**, **.docx**, atau **.pdf** yang diperbolehkan."
+
+
+class DocumentError(Exception):
+    """
+    Kesalahan saat membaca file, beserta tingkatannya ("error", "warning", atau "info")
+    agar pemanggil dapat menampilkannya dengan cara yang sesuai.
+    """
+
+    def __init__(self, message, level="error"):
+        super().__init__(message)
+        self.message = message
+        self.level = level
 
 
 def load_dict(file_name):
@@ -13,6 +37,9 @@ def load_dict(file_name):
 
     Returns:
         set: Kumpulan kata dasar dari file kamus.
+
+    Raises:
+        DocumentError: Jika file tidak ditemukan, kosong, atau gagal dibaca.
     """
     dictionary = set()
     try:
@@ -21,12 +48,12 @@ def load_dict(file_name):
                 word = row.strip()
                 if word:
                     dictionary.add(word)
-        if not dictionary:
-            st.error(ValueError("File kamus tidak boleh kosong!"), icon="‼️")
-    except FileNotFoundError:
-        st.warning(f"File *{file_name}* tidak ditemukan.", icon="⚠️")
+    except FileNotFoundError as e:
+        raise DocumentError(f"File *{file_name}* tidak ditemukan.", "warning") from e
     except Exception as e:
-        st.info(f"Kesalahan saat membaca file kamus: {e}", icon="ℹ️")
+        raise DocumentError(f"Kesalahan saat membaca file kamus: {e}", "info") from e
+    if not dictionary:
+        raise DocumentError("File kamus tidak boleh kosong!")
     return dictionary
 
 
@@ -39,6 +66,9 @@ def load_stopwords(file_name):
 
     Returns:
         set: Kumpulan stopwords.
+
+    Raises:
+        DocumentError: Jika file tidak ditemukan, kosong, atau gagal dibaca.
     """
     stopwords = set()
     try:
@@ -47,12 +77,14 @@ def load_stopwords(file_name):
             for row in csv_reader:
                 if row:  # Abaikan baris kosong
                     stopwords.add(row[0].strip())
-        if not stopwords:
-            st.error(ValueError("File stopwords tidak boleh kosong!"), icon="‼️")
-    except FileNotFoundError:
-        st.warning(f"File *{file_name}* tidak ditemukan.", icon="⚠️")
+    except FileNotFoundError as e:
+        raise DocumentError(f"File *{file_name}* tidak ditemukan.", "warning") from e
     except Exception as e:
-        st.info(f"Kesalahan saat membaca file stopwords: {e}", icon="ℹ️")
+        raise DocumentError(
+            f"Kesalahan saat membaca file stopwords: {e}", "info"
+        ) from e
+    if not stopwords:
+        raise DocumentError("File stopwords tidak boleh kosong!")
     return stopwords
 
 
@@ -69,14 +101,13 @@ def read_txt(file_name):
     try:
         with open(file_name, "r", encoding="utf-8") as file:
             text = file.read()
-        if not text:
-            st.error(ValueError("File txt tidak boleh kosong!"), icon="‼️")
-        return text
-    except FileNotFoundError:
-        st.warning(f"File *{file_name}* tidak ditemukan.", icon="⚠️")
+    except FileNotFoundError as e:
+        raise DocumentError(f"File *{file_name}* tidak ditemukan.", "warning") from e
     except Exception as e:
-        st.info(f"Kesalahan saat membaca file txt: {e}", icon="ℹ️")
-        return ""
+        raise DocumentError(f"Kesalahan saat membaca file txt: {e}", "info") from e
+    if not text:
+        raise DocumentError("File txt tidak boleh kosong!")
+    return text
 
 
 def read_docx(file_name):
@@ -89,21 +120,22 @@ def read_docx(file_name):
     Returns:
         str: Konten teks dari file.
     """
+    from docx import Document
+
     try:
         docx = Document(file_name)
         full_text = []
         for paragraph in docx.paragraphs:
             if paragraph.text.strip():  # Abaikan paragraf kosong
                 full_text.append(paragraph.text)
-        text = "\n".join(full_text)
-        if not text:
-            st.error(ValueError("File docx tidak boleh kosong!"), icon="‼️")
-        return text
-    except FileNotFoundError:
-        st.warning(f"File *{file_name}* tidak ditemukan.", icon="⚠️")
+        text = DOCX_SEPARATOR.join(full_text)
+    except FileNotFoundError as e:
+        raise DocumentError(f"File *{file_name}* tidak ditemukan.", "warning") from e
     except Exception as e:
-        st.info(f"Kesalahan saat membaca file docx: {e}", icon="ℹ️")
-        return ""
+        raise DocumentError(f"Kesalahan saat membaca file docx: {e}", "info") from e
+    if not text:
+        raise DocumentError("File docx tidak boleh kosong!")
+    return text
 
 
 def read_pdf(file_name):
@@ -116,46 +148,261 @@ def read_pdf(file_name):
     Returns:
         str: Konten teks dari file PDF.
     """
+    from PyPDF2 import PdfReader
+
     try:
         with open(file_name, "rb") as file:
             pdf = PdfReader(file)
-            if not pdf.pages:
-                st.error(ValueError("PDF tidak memiliki halaman!"), icon="‼️")
-            text = ""
+            page_count = len(pdf.pages)
+            pages = []
             for page in pdf.pages:
                 page_text = page.extract_text()
                 if page_text:  # Abaikan halaman kosong
-                    text += page_text
-            if not text:
-                st.error(ValueError("File PDF tidak boleh kosong!"), icon="‼️")
-            return text
-    except FileNotFoundError:
-        st.warning(f"File *{file_name}* tidak ditemukan.", icon="⚠️")
+                    pages.append(page_text)
+            text = "".join(pages)
+    except FileNotFoundError as e:
+        raise DocumentError(f"File *{file_name}* tidak ditemukan.", "warning") from e
     except Exception as e:
-        st.info(f"Kesalahan saat membaca file PDF: {e}", icon="ℹ️")
-        return ""
+        raise DocumentError(f"Kesalahan saat membaca file PDF: {e}", "info") from e
+    if not page_count:
+        raise DocumentError("PDF tidak memiliki halaman!")
+    if not text:
+        raise DocumentError("File PDF tidak boleh kosong!")
+    return text
 
 
-def read_file(file_name):
+def read_file(file_name, use_cache=True):
     """
     Membaca file berdasarkan ekstensinya (.txt, .docx, .pdf).
 
+    Teks file DOCX dan PDF diambil dari cache teks hasil ekstraksi jika isi file pernah
+    diekstrak sebelumnya, lihat cached_chunks.
+
     Parameters:
         file_name (str): Path ke file input.
+        use_cache (bool): Pakai cache teks hasil ekstraksi untuk file DOCX dan PDF.
 
     Returns:
         str: Konten teks dari file.
+
+    Raises:
+        DocumentError: Jika file tidak ditemukan, kosong, gagal dibaca, atau formatnya
+            tidak didukung.
     """
     if file_name.endswith(".txt"):
         return read_txt(file_name)
     elif file_name.endswith(".docx"):
-        return read_docx(file_name)
+        chunks = list(cached_chunks(file_name, iter_docx)) if use_cache else None
+        # Tanpa teks, baca ulang langsung agar pesan kesalahannya sama seperti read_docx.
+        return DOCX_SEPARATOR.join(chunks) if chunks else read_docx(file_name)
     elif file_name.endswith(".pdf"):
-        return read_pdf(file_name)
+        chunks = list(cached_chunks(file_name, iter_pdf)) if use_cache else None
+        return "".join(chunks) if chunks else read_pdf(file_name)
     else:
-        st.error(
-            ValueError(
-                "Format file tidak didukung, hanya file dengan ekstensi **.txt**, **.docx**, atau **.pdf** yang diperbolehkan."
-            ),
-            icon="‼️",
+        raise DocumentError(UNSUPPORTED_FORMAT_MESSAGE)
+
+
+@lru_cache(maxsize=None)
+def extractor_version(extension):
+    """
+    Membuat versi ekstraktor untuk sebuah ekstensi file, misalnya "PyPDF2 3.0.1/1".
+
+    Versi paket dibaca dari metadata paket saat pertama kali dibutuhkan, bukan saat modul
+    diimpor, sehingga file txt tetap dapat dibaca walaupun python-docx atau PyPDF2 belum
+    terpasang.
+
+    Parameters:
+        extension (str): Ekstensi file, ".docx" atau ".pdf".
+
+    Returns:
+        str: Nama paket, versinya, dan revisi ekstraktor.
+
+    Raises:
+        DocumentError: Jika paket ekstraktor belum terpasang.
+    """
+    package, revision = EXTRACTORS[extension]
+    try:
+        return f"{package} {version(package)}/{revision}"
+    except PackageNotFoundError as e:
+        raise DocumentError(
+            f"Paket {package} belum terpasang, file {extension} tidak dapat dibaca.",
+            "info",
+        ) from e
+
+
+def cached_chunks(file_name, reader, content_hash=None):
+    """
+    Mengambil potongan teks file dari cache teks hasil ekstraksi, atau mengekstraknya
+    dengan reader sambil menyimpannya ke cache.
+
+    Key cache adalah hash konten file dan versi ekstraktor (extractor_version), sehingga
+    setelah kamus, stopwords, atau pengaturan stemming berubah hanya tokenisasi dan
+    stemming yang diulang. Potongan hasil ekstraksi langsung diteruskan ke pemanggil
+    tanpa menampung seluruh teks, lalu disimpan setelah potongan terakhir (lihat
+    TextCache.store). File tanpa teks tidak disimpan.
+
+    Parameters:
+        file_name (str): Path ke file DOCX atau PDF.
+        reader (callable): Fungsi ekstraksi bertahap, iter_docx atau iter_pdf.
+        content_hash (str, optional): Hash konten file jika sudah diketahui, misalnya
+            dari fingerprint file, agar file tidak di-hash ulang.
+
+    Yields:
+        str: Potongan teks (paragraf atau halaman) dari file.
+
+    Raises:
+        DocumentError: Jika file tidak ditemukan atau gagal dibaca.
+    """
+    if content_hash is None:
+        try:
+            content_hash = file_hash(file_name)
+        except FileNotFoundError as e:
+            raise DocumentError(
+                f"File *{file_name}* tidak ditemukan.", "warning"
+            ) from e
+    extractor = extractor_version(os.path.splitext(file_name)[1])
+    cache = get_shared_text_cache()
+    chunks = cache.get(content_hash, extractor)
+    if chunks is None:
+        chunks = cache.store(content_hash, extractor, reader(file_name))
+    yield from chunks
+
+
+def iter_txt(file_name, chunk_size=TEXT_CHUNK_SIZE):
+    """
+    Membaca file txt secara bertahap dan menghasilkan potongan teks.
+
+    Setiap potongan berisi beberapa baris utuh hingga sekitar chunk_size karakter,
+    sehingga tidak ada kata yang terpotong di antara dua potongan.
+
+    Parameters:
+        file_name (str): Path ke file txt.
+        chunk_size (int): Perkiraan jumlah karakter maksimum per potongan.
+
+    Yields:
+        str: Potongan teks dari file.
+    """
+    try:
+        with open(file_name, "r", encoding="utf-8") as file:
+            lines = []
+            size = 0
+            for line in file:
+                lines.append(line)
+                size += len(line)
+                if size >= chunk_size:
+                    yield "".join(lines)
+                    lines, size = [], 0
+            if lines:
+                yield "".join(lines)
+    except FileNotFoundError as e:
+        raise DocumentError(f"File *{file_name}* tidak ditemukan.", "warning") from e
+    except Exception as e:
+        raise DocumentError(f"Kesalahan saat membaca file txt: {e}", "info") from e
+
+
+def iter_docx(file_name):
+    """
+    Membaca file docx dan menghasilkan teks per paragraf.
+
+    python-docx tetap memuat struktur dokumen sekaligus, tetapi teks tidak pernah
+    digabungkan menjadi satu string besar.
+
+    Parameters:
+        file_name (str): Path ke file docx.
+
+    Yields:
+        str: Teks satu paragraf yang tidak kosong.
+    """
+    from docx import Document
+
+    try:
+        docx = Document(file_name)
+        for paragraph in docx.paragraphs:
+            if paragraph.text.strip():  # Abaikan paragraf kosong
+                yield paragraph.text
+    except FileNotFoundError as e:
+        raise DocumentError(f"File *{file_name}* tidak ditemukan.", "warning") from e
+    except Exception as e:
+        raise DocumentError(f"Kesalahan saat membaca file docx: {e}", "info") from e
+
+
+def iter_pdf(file_name):
+    """
+    Membaca file PDF dan menghasilkan teks per halaman.
+
+    Parameters:
+        file_name (str): Path ke file PDF.
+
+    Yields:
+        str: Teks satu halaman yang tidak kosong.
+    """
+    from PyPDF2 import PdfReader
+
+    try:
+        with open(file_name, "rb") as file:
+            pdf = PdfReader(file)
+            for page in pdf.pages:
+                page_text = page.extract_text()
+                if page_text:  # Abaikan halaman kosong
+                    yield page_text
+    except FileNotFoundError as e:
+        raise DocumentError(f"File *{file_name}* tidak ditemukan.", "warning") from e
+    except Exception as e:
+        raise DocumentError(f"Kesalahan saat membaca file PDF: {e}", "info") from e
+
+
+def iter_file(file_name, use_cache=True, content_hash=None):
+    """
+    Membaca file secara bertahap berdasarkan ekstensinya (.txt, .docx, .pdf).
+
+    Potongan teks file DOCX dan PDF diambil dari cache teks hasil ekstraksi jika
+    tersedia, lihat cached_chunks. Paragraf DOCX diberi pemisah yang sama seperti
+    read_file, sehingga gabungan seluruh potongan sama dengan hasil read_file.
+
+    Parameters:
+        file_name (str): Path ke file input.
+        use_cache (bool): Pakai cache teks hasil ekstraksi untuk file DOCX dan PDF.
+        content_hash (str, optional): Hash konten file jika sudah diketahui, lihat
+            cached_chunks.
+
+    Yields:
+        str: Potongan teks (baris, paragraf, atau halaman) dari file.
+
+    Raises:
+        DocumentError: Jika file tidak ditemukan, gagal dibaca, atau formatnya tidak didukung.
+    """
+    if file_name.endswith(".txt"):
+        yield from iter_txt(file_name)
+    elif file_name.endswith(".docx"):
+        paragraphs = (
+            cached_chunks(file_name, iter_docx, content_hash)
+            if use_cache
+            else iter_docx(file_name)
+        )
+        for number, paragraph in enumerate(paragraphs):
+            yield DOCX_SEPARATOR + paragraph if number else paragraph
+    elif file_name.endswith(".pdf"):
+        yield from (
+            cached_chunks(file_name, iter_pdf, content_hash)
+            if use_cache
+            else iter_pdf(file_name)
         )
+    else:
+        raise DocumentError(UNSUPPORTED_FORMAT_MESSAGE)
+
+
+def file_hash(file_name):
+    """
+    Menghitung hash SHA-256 dari konten file secara bertahap.
+
+    Parameters:
+        file_name (str): Path ke file.
+
+    Returns:
+        str: Hash konten file dalam format heksadesimal.
+    """
+    digest = hashlib.sha256()
+    with open(file_name, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,371 @@
+from utils.dense_vsm_utils import DENSE_METHODS, build_dense_model, search_top_k_dense
+from utils.discovery_utils import recorded_duplicates
+from utils.index_utils import document_term_counts, search_top_k
+from utils.profiling_utils import profile_stage
+from utils.resource_utils import get_shared_resources, get_shared_stemmer
+from utils.result_cache_utils import index_generation, result_cache_key
+from utils.shard_utils import ShardedSearcher, shard_count_of
+from utils.snippet_utils import build_snippet
+from utils.sparse_vsm_utils import (
+    build_tf_idf_matrix,
+    search_top_k_vectorized,
+    select_top_k,
+    vectorize_queries,
+)
+from utils.storage_utils import load_index, resolve_index_dir
+from utils.document_reader_utils import DocumentError
+from utils.text_utils import process_query
+from utils.tokenizer_utils import DEFAULT_TOKENIZER
+
+QUERY_BATCH_SIZE = 1024
+
+
+class SearchEngine:
+    """
+    Mesin pencarian tanpa ketergantungan pada Streamlit.
+
+    Menyatukan pemuatan index tersimpan (lihat build_index.py), pemrosesan query, dan
+    perhitungan kemiripan. Seluruh hasil dan kesalahan dikembalikan sebagai struktur data biasa
+    sehingga dapat dipakai oleh UI, batch job, maupun benchmark.
+
+    Jika result_cache diberikan, hasil search disimpan per generasi index sehingga query
+    yang sama tidak dihitung ulang selama index, kamus, dan stopwords tidak berubah.
+    Index tersimpan yang dibagi menjadi shard dicari melalui ShardedSearcher; panggil
+    close untuk menghentikan proses shard server.
+    """
+
+    def __init__(
+        self,
+        dictionary_path,
+        stopwords_path,
+        tokenizer=DEFAULT_TOKENIZER,
+        result_cache=None,
+    ):
+        self.dictionary_path = dictionary_path
+        self.stopwords_path = stopwords_path
+        self.tokenizer = tokenizer
+        self.result_cache = result_cache
+        self.index = None
+        self.metadata = {}
+        self.model = None
+        self.dense_models = {}
+        self.generation = None
+        self.duplicates = {}
+        self.shards = None
+
+    @property
+    def resources(self):
+        """
+        Kamus dan stopwords bersama untuk proses ini.
+        """
+        return get_shared_resources(self.dictionary_path, self.stopwords_path)
+
+    @property
+    def stemmer(self):
+        """
+        Stemmer ber-cache bersama untuk proses ini.
+        """
+        return get_shared_stemmer(self.dictionary_path)
+
+    def set_index(self, index, metadata=None, generation=None):
+        """
+        Mengganti index yang dipakai untuk pencarian.
+
+        Parameters:
+            index (dict): Index hasil load_index, atau None untuk index yang dibagi
+                menjadi shard.
+            metadata (dict, optional): Metadata index.
+            generation (str, optional): Generasi index untuk key cache hasil. Tanpa
+                generasi, hasil pencarian tidak disimpan di cache.
+        """
+        self.index = index
+        self.metadata = metadata or {}
+        self.model = None
+        self.dense_models = {}
+        self.generation = generation
+
+    def load(self, index_dir, addresses=None, authkey=None):
+        """
+        Memuat index tersimpan dari disk.
+
+        Query selanjutnya diproses dengan tokenizer yang sama seperti saat index dibangun.
+        Untuk index yang dibagi menjadi shard, query dikirim ke shard server: proses lokal
+        untuk setiap shard, atau server yang sudah berjalan jika addresses diberikan.
+
+        Parameters:
+            index_dir (str): Direktori index hasil build_index.py.
+            addresses (list, optional): Alamat (host, port) shard server untuk setiap shard.
+            authkey (bytes, optional): Kunci autentikasi shard server pada addresses.
+
+        Returns:
+            dict: Metadata index.
+        """
+        self.close()
+        # Index, metadata, dan generation diambil dari versi index yang sama.
+        index_dir = resolve_index_dir(index_dir)
+        if shard_count_of(index_dir) > 1:
+            self.shards = ShardedSearcher(index_dir, addresses, authkey)
+            index, metadata = None, self.shards.metadata
+        else:
+            index, metadata = load_index(index_dir)
+        self.set_index(index, metadata, index_generation(index_dir))
+        self.tokenizer = metadata.get("tokenizer", self.tokenizer)
+        self.duplicates = recorded_duplicates(metadata.get("files", {}))
+        return metadata
+
+    def get_model(self):
+        """
+        Mengambil model matriks sparse dari index, dibangun sekali saat pertama dibutuhkan.
+
+        Returns:
+            dict: Model hasil build_tf_idf_matrix.
+        """
+        if self.model is None:
+            self.model = build_tf_idf_matrix(self.index)
+        return self.model
+
+    def get_dense_model(self, method):
+        """
+        Mengambil model dense (LSA atau random projection) dari index, dibangun sekali saat
+        pertama dibutuhkan.
+
+        Parameters:
+            method (str): Metode reduksi dimensi, lihat DENSE_METHODS.
+
+        Returns:
+            dict: Model hasil build_dense_model.
+        """
+        if method not in self.dense_models:
+            self.dense_models[method] = build_dense_model(self.get_model(), method)
+        return self.dense_models[method]
+
+    def process_query(self, query):
+        """
+        Memproses query menjadi daftar kata dasar.
+
+        Parameters:
+            query (str): Query dari pengguna.
+
+        Returns:
+            list: Daftar kata dasar dari query.
+        """
+        dictionary, stopwords = self.resources
+        return process_query(query, stopwords, dictionary, self.stemmer, self.tokenizer)
+
+    def search(self, query, k=10, backend="index", profiler=None):
+        """
+        Mencari k dokumen yang paling mirip dengan sebuah query.
+
+        Parameters:
+            query (str): Query dari pengguna.
+            k (int): Jumlah dokumen teratas.
+            backend (str): "index" untuk inverted index dengan pemangkasan MaxScore atau
+                "sparse" untuk perkalian matriks sparse, atau "lsa" / "random" untuk
+                pencarian perkiraan pada vektor dense berdimensi rendah.
+            profiler (RequestProfiler, optional): Pencatat waktu per tahap.
+
+        Returns:
+            dict: Query asli, kata dasar query, hasil berupa daftar dictionary dengan
+                key file_path dan similarity yang terurut menurun, dan cached (True jika
+                hasil diambil dari cache).
+        """
+        with profile_stage(profiler, "process_query"):
+            terms = self.process_query(query)
+        if profiler:
+            profiler.add("process_query", "tokens", len(terms))
+
+        key = None
+        if self.result_cache is not None and self.generation is not None:
+            key = result_cache_key(
+                self.generation,
+                terms,
+                k,
+                backend,
+                self.tokenizer,
+                self.dictionary_path,
+                self.stopwords_path,
+            )
+            with profile_stage(profiler, "result_cache"):
+                ranked = self.result_cache.get(key)
+            if profiler:
+                profiler.add("result_cache", "hits", int(ranked is not None))
+            if ranked is not None:
+                if profiler:
+                    profiler.record_cache("result_cache", self.result_cache.stats())
+                return {
+                    "query": query,
+                    "terms": terms,
+                    "results": format_results(ranked),
+                    "cached": True,
+                }
+
+        if self.shards is not None:
+            with profile_stage(profiler, "search"):
+                ranked = self.shards.search(terms, k)
+        elif backend == "sparse":
+            with profile_stage(profiler, "build_model"):
+                model = self.get_model()
+            with profile_stage(profiler, "search"):
+                ranked = search_top_k_vectorized(model, terms, k)
+        elif backend in DENSE_METHODS:
+            with profile_stage(profiler, "build_model"):
+                dense = self.get_dense_model(backend)
+            with profile_stage(profiler, "search"):
+                ranked = search_top_k_dense(dense, terms, k)
+        else:
+            with profile_stage(profiler, "search"):
+                ranked = search_top_k(self.index, terms, k)
+        if key is not None:
+            self.result_cache.put(key, ranked)
+            if profiler:
+                profiler.record_cache("result_cache", self.result_cache.stats())
+        return {
+            "query": query,
+            "terms": terms,
+            "results": format_results(ranked),
+            "cached": False,
+        }
+
+    def search_batch(self, queries, k=10):
+        """
+        Mencari k dokumen teratas untuk banyak query sekaligus.
+
+        Query diproses per kelompok; setiap kelompok diubah menjadi satu matriks query
+        sparse dan dikalikan dengan matriks TF-IDF dokumen dalam satu perkalian matriks
+        sparse, sehingga index hanya ditelusuri sekali per kelompok.
+
+        Parameters:
+            queries (list): Daftar query dari pengguna.
+            k (int): Jumlah dokumen teratas per query.
+
+        Returns:
+            list: Hasil search untuk setiap query, dengan urutan yang sama.
+        """
+        if self.shards is not None:
+            return [self.search(query, k) for query in queries]
+
+        model = self.get_model()
+        outputs = []
+        for start in range(0, len(queries), QUERY_BATCH_SIZE):
+            batch = queries[start : start + QUERY_BATCH_SIZE]
+            batch_terms = [self.process_query(query) for query in batch]
+            scores = (vectorize_queries(model, batch_terms) @ model["matrix"].T).tocsr()
+            scores.sort_indices()
+            for row, (query, terms) in enumerate(zip(batch, batch_terms)):
+                start_row, end_row = scores.indptr[row], scores.indptr[row + 1]
+                ranked = select_top_k(
+                    model["doc_ids"],
+                    scores.indices[start_row:end_row],
+                    scores.data[start_row:end_row],
+                    k,
+                )
+                outputs.append(
+                    {
+                        "query": query,
+                        "terms": terms,
+                        "results": format_results(ranked),
+                        "cached": False,
+                    }
+                )
+        return outputs
+
+    def document_details(self, file_path, profiler=None):
+        """
+        Mengambil kata dasar sebuah dokumen beserta jumlah kemunculannya dari index,
+        tanpa membaca dan memproses ulang file.
+
+        Parameters:
+            file_path (str): Path ke file dokumen.
+            profiler (RequestProfiler, optional): Pencatat waktu per tahap.
+
+        Returns:
+            dict: Jumlah kemunculan setiap kata dasar (key counts), terurut menurun
+                berdasarkan jumlahnya, dan jumlah seluruh kata dasar (key stemming_count).
+
+        Raises:
+            DocumentError: Jika dokumen tidak ada di index.
+        """
+        with profile_stage(profiler, "document_details"):
+            if self.shards is not None:
+                counts = self.shards.document_term_counts(file_path)
+            else:
+                counts = document_term_counts(self.index, file_path)
+        if counts is None:
+            raise DocumentError(
+                f"Dokumen {file_path} tidak ada di index, perbarui index terlebih dahulu.",
+                "warning",
+            )
+        if profiler:
+            profiler.add("document_details", "terms", len(counts))
+        return {
+            "counts": dict(
+                sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            ),
+            "stemming_count": sum(counts.values()),
+        }
+
+    def snippet(self, file_path, terms, profiler=None):
+        """
+        Membuat cuplikan dokumen dengan kata query yang disorot dari index posisi.
+
+        Parameters:
+            file_path (str): Path ke file dokumen.
+            terms (list): Kata dasar query.
+            profiler (RequestProfiler, optional): Pencatat waktu per tahap.
+
+        Returns:
+            str | None: Cuplikan dalam HTML, atau None jika index tidak menyimpan posisi
+                (misalnya dibangun dengan tokenizer NLTK).
+        """
+        with profile_stage(profiler, "snippet"):
+            if self.shards is not None:
+                return self.shards.snippet(file_path, terms)
+            return build_snippet(self.index, file_path, terms)
+
+    def stats(self):
+        """
+        Mengembalikan statistik index dan cache stemming.
+
+        Returns:
+            dict: Jumlah dokumen, jumlah term, jumlah file duplikat yang dilewati,
+                statistik cache stemming, dan statistik cache hasil (None jika tidak
+                memakai cache hasil).
+        """
+        if self.shards is not None:
+            documents = self.shards.doc_count
+            terms = len(self.shards.idf)
+        elif self.index is not None:
+            documents = len(self.index["doc_lengths"])
+            terms = len(self.index["postings"])
+        else:
+            documents, terms = 0, 0
+        return {
+            "documents": documents,
+            "terms": terms,
+            "duplicates": len(self.duplicates),
+            "stem_cache": self.stemmer.stats(),
+            "result_cache": self.result_cache.stats() if self.result_cache else None,
+        }
+
+    def close(self):
+        """
+        Menghentikan shard server lokal jika index dibagi menjadi shard.
+        """
+        if self.shards is not None:
+            self.shards.close()
+            self.shards = None
+
+
+def format_results(ranked):
+    """
+    Mengubah pasangan (id dokumen, skor) menjadi daftar dictionary.
+
+    Parameters:
+        ranked (list): Pasangan id dokumen dan nilai kemiripan.
+
+    Returns:
+        list: Daftar dictionary dengan key file_path dan similarity.
+    """
+    return [
+        {"file_path": doc_id, "similarity": similarity} for doc_id, similarity in ranked
+    ]
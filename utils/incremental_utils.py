@@ -0,0 +1,247 @@
+import os
+from utils.discovery_utils import (
+    NearDuplicateDetector,
+    decode_signature,
+    encode_signature,
+    find_duplicates,
+    recorded_duplicates,
+)
+from utils.document_reader_utils import file_hash
+from utils.index_utils import (
+    add_document_counts,
+    add_document_positions,
+    remove_documents,
+)
+from utils.ingest_utils import ingest_files
+from utils.tokenizer_utils import DEFAULT_TOKENIZER
+
+
+def file_fingerprint(file_path, previous=None):
+    """
+    Mengambil ukuran, waktu modifikasi, dan hash konten sebuah file.
+
+    Jika ukuran dan waktu modifikasi sama dengan catatan sebelumnya, hash tidak dihitung
+    ulang dan catatan sebelumnya dikembalikan.
+
+    Args:
+        file_path (str): Path ke file.
+        previous (dict, optional): Fingerprint file dari proses indexing sebelumnya.
+
+    Returns:
+        dict: Ukuran, waktu modifikasi, dan hash konten file.
+
+    Raises:
+        OSError: Jika file tidak dapat dibaca, misalnya sudah dihapus.
+    """
+    stat = os.stat(file_path)
+    if (
+        previous
+        and "hash" in previous
+        and previous.get("size") == stat.st_size
+        and previous.get("mtime") == stat.st_mtime
+    ):
+        return previous
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "hash": file_hash(file_path)}
+
+
+def indexed_files(records):
+    """
+    Mengambil file yang dimasukkan ke index, yaitu file yang bukan duplikat file lain.
+
+    Args:
+        records (dict): Fingerprint setiap file, lihat update_index.
+
+    Returns:
+        set: Path file yang diindeks.
+    """
+    return {
+        file_path
+        for file_path, record in records.items()
+        if "duplicate_of" not in record and "near_duplicate_of" not in record
+    }
+
+
+def update_index(
+    index,
+    records,
+    files,
+    dictionary_path,
+    stopwords_path,
+    workers=1,
+    tokenizer=DEFAULT_TOKENIZER,
+    text_dir=None,
+    progress=None,
+    near_duplicates=None,
+    profiler=None,
+):
+    """
+    Menentukan perubahan file sejak index terakhir dan memproses file yang berubah.
+
+    Hanya file baru atau file yang kontennya berubah yang dibaca, di-preprocessing, dan
+    di-stem ulang, lalu dimasukkan ke index dokumen baru. File diproses oleh process pool
+    jika workers lebih dari 1 dan dimasukkan ke index begitu selesai. Dokumen index
+    sebelumnya yang tidak lagi termasuk indexed_files(fingerprint terbaru), atau yang
+    diproses ulang, harus dibuang saat index digabungkan (lihat merge_index).
+
+    File yang isinya sama persis dengan file lain (berdasarkan hash konten) tidak diproses
+    dan tidak dimasukkan ke index, sehingga tidak memengaruhi IDF. Jika near_duplicates
+    diberikan, dokumen yang hampir sama (signature MinHash shingle kata dasar) juga hanya
+    dimasukkan sekali. Fingerprint file duplikat mencatat file aslinya pada key
+    duplicate_of, atau near_duplicate_of untuk dokumen yang hampir sama.
+
+    Args:
+        index (dict): Index dokumen baru yang dapat diubah (lihat build_inverted_index),
+            menerima postings, posisi term, dan teks file yang diproses.
+        records (dict): Fingerprint setiap file dari proses indexing sebelumnya.
+        files (list): Daftar path file saat ini, terurut. Dari setiap kelompok duplikat,
+            file pertama yang dimasukkan ke index.
+        dictionary_path (str): Path ke file kamus.
+        stopwords_path (str): Path ke file stopwords.
+        workers (int): Jumlah proses worker untuk memproses file.
+        tokenizer (str): Nama tokenizer, lihat preprocess.
+        text_dir (str, optional): Direktori file teks dokumen. Jika diberikan, posisi
+            term dan lokasi teks dokumen disimpan untuk cuplikan (lihat ingest_file).
+        progress (callable, optional): Dipanggil sebagai progress(stage, done, total)
+            saat file diperiksa (tahap "scan") dan saat file diproses (tahap "process").
+        near_duplicates (float, optional): Batas kemiripan Jaccard untuk dokumen yang
+            hampir sama. None untuk menonaktifkan.
+        profiler (RequestProfiler, optional): Mencatat waktu ekstraksi, waktu analisis,
+            dan jumlah token setiap file yang diproses (lihat record_file).
+
+    Returns:
+        tuple: Fingerprint terbaru setiap file (dict) dan ringkasan perubahan berupa
+            daftar file yang ditambahkan, diubah, dihapus dari index, kesalahan per file,
+            serta file duplikat yang dilewati beserta file aslinya (dict). File yang gagal
+            diproses hanya dilaporkan sebagai kesalahan dan tidak memiliki fingerprint.
+    """
+    indexed = indexed_files(records)
+
+    new_records, errors = {}, []
+    for done, file_path in enumerate(files):
+        if progress:
+            progress("scan", done, len(files))
+        try:
+            fingerprint = file_fingerprint(file_path, records.get(file_path))
+        except OSError as e:
+            errors.append({"file_path": file_path, "message": str(e)})
+            continue
+        new_records[file_path] = {
+            key: value
+            for key, value in fingerprint.items()
+            if key not in ("duplicate_of", "near_duplicate_of")
+        }
+    # File yang gagal diperiksa diperlakukan seperti file gagal diproses di bawah.
+    failed = {error["file_path"] for error in errors}
+    files = [file_path for file_path in files if file_path not in failed]
+    hashes = {file_path: record["hash"] for file_path, record in new_records.items()}
+    for file_path, original in find_duplicates(files, hashes).items():
+        new_records[file_path]["duplicate_of"] = original
+
+    def unchanged(file_path):
+        previous = records.get(file_path)
+        return previous is not None and previous["hash"] == hashes[file_path]
+
+    detector = None
+    if near_duplicates is not None:
+        detector = NearDuplicateDetector(near_duplicates)
+        # Dokumen dalam index yang tidak berubah tidak perlu diproses ulang, begitu pula
+        # dokumen yang hampir sama dengan salah satunya.
+        kept = {
+            file_path
+            for file_path in indexed
+            if file_path in new_records
+            and "duplicate_of" not in new_records[file_path]
+            and unchanged(file_path)
+        }
+        for file_path, record in new_records.items():
+            original = records.get(file_path, {}).get("near_duplicate_of")
+            if file_path in kept and "minhash" in record:
+                detector.insert(file_path, decode_signature(record["minhash"]))
+            elif (
+                original in kept
+                and "duplicate_of" not in record
+                and unchanged(file_path)
+            ):
+                record["near_duplicate_of"] = original
+                detector.duplicates[file_path] = original
+
+    candidates = [
+        file_path
+        for file_path, record in new_records.items()
+        if "duplicate_of" not in record and "near_duplicate_of" not in record
+    ]
+    changed = [
+        file_path
+        for file_path in candidates
+        if file_path not in indexed or not unchanged(file_path)
+    ]
+
+    replaced = []
+    if progress:
+        progress("process", 0, len(changed))
+    for done, (file_path, document, error, stats) in enumerate(
+        ingest_files(
+            changed,
+            dictionary_path,
+            stopwords_path,
+            workers,
+            tokenizer,
+            text_dir,
+            signatures=detector is not None,
+            hashes=hashes,
+        ),
+        start=1,
+    ):
+        if profiler:
+            profiler.record_file(file_path, stats)
+        original = None
+        if error is None and detector is not None and document["signature"] is not None:
+            original, duplicates = detector.add(file_path, document["signature"])
+            replaced.extend(duplicates)
+            if original is None:
+                new_records[file_path]["minhash"] = encode_signature(
+                    document["signature"]
+                )
+        if error is not None:
+            errors.append({"file_path": file_path, "message": error})
+            failed.add(file_path)
+        elif original is None:
+            add_document_counts(index, file_path, document["counts"])
+            if document["positions"] is not None:
+                add_document_positions(
+                    index, file_path, document["positions"], document["text"]
+                )
+        if progress:
+            progress("process", done, len(changed))
+
+    if detector is not None:
+        remove_documents(index, replaced)
+        for file_path, original in detector.duplicates.items():
+            new_records[file_path].pop("minhash", None)
+            new_records[file_path]["near_duplicate_of"] = original
+
+    # File yang gagal diproses (beserta duplikat persisnya) tidak dicatat, sehingga
+    # dicoba lagi pada pembaruan berikutnya.
+    for file_path, record in list(new_records.items()):
+        if file_path in failed or record.get("duplicate_of") in failed:
+            del new_records[file_path]
+
+    final = indexed_files(new_records)
+    added = [file_path for file_path in files if file_path in final - indexed]
+    modified = [
+        file_path
+        for file_path in changed
+        if file_path in final and file_path in indexed
+    ]
+    removed = [
+        file_path
+        for file_path in records
+        if file_path in indexed - final and file_path not in failed
+    ]
+    return new_records, {
+        "added": added,
+        "modified": modified,
+        "removed": removed,
+        "errors": errors,
+        "duplicates": recorded_duplicates(new_records),
+    }
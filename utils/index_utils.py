@@ -0,0 +1,400 @@
+import math
+import heapq
+import numpy as np
+from collections import Counter, defaultdict
+from utils.vsm_utils import compute_idf_from_df
+
+
+def build_inverted_index(documents):
+    """
+    Bangun inverted index dari kumpulan dokumen yang sudah di-stem.
+
+    Setiap term dipetakan ke postings berupa pasangan id dokumen dan frekuensi
+    kemunculannya. Document frequency, IDF, dan panjang vektor setiap dokumen
+    dihitung sekali saat index dibangun.
+
+    Parameters:
+        documents (dict): Pasangan id dokumen (path file) dan daftar token dokumen.
+
+    Returns:
+        dict: Index berisi postings, IDF, panjang dokumen, dan norma vektor dokumen.
+    """
+    postings = defaultdict(dict)
+    doc_lengths = {}
+    for doc_id, tokens in documents.items():
+        for term, count in Counter(tokens).items():
+            postings[term][doc_id] = count
+        doc_lengths[doc_id] = len(tokens)
+
+    index = {
+        "postings": dict(postings),
+        "doc_lengths": doc_lengths,
+        "idf": {},
+        "doc_norms": {},
+        "max_weights": {},
+    }
+    compute_index_weights(index)
+    return index
+
+
+def compute_index_weights(index):
+    """
+    Hitung ulang IDF setiap term, norma vektor TF-IDF setiap dokumen, dan bobot
+    ternormalisasi terbesar setiap term yang menjadi batas atas skor pada search_top_k.
+
+    Parameters:
+        index (dict): Index hasil build_inverted_index.
+    """
+    total_docs = len(index["doc_lengths"])
+    idf = {
+        term: compute_idf_from_df(len(postings), total_docs)
+        for term, postings in index["postings"].items()
+    }
+
+    squared_norms = dict.fromkeys(index["doc_lengths"], 0.0)
+    for term, postings in index["postings"].items():
+        term_idf = idf[term]
+        for doc_id, count in postings.items():
+            weight = count / index["doc_lengths"][doc_id] * term_idf
+            squared_norms[doc_id] += weight**2
+
+    doc_norms = {doc_id: math.sqrt(value) for doc_id, value in squared_norms.items()}
+
+    index["idf"] = idf
+    index["doc_norms"] = doc_norms
+    index["max_weights"] = compute_max_weights(index)
+
+
+def compute_max_weights(index):
+    """
+    Hitung bobot ternormalisasi terbesar setiap term dari IDF dan norma dokumen pada index.
+
+    Parameters:
+        index (dict): Index dengan postings, panjang dokumen, IDF, dan norma dokumen.
+
+    Returns:
+        dict: Pasangan term dan bobot ternormalisasi terbesarnya.
+    """
+    doc_norms = index["doc_norms"]
+    max_weights = {}
+    for term, postings in index["postings"].items():
+        term_idf = abs(index["idf"][term])
+        max_weights[term] = max(
+            (
+                count / index["doc_lengths"][doc_id] * term_idf / doc_norms[doc_id]
+                for doc_id, count in postings.items()
+                if doc_norms[doc_id]
+            ),
+            default=0.0,
+        )
+    return max_weights
+
+
+def compute_query_weights(index, query):
+    """
+    Hitung bobot TF-IDF query untuk term yang ada di dalam index.
+
+    Parameters:
+        index (dict): Index hasil build_inverted_index, atau dictionary lain yang memiliki
+            IDF setiap term (misalnya IDF global index yang dibagi menjadi shard).
+        query (list): Daftar token query yang sudah di-stem.
+
+    Returns:
+        dict: Pasangan term dan bobot TF-IDF pada query.
+    """
+    total_terms = len(query)
+    if total_terms == 0:
+        return {}
+    return {
+        term: count / total_terms * index["idf"][term]
+        for term, count in Counter(query).items()
+        if term in index["idf"]
+    }
+
+
+def score_query(index, query):
+    """
+    Hitung cosine similarity query terhadap dokumen yang memiliki term yang sama.
+
+    Hanya postings dari term query yang ditelusuri, sehingga dokumen tanpa term
+    yang sama dengan query tidak pernah disentuh.
+
+    Parameters:
+        index (dict): Index hasil build_inverted_index.
+        query (list): Daftar token query yang sudah di-stem.
+
+    Returns:
+        dict: Pasangan id dokumen dan nilai kemiripannya dengan query.
+    """
+    query_weights = compute_query_weights(index, query)
+    query_norm = math.sqrt(sum(weight**2 for weight in query_weights.values()))
+    if not query_norm:
+        return {}
+
+    dot_products = defaultdict(float)
+    for term, query_weight in query_weights.items():
+        if not query_weight:
+            continue
+        term_idf = index["idf"][term]
+        for doc_id, count in index["postings"][term].items():
+            weight = count / index["doc_lengths"][doc_id] * term_idf
+            dot_products[doc_id] += weight * query_weight
+
+    scores = {}
+    for doc_id, dot_product in dot_products.items():
+        doc_norm = index["doc_norms"][doc_id]
+        if doc_norm:
+            scores[doc_id] = dot_product / (doc_norm * query_norm)
+    return scores
+
+
+def search_top_k(index, query, k, query_weights=None):
+    """
+    Cari k dokumen dengan cosine similarity tertinggi menggunakan pemangkasan MaxScore.
+
+    Setiap term query memiliki batas atas kontribusi skor (bobot query dikali bobot
+    dokumen ternormalisasi terbesar pada postings term tersebut). Term diproses dari batas
+    atas terbesar; begitu jumlah batas atas term yang tersisa tidak melebihi skor ke-k,
+    dokumen yang hanya muncul pada term tersebut tidak mungkin masuk k besar sehingga
+    penelusuran dihentikan. Skor kandidat juga berhenti dihitung jika skor parsial
+    ditambah batas atas sisa term tidak melebihi skor ke-k. Dokumen teratas disimpan
+    dalam min-heap berukuran k. Index ringkas (hasil load_index)
+    dihitung dengan search_packed_top_k.
+
+    Parameters:
+        index (dict): Index hasil build_inverted_index atau load_index.
+        query (list): Daftar token query yang sudah di-stem.
+        k (int): Jumlah dokumen teratas yang dicari.
+        query_weights (dict, optional): Bobot query yang sudah dihitung, misalnya dengan
+            IDF global pada shard. Jika diberikan, query diabaikan dan term yang tidak
+            ada di index tetap dihitung dalam norma query.
+
+    Returns:
+        list: Pasangan (id dokumen, nilai kemiripan) dengan skor positif, terurut menurun.
+    """
+    if query_weights is None:
+        query_weights = compute_query_weights(index, query)
+    query_norm = math.sqrt(sum(weight**2 for weight in query_weights.values()))
+    if not query_norm or k <= 0:
+        return []
+    if hasattr(index["postings"], "decode"):
+        return search_packed_top_k(index, query_weights, query_norm, k)
+
+    terms = []
+    for term, query_weight in query_weights.items():
+        if term not in index["postings"]:
+            continue
+        normalized_weight = query_weight / query_norm
+        upper_bound = abs(normalized_weight) * index["max_weights"][term]
+        if upper_bound > 0:
+            terms.append((upper_bound, term, normalized_weight))
+    terms.sort(key=lambda item: item[0], reverse=True)
+
+    # remaining_bounds[i] adalah jumlah batas atas term ke-i hingga terakhir.
+    remaining_bounds = [0.0] * (len(terms) + 1)
+    for position in range(len(terms) - 1, -1, -1):
+        remaining_bounds[position] = remaining_bounds[position + 1] + terms[position][0]
+
+    postings = [index["postings"][term] for _, term, _ in terms]
+    heap = []
+    seen = set()
+    for position in range(len(terms)):
+        threshold = heap[0][0] if len(heap) == k else 0.0
+        if len(heap) == k and remaining_bounds[position] <= threshold:
+            break
+
+        for doc_id in postings[position]:
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+
+            doc_norm = index["doc_norms"][doc_id]
+            if not doc_norm:
+                continue
+            weight_factor = 1 / (index["doc_lengths"][doc_id] * doc_norm)
+
+            score = 0.0
+            for other in range(position, len(terms)):
+                if score + remaining_bounds[other] <= threshold:
+                    score = None
+                    break
+                count = postings[other].get(doc_id)
+                if count:
+                    _, term, normalized_weight = terms[other]
+                    score += (
+                        count * index["idf"][term] * weight_factor * normalized_weight
+                    )
+
+            if score is None or score <= 0:
+                continue
+            if len(heap) < k:
+                heapq.heappush(heap, (score, doc_id))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, doc_id))
+            else:
+                continue
+            threshold = heap[0][0] if len(heap) == k else 0.0
+
+    return [(doc_id, score) for score, doc_id in sorted(heap, reverse=True)]
+
+
+def search_packed_top_k(index, query_weights, query_norm, k):
+    """
+    Cari k dokumen teratas pada index ringkas dengan operasi vektor NumPy.
+
+    Postings setiap term query didekode menjadi array nomor dokumen dan frekuensi term,
+    kontribusi skornya digabung per dokumen dengan pengurutan dan reduceat, lalu k skor
+    tertinggi dipilih dengan partition. Dokumen dengan skor sama diurutkan menurun
+    berdasarkan id dokumen seperti pada search_top_k.
+
+    Parameters:
+        index (dict): Index ringkas hasil load_index.
+        query_weights (dict): Bobot TF-IDF setiap term query.
+        query_norm (float): Norma vektor query.
+        k (int): Jumlah dokumen teratas yang dicari.
+
+    Returns:
+        list: Pasangan (id dokumen, nilai kemiripan) dengan skor positif, terurut menurun.
+    """
+    postings = index["postings"]
+    doc_numbers, contributions = [], []
+    for term, query_weight in query_weights.items():
+        decoded = postings.decode(term) if query_weight else None
+        if decoded is None:
+            continue
+        docs, counts = decoded
+        doc_numbers.append(docs)
+        contributions.append(counts * (index["idf"][term] * query_weight / query_norm))
+    if not doc_numbers:
+        return []
+
+    docs = np.concatenate(doc_numbers)
+    dot_products = np.concatenate(contributions)
+    if len(doc_numbers) > 1:
+        order = np.argsort(docs, kind="stable")
+        docs, dot_products = docs[order], dot_products[order]
+        starts = np.flatnonzero(np.concatenate(([True], docs[1:] != docs[:-1])))
+        docs, dot_products = docs[starts], np.add.reduceat(dot_products, starts)
+
+    divisors = index["doc_lengths"].values[docs] * index["doc_norms"].values[docs]
+    scores = np.divide(
+        dot_products,
+        divisors,
+        out=np.zeros(len(docs)),
+        where=divisors != 0,
+    )
+
+    candidates = np.flatnonzero(scores > 0)
+    if len(candidates) > k:
+        kth = np.partition(scores[candidates], -k)[-k]
+        candidates = candidates[scores[candidates] >= kth]
+    top = candidates[np.lexsort((-docs[candidates], -scores[candidates]))[:k]]
+    return [
+        (postings.doc_ids[doc], score)
+        for doc, score in zip(docs[top].tolist(), scores[top].tolist())
+    ]
+
+
+def document_term_counts(index, doc_id):
+    """
+    Mengambil jumlah kemunculan setiap term pada sebuah dokumen dari index.
+
+    Index hasil load_index menyimpan postings per dokumen (doc_terms) sehingga hanya
+    postings dokumen tersebut yang dibaca; pada index di memori postings ditelusuri.
+
+    Parameters:
+        index (dict): Index hasil build_inverted_index atau load_index.
+        doc_id (str): Id dokumen.
+
+    Returns:
+        dict | None: Pasangan term dan jumlah kemunculannya, atau None jika dokumen
+            tidak ada di index.
+    """
+    if doc_id not in index["doc_lengths"]:
+        return None
+    if "doc_terms" in index:
+        return index["doc_terms"][doc_id]
+    return {
+        term: postings[doc_id]
+        for term, postings in index["postings"].items()
+        if doc_id in postings
+    }
+
+
+def add_document(index, doc_id, tokens):
+    """
+    Tambahkan satu dokumen ke dalam postings index.
+
+    IDF dan norma dokumen tidak langsung diperbarui, panggil compute_index_weights
+    setelah seluruh perubahan selesai.
+
+    Parameters:
+        index (dict): Index yang dapat diubah.
+        doc_id (str): Id dokumen (path file).
+        tokens (list): Daftar token dokumen yang sudah di-stem.
+    """
+    add_document_counts(index, doc_id, Counter(tokens))
+
+
+def add_document_counts(index, doc_id, term_counts):
+    """
+    Tambahkan satu dokumen ke dalam postings index dari jumlah kemunculan setiap term.
+
+    Panjang dokumen adalah jumlah seluruh kemunculan term. IDF dan norma dokumen tidak
+    langsung diperbarui, panggil compute_index_weights setelah seluruh perubahan selesai.
+
+    Parameters:
+        index (dict): Index yang dapat diubah.
+        doc_id (str): Id dokumen (path file).
+        term_counts (Counter): Jumlah kemunculan setiap term dalam dokumen.
+    """
+    for term, count in term_counts.items():
+        index["postings"].setdefault(term, {})[doc_id] = count
+    index["doc_lengths"][doc_id] = sum(term_counts.values())
+
+
+def add_document_positions(index, doc_id, positions, text):
+    """
+    Simpan posisi setiap term dan lokasi teks sebuah dokumen untuk membuat cuplikan.
+
+    Parameters:
+        index (dict): Index yang dapat diubah.
+        doc_id (str): Id dokumen (path file).
+        positions (dict): Posisi setiap term berupa daftar pasangan (awal, akhir) dalam byte.
+        text (tuple): Path file teks serta offset byte awal dan akhir teks dokumen dalam
+            UTF-8 di dalamnya, lihat ingest_file.
+    """
+    index_positions = index.setdefault("positions", {})
+    for term, term_positions in positions.items():
+        index_positions.setdefault(term, {})[doc_id] = term_positions
+    index.setdefault("texts", {})[doc_id] = text
+
+
+def remove_documents(index, doc_ids):
+    """
+    Hapus sekumpulan dokumen dari postings index dalam satu kali penelusuran.
+
+    Term yang tidak lagi memiliki postings ikut dihapus, begitu pula posisi term dan teks
+    dokumen jika disimpan. IDF dan norma dokumen tidak langsung diperbarui, panggil
+    compute_index_weights setelah seluruh perubahan selesai.
+
+    Parameters:
+        index (dict): Index yang dapat diubah.
+        doc_ids (iterable): Id dokumen yang akan dihapus.
+    """
+    doc_ids = set(doc_ids) & set(index["doc_lengths"])
+    if not doc_ids:
+        return
+
+    for key in ("postings", "positions"):
+        for term in list(index.get(key, {})):
+            postings = index[key][term]
+            for doc_id in doc_ids & postings.keys():
+                del postings[doc_id]
+            if not postings:
+                del index[key][term]
+
+    for doc_id in doc_ids:
+        del index["doc_lengths"][doc_id]
+        index["doc_norms"].pop(doc_id, None)
+        index.get("texts", {}).pop(doc_id, None)
@@ -0,0 +1,163 @@
+import os
+import time
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utils.discovery_utils import minhash_signature
+from utils.document_reader_utils import iter_file
+from utils.resource_utils import get_shared_resources, get_shared_stemmer
+from utils.text_utils import collect_term_positions, count_stemmed_terms
+from utils.tokenizer_utils import DEFAULT_TOKENIZER
+
+
+def ingest_file(
+    file_path,
+    dictionary_path,
+    stopwords_path,
+    tokenizer=DEFAULT_TOKENIZER,
+    text_dir=None,
+    signature=False,
+    content_hash=None,
+):
+    """
+    Membaca, melakukan preprocessing, dan stemming satu file tanpa menampilkan apa pun ke UI.
+
+    Dijalankan di dalam proses worker, sehingga kamus, stopwords, dan stemmer diambil dari
+    sumber daya bersama milik proses tersebut dan setiap kesalahan dikembalikan sebagai pesan.
+    File dibaca per halaman/paragraf dan hanya jumlah kata dasar yang disimpan, kecuali
+    text_dir diberikan: posisi setiap kata dasar ikut dikembalikan untuk membuat cuplikan
+    hasil pencarian, sedangkan teks dokumen ditambahkan langsung ke file teks milik proses
+    worker di text_dir sehingga hanya lokasinya yang dikirim ke proses utama. Jika
+    signature diminta, signature MinHash dari shingle kata dasar ikut dihitung untuk
+    mendeteksi dokumen yang hampir sama.
+
+    Args:
+        file_path (str): Path ke file dokumen.
+        dictionary_path (str): Path ke file kamus.
+        stopwords_path (str): Path ke file stopwords.
+        tokenizer (str): Nama tokenizer, lihat preprocess.
+        text_dir (str, optional): Direktori file teks dokumen. Jika diberikan, posisi kata
+            dasar dan teks dokumen dicatat (hanya tokenizer regex).
+        signature (bool): Hitung signature MinHash dokumen.
+        content_hash (str, optional): Hash konten file jika sudah diketahui, dipakai
+            sebagai key cache teks tanpa menghitung ulang hash file.
+
+    Returns:
+        tuple: Path file, dokumen berupa dictionary dengan key counts (jumlah kemunculan
+            setiap kata dasar), positions, dan text berupa path file teks serta offset byte
+            awal dan akhir teks dokumen di dalamnya (None jika posisi tidak dicatat), serta
+            signature (None jika tidak diminta), atau
+            None jika gagal, pesan kesalahan (None jika berhasil), dan statistik berupa
+            dictionary dengan key extract_s (waktu membaca file), analyze_s (waktu
+            preprocessing dan stemming), serta tokens (jumlah kata dasar).
+    """
+    stats = {"extract_s": 0.0, "analyze_s": 0.0, "tokens": 0}
+
+    def timed_chunks(chunks):
+        # Waktu yang dihabiskan iterator pembaca dihitung sebagai waktu ekstraksi.
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            stats["extract_s"] += time.perf_counter() - start
+            if chunk is None:
+                return
+            yield chunk
+
+    start = time.perf_counter()
+    try:
+        dictionary, stopwords = get_shared_resources(dictionary_path, stopwords_path)
+        stemmer = get_shared_stemmer(dictionary_path)
+        chunks = timed_chunks(iter_file(file_path, content_hash=content_hash))
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            return file_path, None, "File kosong atau tidak dapat dibaca.", stats
+        chunks = itertools.chain([first_chunk], chunks)
+        sequence = [] if signature else None
+        if text_dir is not None and tokenizer == "regex":
+            text_path = os.path.join(text_dir, f"texts-{os.getpid()}.bin")
+            with open(text_path, "ab") as text_file:
+                text_start = text_file.tell()
+                term_counts, term_positions, length = collect_term_positions(
+                    chunks, stopwords, dictionary, stemmer, text_file, sequence
+                )
+            text = (text_path, text_start, text_start + length)
+        else:
+            term_counts = count_stemmed_terms(
+                chunks, stopwords, dictionary, stemmer, tokenizer, sequence
+            )
+            term_positions, text = None, None
+        stemmer.flush()
+        stats["tokens"] = sum(term_counts.values())
+        document = {
+            "counts": term_counts,
+            "positions": term_positions,
+            "text": text,
+            "signature": minhash_signature(sequence) if signature else None,
+        }
+        return file_path, document, None, stats
+    except Exception as e:
+        return file_path, None, str(e), stats
+    finally:
+        stats["analyze_s"] = max(0.0, time.perf_counter() - start - stats["extract_s"])
+
+
+def ingest_files(
+    files,
+    dictionary_path,
+    stopwords_path,
+    workers=1,
+    tokenizer=DEFAULT_TOKENIZER,
+    text_dir=None,
+    signatures=False,
+    hashes=None,
+):
+    """
+    Memproses banyak file dan mengembalikan hasilnya satu per satu begitu selesai.
+
+    Jika workers lebih dari 1, file dibagikan ke process pool dan hasil dikirim sesuai
+    urutan selesainya, bukan urutan file.
+
+    Args:
+        files (list): Daftar path file.
+        dictionary_path (str): Path ke file kamus.
+        stopwords_path (str): Path ke file stopwords.
+        workers (int): Jumlah proses worker.
+        tokenizer (str): Nama tokenizer, lihat preprocess.
+        text_dir (str, optional): Direktori file teks dokumen, lihat ingest_file.
+        signatures (bool): Hitung signature MinHash setiap dokumen.
+        hashes (dict, optional): Hash konten file yang sudah diketahui, per path file.
+
+    Yields:
+        tuple: Hasil ingest_file untuk setiap file.
+    """
+    hashes = hashes or {}
+    if workers <= 1 or len(files) <= 1:
+        for file_path in files:
+            yield ingest_file(
+                file_path,
+                dictionary_path,
+                stopwords_path,
+                tokenizer,
+                text_dir,
+                signatures,
+                hashes.get(file_path),
+            )
+        return
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(
+                ingest_file,
+                file_path,
+                dictionary_path,
+                stopwords_path,
+                tokenizer,
+                text_dir,
+                signatures,
+                hashes.get(file_path),
+            )
+            for file_path in files
+        ]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,146 @@
+import time
+import itertools
+import threading
+from functools import lru_cache
+
+
+class BackgroundJob:
+    """
+    Pekerjaan yang berjalan di thread latar belakang beserta progresnya.
+
+    Fungsi target dipanggil dengan argumen tambahan progress, yaitu fungsi
+    progress(stage, done, total) yang dipanggil target setiap kali ada kemajuan. Kecepatan
+    dan perkiraan sisa waktu dihitung per tahap sejak tahap tersebut dimulai.
+    """
+
+    def __init__(self, job_id, target, kwargs):
+        self.id = job_id
+        self.target = target
+        self.kwargs = kwargs
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.finished_at = None
+        self.stage = None
+        self.stage_started_at = self.started_at
+        self.done = 0
+        self.total = 0
+        self.result = None
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def run(self):
+        try:
+            self.result = self.target(**self.kwargs, progress=self.update)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            with self.lock:
+                self.finished_at = time.time()
+
+    def update(self, stage, done, total):
+        """
+        Mencatat kemajuan pekerjaan.
+
+        Parameters:
+            stage (str): Nama tahap yang sedang berjalan.
+            done (int): Jumlah item yang sudah selesai pada tahap ini.
+            total (int): Jumlah seluruh item pada tahap ini.
+        """
+        with self.lock:
+            if stage != self.stage:
+                self.stage, self.stage_started_at = stage, time.time()
+            self.done, self.total = done, total
+
+    @property
+    def running(self):
+        return self.finished_at is None
+
+    def progress(self):
+        """
+        Mengambil ringkasan progres pekerjaan.
+
+        Returns:
+            dict: Status ("running", "done", atau "failed"), tahap, jumlah item selesai
+                dan total, fraksi selesai, kecepatan (item per detik), perkiraan sisa
+                waktu dalam detik (None jika belum dapat dihitung), dan lama berjalan.
+        """
+        with self.lock:
+            now = self.finished_at or time.time()
+            stage_elapsed = now - self.stage_started_at
+            rate = self.done / stage_elapsed if self.done and stage_elapsed > 0 else 0.0
+            if self.running:
+                status = "running"
+            else:
+                status = "failed" if self.error is not None else "done"
+            return {
+                "status": status,
+                "stage": self.stage,
+                "done": self.done,
+                "total": self.total,
+                "fraction": min(1.0, self.done / self.total) if self.total else 0.0,
+                "rate": rate,
+                "eta_s": (self.total - self.done) / rate if rate else None,
+                "elapsed_s": now - self.started_at,
+            }
+
+
+class BackgroundJobs:
+    """
+    Daftar pekerjaan latar belakang yang dipakai bersama oleh seluruh sesi dalam satu proses.
+
+    Setiap key (misalnya direktori index) paling banyak memiliki satu pekerjaan yang
+    berjalan; permintaan berikutnya untuk key yang sama memakai pekerjaan tersebut.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def start(self, key, target, **kwargs):
+        """
+        Menjalankan pekerjaan baru, kecuali pekerjaan untuk key yang sama masih berjalan.
+
+        Parameters:
+            key (str): Key pekerjaan.
+            target (callable): Fungsi yang dijalankan, menerima argumen progress.
+            **kwargs: Argumen untuk fungsi target.
+
+        Returns:
+            tuple: Pekerjaan untuk key tersebut dan apakah pekerjaan baru dijalankan.
+        """
+        with self.lock:
+            job = self.jobs.get(key)
+            if job is not None and job.running:
+                return job, False
+            job = BackgroundJob(next(self.ids), target, kwargs)
+            self.jobs[key] = job
+            return job.start(), True
+
+    def get(self, key):
+        """
+        Mengambil pekerjaan terakhir untuk sebuah key, yang masih berjalan maupun selesai.
+
+        Parameters:
+            key (str): Key pekerjaan.
+
+        Returns:
+            BackgroundJob | None: Pekerjaan terakhir, atau None jika belum pernah ada.
+        """
+        with self.lock:
+            return self.jobs.get(key)
+
+
+@lru_cache(maxsize=1)
+def get_background_jobs():
+    """
+    Mengambil daftar pekerjaan latar belakang yang dipakai bersama oleh seluruh sesi.
+
+    Returns:
+        BackgroundJobs: Daftar pekerjaan latar belakang.
+    """
+    return BackgroundJobs()
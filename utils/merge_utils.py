@@ -0,0 +1,589 @@
+import os
+import json
+import shutil
+import numpy as np
+from utils.postings_utils import CompressedPostings, StringTable, encode_postings
+from utils.shard_utils import SHARD_DIR, shard_of
+from utils.storage_utils import (
+    INDEX_FORMAT_VERSION,
+    METADATA_FILE,
+    create_index_version,
+    publish_index_version,
+    write_index_metadata,
+)
+from utils.vsm_utils import compute_idf_from_df
+
+# Nama array hasil encode_postings untuk postings per term dan per dokumen.
+POSTINGS_ARRAYS = (
+    "postings_offsets",
+    "postings_data",
+    "postings_starts",
+    "postings_counts",
+)
+DOC_TERMS_ARRAYS = (
+    "doc_terms_offsets",
+    "doc_terms_data",
+    "doc_terms_starts",
+    "doc_terms_counts",
+)
+# Jumlah elemen maksimum yang disalin sekaligus oleh copy_ranges.
+COPY_CHUNK_SIZE = 1 << 22
+
+
+def string_array(blob, offsets):
+    """
+    Ubah tabel string (blok byte dan offset) menjadi array bytes NumPy berlebar tetap,
+    sehingga dapat diurutkan dan dicari dengan operasi vektor.
+
+    Parameters:
+        blob (numpy.ndarray): Blok byte UTF-8 (uint8).
+        offsets (numpy.ndarray): Offset awal setiap string (panjang n + 1).
+
+    Returns:
+        numpy.ndarray: Array bytes (dtype S) dengan urutan yang sama.
+    """
+    lengths = np.diff(offsets)
+    width = max(int(lengths.max(initial=0)), 1)
+    matrix = np.zeros((len(lengths), width), dtype=np.uint8)
+    matrix[np.arange(width) < lengths[:, None]] = blob[offsets[0] : offsets[-1]]
+    return matrix.view(f"S{width}").ravel()
+
+
+def pack_string_array(values):
+    """
+    Kebalikan string_array: simpan array bytes sebagai blok byte dan array offset.
+
+    Parameters:
+        values (numpy.ndarray): Array bytes (dtype S).
+
+    Returns:
+        tuple: Blok byte (uint8) dan offset awal setiap string (int64, panjang n + 1).
+    """
+    values = values.astype(f"S{max(values.dtype.itemsize, 1)}")
+    lengths = np.char.str_len(values).astype(np.int64)
+    matrix = values.view(np.uint8).reshape(len(values), values.dtype.itemsize)
+    blob = matrix[np.arange(values.dtype.itemsize) < lengths[:, None]]
+    return blob, np.concatenate(([0], np.cumsum(lengths)))
+
+
+def copy_ranges(source, starts, ends, target, target_starts):
+    """
+    Salin banyak rentang baris dari satu array ke array lain dengan operasi vektor,
+    per kelompok berisi paling banyak COPY_CHUNK_SIZE baris.
+
+    Parameters:
+        source (numpy.ndarray): Array sumber (dapat berupa memory-map).
+        starts (numpy.ndarray): Baris awal setiap rentang pada sumber.
+        ends (numpy.ndarray): Baris akhir (eksklusif) setiap rentang pada sumber.
+        target (numpy.ndarray): Array tujuan (dapat berupa memory-map).
+        target_starts (numpy.ndarray): Baris awal setiap rentang pada tujuan.
+    """
+    lengths = np.asarray(ends) - np.asarray(starts)
+    totals = np.cumsum(lengths)
+    first = 0
+    while first < len(lengths):
+        done = int(totals[first - 1]) if first else 0
+        last = max(
+            first + 1,
+            int(np.searchsorted(totals, done + COPY_CHUNK_SIZE, side="right")),
+        )
+        sizes = lengths[first:last]
+        steps = np.arange(int(sizes.sum())) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        target[np.repeat(target_starts[first:last], sizes) + steps] = source[
+            np.repeat(starts[first:last], sizes) + steps
+        ]
+        first = last
+
+
+def write_ranges(path, sources, lengths, row_shape, dtype):
+    """
+    Tulis array .npy yang disusun dari rentang baris beberapa array sumber langsung ke
+    disk, tanpa menampung seluruh isinya di memori.
+
+    Parameters:
+        path (str): Path file .npy tujuan.
+        sources (list): Tuple (array sumber, baris awal, baris akhir, nomor urut rentang
+            pada array tujuan) untuk setiap array sumber.
+        lengths (numpy.ndarray): Jumlah baris setiap rentang menurut urutan tujuan.
+        row_shape (tuple): Bentuk satu baris, misalnya (2,) atau ().
+        dtype (numpy.dtype): Tipe elemen.
+
+    Returns:
+        numpy.ndarray: Offset baris awal setiap rentang pada array tujuan (panjang n + 1).
+    """
+    offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+    if not offsets[-1]:
+        np.save(path, np.zeros((0, *row_shape), dtype=dtype))
+        return offsets
+    target = np.lib.format.open_memmap(
+        path, mode="w+", dtype=dtype, shape=(int(offsets[-1]), *row_shape)
+    )
+    for source, starts, ends, ranks in sources:
+        copy_ranges(source, starts, ends, target, offsets[ranks])
+    target.flush()
+    del target
+    return offsets
+
+
+def text_ranges(arrays, docs):
+    """
+    Mengambil rentang teks sekumpulan dokumen, baik dari array teks index tersimpan
+    maupun dari file teks dokumen baru (lihat pack_index).
+
+    Parameters:
+        arrays (dict): Array-array index.
+        docs (numpy.ndarray): Nomor dokumen.
+
+    Returns:
+        list: Tuple (array teks, offset awal, offset akhir, mask dokumen pada docs) untuk
+            setiap array teks.
+    """
+    if "text_spans" not in arrays:
+        offsets = arrays["text_offsets"]
+        selected = np.ones(len(docs), dtype=bool)
+        return [(arrays["texts"], offsets[docs], offsets[docs + 1], selected)]
+    spans = arrays["text_spans"][docs]
+    ranges = []
+    for number, texts in enumerate(arrays["text_spools"]):
+        selected = spans[:, 0] == number
+        ranges.append((texts, spans[selected, 1], spans[selected, 2], selected))
+    return ranges
+
+
+def merge_postings(sources, output_dir):
+    """
+    Gabungkan postings beberapa index yang sudah dikemas menjadi satu bagian index.
+
+    Postings setiap sumber didekode sekaligus dengan operasi vektor, dokumen yang tidak
+    dipertahankan dibuang, lalu nomor term dan dokumen dipetakan ke tabel gabungan yang
+    terurut. Posisi term dan teks dokumen disalin per rentang langsung ke output_dir.
+    Bobot lama (IDF, norma dokumen, dan bobot maksimum) ikut dibawa agar compute_weights
+    hanya menghitung ulang bagian yang terpengaruh perubahan.
+
+    Parameters:
+        sources (list): Pasangan array index (hasil load_index_arrays atau pack_index)
+            dan mask dokumen yang dipertahankan. Dokumen yang dipertahankan dari
+            seluruh sumber tidak boleh sama.
+        output_dir (str): Direktori tujuan array posisi term dan teks dokumen.
+
+    Returns:
+        dict: Tabel term dan dokumen (array bytes), postings terurut (nomor term, nomor
+            dokumen, frekuensi), panjang dokumen, bobot lama (NaN jika belum ada), term
+            yang postings-nya berubah (dirty), serta offset posisi dan teks jika ada.
+    """
+    parts = []
+    for arrays, keep in sources:
+        if not keep.any():
+            continue
+        postings = CompressedPostings(
+            StringTable(arrays["terms_blob"], arrays["terms_offsets"]),
+            StringTable(arrays["docs_blob"], arrays["docs_offsets"]),
+            arrays["postings_offsets"],
+            arrays["postings_data"],
+            arrays["postings_starts"],
+            arrays["postings_counts"],
+        )
+        term_numbers, doc_numbers, counts = postings.decode_all()
+        kept = np.flatnonzero(keep[doc_numbers])
+        parts.append(
+            {
+                "arrays": arrays,
+                "keep": keep,
+                "postings": kept,
+                "term_numbers": term_numbers[kept],
+                "doc_numbers": doc_numbers[kept],
+                "counts": counts[kept],
+                "doc_frequencies": np.diff(arrays["postings_starts"]),
+            }
+        )
+
+    # Tabel dokumen gabungan beserta nomor baru setiap dokumen yang dipertahankan.
+    doc_ids = [
+        string_array(part["arrays"]["docs_blob"], part["arrays"]["docs_offsets"])[
+            part["keep"]
+        ]
+        for part in parts
+    ]
+    doc_ids = np.concatenate(doc_ids) if doc_ids else np.zeros(0, dtype="S1")
+    doc_order = np.argsort(doc_ids, kind="stable")
+    doc_ranks = np.empty(len(doc_order), dtype=np.int64)
+    doc_ranks[doc_order] = np.arange(len(doc_order))
+    doc_ids = doc_ids[doc_order]
+
+    # Tabel term gabungan dari term yang masih memiliki postings.
+    term_ids = []
+    for part in parts:
+        arrays = part["arrays"]
+        frequencies = np.bincount(
+            part["term_numbers"], minlength=len(arrays["terms_offsets"]) - 1
+        )
+        part["present"] = np.flatnonzero(frequencies)
+        part["dropped"] = frequencies[part["present"]] < (
+            part["doc_frequencies"][part["present"]]
+        )
+        term_ids.append(
+            string_array(arrays["terms_blob"], arrays["terms_offsets"])[part["present"]]
+        )
+    if term_ids:
+        terms, term_ranks = np.unique(np.concatenate(term_ids), return_inverse=True)
+    else:
+        terms, term_ranks = np.zeros(0, dtype="S1"), np.zeros(0, dtype=np.int64)
+
+    merged = {
+        "terms": terms,
+        "doc_ids": doc_ids,
+        "doc_lengths": np.zeros(len(doc_ids), dtype=np.int64),
+        "old_norms": np.full(len(doc_ids), np.nan),
+        "old_idf": np.full(len(terms), np.nan),
+        "old_max_weights": np.full(len(terms), np.nan),
+        "dirty": np.zeros(len(terms), dtype=bool),
+    }
+    sources_per_term = np.zeros(len(terms), dtype=np.int64)
+    doc_start, term_start = 0, 0
+    keys = []
+    for part in parts:
+        arrays = part["arrays"]
+        keep = np.flatnonzero(part["keep"])
+        doc_map = np.full(len(part["keep"]), -1, dtype=np.int64)
+        doc_map[keep] = doc_ranks[doc_start : doc_start + len(keep)]
+        doc_start += len(keep)
+        present = part["present"]
+        term_map = np.full(len(arrays["terms_offsets"]) - 1, -1, dtype=np.int64)
+        term_map[present] = term_ranks[term_start : term_start + len(present)]
+        term_start += len(present)
+
+        merged["doc_lengths"][doc_map[keep]] = arrays["doc_lengths"][keep]
+        sources_per_term[term_map[present]] += 1
+        merged["dirty"][term_map[present][part["dropped"]]] = True
+        if "doc_norms" in arrays:
+            merged["old_norms"][doc_map[keep]] = arrays["doc_norms"][keep]
+            merged["old_idf"][term_map[present]] = arrays["idf"][present]
+            merged["old_max_weights"][term_map[present]] = arrays["max_weights"][
+                present
+            ]
+        else:
+            merged["dirty"][term_map[present]] = True
+        part["term_numbers"] = term_map[part["term_numbers"]]
+        part["doc_numbers"] = doc_map[part["doc_numbers"]]
+        keys.append(part["term_numbers"] * len(doc_ids) + part["doc_numbers"])
+    merged["dirty"] |= sources_per_term > 1
+
+    # Postings setiap sumber sudah terurut, sehingga pengurutan stabil hanya perlu
+    # menggabungkan beberapa rangkaian terurut.
+    keys = np.concatenate(keys) if keys else np.zeros(0, dtype=np.int64)
+    order = np.argsort(keys, kind="stable")
+    posting_ranks = np.empty(len(order), dtype=np.int64)
+    posting_ranks[order] = np.arange(len(order))
+    for name in ("term_numbers", "doc_numbers", "counts"):
+        values = [part[name].astype(np.int64) for part in parts]
+        merged[name] = (
+            np.concatenate(values)[order] if values else np.zeros(0, dtype=np.int64)
+        )
+
+    merged["has_positions"] = bool(parts) and all(
+        "positions" in part["arrays"] for part in parts
+    )
+    if merged["has_positions"]:
+        position_sources, position_lengths = [], []
+        text_sources = []
+        text_lengths = np.zeros(len(doc_ids), dtype=np.int64)
+        posting_start, doc_start = 0, 0
+        for part in parts:
+            arrays = part["arrays"]
+            position_offsets = arrays["position_offsets"]
+            starts = position_offsets[part["postings"]]
+            ends = position_offsets[part["postings"] + 1]
+            ranks = posting_ranks[posting_start : posting_start + len(starts)]
+            posting_start += len(starts)
+            position_sources.append((arrays["positions"], starts, ends, ranks))
+            position_lengths.append(ends - starts)
+
+            keep = np.flatnonzero(part["keep"])
+            ranks = doc_ranks[doc_start : doc_start + len(keep)]
+            doc_start += len(keep)
+            for texts, starts, ends, selected in text_ranges(arrays, keep):
+                text_sources.append((texts, starts, ends, ranks[selected]))
+                text_lengths[ranks[selected]] = ends - starts
+        merged["position_offsets"] = write_ranges(
+            os.path.join(output_dir, "positions.npy"),
+            position_sources,
+            np.concatenate(position_lengths)[order],
+            (2,),
+            np.uint32,
+        )
+        merged["text_offsets"] = write_ranges(
+            os.path.join(output_dir, "texts.npy"),
+            text_sources,
+            text_lengths,
+            (),
+            np.uint8,
+        )
+    return merged
+
+
+def compute_weights(merged, idf):
+    """
+    Hitung norma dokumen dan bobot maksimum term hasil merge_postings, hanya untuk
+    dokumen dan term yang terpengaruh perubahan.
+
+    Norma dokumen dihitung ulang jika dokumen baru atau salah satu term-nya mengalami
+    perubahan IDF. Bobot maksimum dihitung ulang untuk term yang IDF atau postings-nya
+    berubah, atau yang memuat dokumen dengan norma baru. Bobot lainnya dibawa dari index
+    sebelumnya.
+
+    Parameters:
+        merged (dict): Hasil merge_postings.
+        idf (numpy.ndarray): IDF global setiap term pada merged["terms"].
+
+    Returns:
+        tuple: Norma setiap dokumen dan bobot ternormalisasi terbesar setiap term.
+    """
+    term_numbers = merged["term_numbers"]
+    doc_numbers = merged["doc_numbers"]
+    counts = merged["counts"]
+    doc_lengths = merged["doc_lengths"]
+
+    changed = ~(idf == merged["old_idf"])
+    affected_docs = np.isnan(merged["old_norms"])
+    affected_docs[doc_numbers[changed[term_numbers]]] = True
+    selected = affected_docs[doc_numbers]
+    weights = (
+        counts[selected]
+        / doc_lengths[doc_numbers[selected]]
+        * idf[term_numbers[selected]]
+    )
+    squared_norms = np.bincount(
+        doc_numbers[selected], weights=weights**2, minlength=len(doc_lengths)
+    )
+    doc_norms = merged["old_norms"].copy()
+    doc_norms[affected_docs] = np.sqrt(squared_norms[affected_docs])
+
+    affected_terms = changed | merged["dirty"]
+    affected_terms[term_numbers[selected]] = True
+    max_weights = merged["old_max_weights"].copy()
+    max_weights[affected_terms] = 0.0
+    selected = affected_terms[term_numbers] & (doc_norms[doc_numbers] != 0)
+    docs = doc_numbers[selected]
+    terms = term_numbers[selected]
+    np.maximum.at(
+        max_weights,
+        terms,
+        counts[selected] / doc_lengths[docs] * np.abs(idf[terms]) / doc_norms[docs],
+    )
+    return doc_norms, max_weights
+
+
+def write_merged(output_dir, merged, idf, metadata=None):
+    """
+    Simpan satu bagian index hasil merge_postings beserta bobotnya ke direktori.
+
+    Selain postings per term, postings per dokumen (term dan frekuensinya pada setiap
+    dokumen) ikut disimpan dalam format yang sama untuk menampilkan detail dokumen.
+
+    Parameters:
+        output_dir (str): Direktori tujuan, berisi array posisi dan teks dari
+            merge_postings jika ada.
+        merged (dict): Hasil merge_postings.
+        idf (numpy.ndarray): IDF global setiap term pada merged["terms"].
+        metadata (dict, optional): Metadata tambahan, misalnya informasi file sumber.
+    """
+    doc_norms, max_weights = compute_weights(merged, idf)
+    term_numbers, doc_numbers = merged["term_numbers"], merged["doc_numbers"]
+    counts = merged["counts"]
+    postings = encode_postings(term_numbers, doc_numbers, counts, len(merged["terms"]))
+    # Postings terurut per term, sehingga pengurutan stabil per dokumen menjaga urutan
+    # term dalam setiap dokumen.
+    order = np.argsort(doc_numbers, kind="stable")
+    doc_terms = encode_postings(
+        doc_numbers[order], term_numbers[order], counts[order], len(merged["doc_ids"])
+    )
+
+    terms_blob, terms_offsets = pack_string_array(merged["terms"])
+    docs_blob, docs_offsets = pack_string_array(merged["doc_ids"])
+    arrays = {
+        "terms_blob": terms_blob,
+        "terms_offsets": terms_offsets,
+        "docs_blob": docs_blob,
+        "docs_offsets": docs_offsets,
+        **dict(zip(POSTINGS_ARRAYS, postings)),
+        **dict(zip(DOC_TERMS_ARRAYS, doc_terms)),
+        "doc_lengths": merged["doc_lengths"],
+        "doc_norms": doc_norms,
+        "idf": idf,
+        "max_weights": max_weights,
+    }
+    if merged["has_positions"]:
+        arrays["position_offsets"] = merged["position_offsets"]
+        arrays["text_offsets"] = merged["text_offsets"]
+    for name, array in arrays.items():
+        np.save(os.path.join(output_dir, f"{name}.npy"), array)
+    names = list(arrays)
+    if merged["has_positions"]:
+        names += ["positions", "texts"]
+    write_index_metadata(
+        output_dir,
+        names,
+        merged["has_positions"],
+        {"documents": len(merged["doc_ids"]), "terms": len(merged["terms"])},
+        metadata,
+    )
+
+
+def removal_mask(arrays, removed):
+    """
+    Membuat mask dokumen sebuah index yang tidak termasuk dokumen yang dihapus.
+
+    Parameters:
+        arrays (dict): Array-array index.
+        removed (iterable): Id dokumen yang dihapus.
+
+    Returns:
+        numpy.ndarray: Mask boolean untuk setiap dokumen.
+    """
+    doc_ids = string_array(arrays["docs_blob"], arrays["docs_offsets"])
+    keep = np.ones(len(doc_ids), dtype=bool)
+    removed = np.array(sorted(doc_id.encode("utf-8") for doc_id in removed), dtype="S")
+    if len(removed) and len(doc_ids):
+        found = np.searchsorted(doc_ids, removed)
+        found = found[found < len(doc_ids)]
+        keep[found[np.isin(doc_ids[found], removed)]] = False
+    return keep
+
+
+def document_shards(arrays, shard_count):
+    """
+    Menentukan shard setiap dokumen sebuah index, lihat shard_of.
+
+    Parameters:
+        arrays (dict): Array-array index.
+        shard_count (int): Jumlah shard.
+
+    Returns:
+        numpy.ndarray: Nomor shard setiap dokumen.
+    """
+    doc_ids = string_array(arrays["docs_blob"], arrays["docs_offsets"])
+    return np.array(
+        [shard_of(doc_id.decode("utf-8"), shard_count) for doc_id in doc_ids.tolist()],
+        dtype=np.int64,
+    )
+
+
+def merge_index(output, previous, batch, removed, shard_count, metadata=None):
+    """
+    Perbarui index tersimpan dengan menggabungkan array index sebelumnya dan dokumen baru.
+
+    Index sebelumnya tidak didekode menjadi dictionary: postings-nya didekode sebagai
+    array, dokumen yang dihapus atau berubah dibuang, lalu digabung dengan postings
+    dokumen baru dan dienkode ulang. IDF global dihitung dari document frequency gabungan,
+    sedangkan norma dokumen dan bobot maksimum hanya dihitung ulang untuk dokumen dan
+    term yang terpengaruh (lihat compute_weights). Jika shard_count lebih dari 1, setiap
+    shard berisi dokumen dengan shard_of yang sama, dan direktori utama berisi metadata
+    (jumlah shard, jumlah dokumen), tabel string vocabulary global yang terurut, serta
+    idf.npy berisi IDF global untuk menghitung bobot query. Index baru ditulis ke
+    direktori versi baru lalu diaktifkan dengan publish_index_version, sehingga pembaca
+    tidak pernah melihat index yang setengah ditulis. Pemanggil harus memegang
+    index_lock direktori index.
+
+    Parameters:
+        output (str): Direktori index.
+        previous (list): Array-array setiap shard index sebelumnya (satu untuk index yang
+            tidak dibagi), kosong jika index dibangun dari awal.
+        batch (dict): Array-array dokumen baru hasil pack_index. File teks dokumen baru
+            dapat dihapus setelah fungsi ini selesai.
+        removed (set): Id dokumen index sebelumnya yang dihapus atau diganti.
+        shard_count (int): Jumlah shard index baru.
+        metadata (dict, optional): Metadata tambahan, misalnya informasi file sumber.
+
+    Returns:
+        dict: Jumlah dokumen (key documents) dan term (key terms) pada index baru.
+    """
+    version_dir = create_index_version(output)
+    try:
+        counts = write_index_version(
+            version_dir, previous, batch, removed, shard_count, metadata
+        )
+    except BaseException:
+        shutil.rmtree(version_dir, ignore_errors=True)
+        raise
+    publish_index_version(output, version_dir)
+    return counts
+
+
+def write_index_version(version_dir, previous, batch, removed, shard_count, metadata):
+    """
+    Menulis index hasil penggabungan ke direktori versi yang belum aktif.
+
+    Parameters:
+        version_dir (str): Direktori versi hasil create_index_version.
+        previous, batch, removed, shard_count, metadata: Lihat merge_index.
+
+    Returns:
+        dict: Jumlah dokumen (key documents) dan term (key terms) pada index baru.
+    """
+    keeps = [removal_mask(arrays, removed) for arrays in previous]
+    reshard = len(previous) != shard_count
+    if reshard:
+        previous_shards = [document_shards(arrays, shard_count) for arrays in previous]
+    batch_shards = document_shards(batch, shard_count)
+
+    parts = []
+    for number in range(shard_count):
+        sources = []
+        for position, arrays in enumerate(previous):
+            if reshard:
+                sources.append(
+                    (arrays, keeps[position] & (previous_shards[position] == number))
+                )
+            elif position == number:
+                sources.append((arrays, keeps[position]))
+        sources.append((batch, batch_shards == number))
+        part_dir = version_dir
+        if shard_count > 1:
+            part_dir = os.path.join(version_dir, SHARD_DIR.format(number))
+            os.makedirs(part_dir)
+        parts.append((part_dir, merge_postings(sources, part_dir)))
+
+    # IDF global dari document frequency gabungan seluruh shard.
+    terms = [merged["terms"] for _, merged in parts]
+    terms, term_ranks = np.unique(np.concatenate(terms), return_inverse=True)
+    doc_frequencies = np.zeros(len(terms), dtype=np.int64)
+    doc_count = sum(len(merged["doc_ids"]) for _, merged in parts)
+    start = 0
+    for _, merged in parts:
+        ranks = term_ranks[start : start + len(merged["terms"])]
+        start += len(merged["terms"])
+        merged["global_terms"] = ranks
+        doc_frequencies[ranks] += np.bincount(
+            merged["term_numbers"], minlength=len(merged["terms"])
+        )
+    idf = np.array(
+        [compute_idf_from_df(df, doc_count) for df in doc_frequencies.tolist()],
+        dtype=np.float64,
+    )
+
+    counts = {"documents": doc_count, "terms": len(terms)}
+    if shard_count > 1:
+        for part_dir, merged in parts:
+            write_merged(part_dir, merged, idf[merged["global_terms"]])
+        terms_blob, terms_offsets = pack_string_array(terms)
+        np.save(os.path.join(version_dir, "terms_blob.npy"), terms_blob)
+        np.save(os.path.join(version_dir, "terms_offsets.npy"), terms_offsets)
+        np.save(os.path.join(version_dir, "idf.npy"), idf)
+        with open(
+            os.path.join(version_dir, METADATA_FILE), "w", encoding="utf-8"
+        ) as file:
+            json.dump(
+                {
+                    "version": INDEX_FORMAT_VERSION,
+                    "shards": shard_count,
+                    "doc_count": doc_count,
+                    "term_count": len(terms),
+                    "metadata": metadata or {},
+                },
+                file,
+            )
+    else:
+        ((part_dir, merged),) = parts
+        write_merged(part_dir, merged, idf, metadata)
+
+    return counts
@@ -0,0 +1,292 @@
+import numpy as np
+from collections.abc import Mapping, Sequence
+
+VARINT_MAX_BYTES = 10
+
+
+def varint_sizes(values):
+    """
+    Hitung jumlah byte varint untuk setiap bilangan.
+
+    Parameters:
+        values (numpy.ndarray): Bilangan bulat tak negatif.
+
+    Returns:
+        numpy.ndarray: Jumlah byte setiap bilangan (int64).
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    sizes = np.ones(len(values), dtype=np.int64)
+    for shift in range(7, 7 * VARINT_MAX_BYTES, 7):
+        sizes += values >= np.uint64(1 << shift)
+    return sizes
+
+
+def encode_varints(values):
+    """
+    Enkode bilangan bulat tak negatif sebagai varint (LEB128) dengan operasi vektor NumPy.
+
+    Setiap byte menyimpan 7 bit nilai, bit tertinggi menandakan masih ada byte lanjutan.
+
+    Parameters:
+        values (numpy.ndarray): Bilangan bulat tak negatif.
+
+    Returns:
+        numpy.ndarray: Byte hasil enkode (uint8).
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    sizes = varint_sizes(values)
+    starts = np.cumsum(sizes) - sizes
+    encoded = np.empty(int(sizes.sum()), dtype=np.uint8)
+    for byte in range(int(sizes.max(initial=0))):
+        mask = sizes > byte
+        chunk = (values[mask] >> np.uint64(7 * byte)) & np.uint64(0x7F)
+        more = (sizes[mask] > byte + 1).astype(np.uint64) << np.uint64(7)
+        encoded[starts[mask] + byte] = chunk | more
+    return encoded
+
+
+def decode_varints(data):
+    """
+    Dekode rangkaian varint (LEB128) dengan operasi vektor NumPy.
+
+    Parameters:
+        data (numpy.ndarray): Byte hasil encode_varints (uint8).
+
+    Returns:
+        numpy.ndarray: Bilangan bulat hasil dekode (int64).
+    """
+    data = np.asarray(data)
+    ends = np.flatnonzero(data < 0x80)
+    if not len(ends):
+        return np.zeros(0, dtype=np.int64)
+    if len(ends) == len(data):
+        return data.astype(np.int64)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    shifts = np.arange(len(data), dtype=np.int64) - np.repeat(starts, ends - starts + 1)
+    chunks = (data & 0x7F).astype(np.int64) << (7 * shifts)
+    return np.add.reduceat(chunks, starts)
+
+
+def encode_postings(rows, columns, counts, row_count):
+    """
+    Enkode pasangan (baris, kolom, frekuensi) yang terurut menjadi postings ringkas.
+
+    Nomor kolom setiap baris disimpan sebagai delta varint yang direset pada awal setiap
+    baris, sesuai format CompressedPostings.
+
+    Parameters:
+        rows (numpy.ndarray): Nomor baris, misalnya nomor term, terurut.
+        columns (numpy.ndarray): Nomor kolom, misalnya nomor dokumen, terurut per baris.
+        counts (numpy.ndarray): Frekuensi setiap pasangan.
+        row_count (int): Jumlah baris.
+
+    Returns:
+        tuple: Offset byte setiap baris, byte varint, posisi awal setiap baris, dan
+            frekuensi dengan tipe bilangan bulat terkecil yang cukup.
+    """
+    starts = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=row_count))))
+    deltas = np.diff(columns, prepend=0)
+    firsts = starts[:-1][np.diff(starts) > 0]
+    deltas[firsts] = columns[firsts]
+    byte_offsets = np.concatenate(([0], np.cumsum(varint_sizes(deltas))))
+    counts = np.asarray(counts)
+    return (
+        byte_offsets[starts],
+        encode_varints(deltas),
+        starts,
+        counts.astype(np.min_scalar_type(int(counts.max(initial=0)))),
+    )
+
+
+def pack_strings(strings):
+    """
+    Menyimpan daftar string sebagai satu blok byte UTF-8 dan array offset.
+
+    Parameters:
+        strings (list): Daftar string.
+
+    Returns:
+        tuple: Blok byte (uint8) dan offset awal setiap string (int64, panjang n + 1).
+    """
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return blob, offsets
+
+
+class StringTable(Sequence):
+    """
+    Tabel string read-only dalam satu blok byte UTF-8, tanpa objek str per elemen.
+
+    Jika string diurutkan saat dibuat, posisi sebuah string dapat dicari dengan
+    pencarian biner (urutan byte UTF-8 sama dengan urutan string Python).
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def encoded(self, position):
+        return self.blob[self.offsets[position] : self.offsets[position + 1]].tobytes()
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[item] for item in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self.encoded(position).decode("utf-8")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def find(self, value):
+        """
+        Mencari posisi sebuah string pada tabel yang terurut.
+
+        Parameters:
+            value (str): String yang dicari.
+
+        Returns:
+            int: Posisi string, atau -1 jika tidak ada.
+        """
+        target = value.encode("utf-8")
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.encoded(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self) and self.encoded(low) == target:
+            return low
+        return -1
+
+
+class StringIndex(Mapping):
+    """
+    Mapping read-only dari string ke posisinya pada StringTable yang terurut.
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def __getitem__(self, key):
+        position = self.table.find(key) if isinstance(key, str) else -1
+        if position < 0:
+            raise KeyError(key)
+        return position
+
+    def __contains__(self, key):
+        return isinstance(key, str) and self.table.find(key) >= 0
+
+    def __iter__(self):
+        return iter(self.table)
+
+    def __len__(self):
+        return len(self.table)
+
+
+class CompressedPostings(Mapping):
+    """
+    Postings read-only dalam format ringkas berbasis array.
+
+    Nomor dokumen setiap term diurutkan lalu disimpan sebagai selisih (delta) dalam
+    varint pada postings_data; postings term ke-i berada pada byte
+    postings_offsets[i]:postings_offsets[i + 1]. Frekuensi term disimpan pada array
+    postings_counts dengan tipe bilangan bulat terkecil yang cukup, pada rentang
+    postings_starts[i]:postings_starts[i + 1]. Term dan id dokumen disimpan dalam
+    StringTable yang terurut.
+    """
+
+    def __init__(
+        self,
+        terms,
+        doc_ids,
+        postings_offsets,
+        postings_data,
+        postings_starts,
+        postings_counts,
+    ):
+        self.terms = terms
+        self.doc_ids = doc_ids
+        self.term_positions = StringIndex(terms)
+        self.postings_offsets = postings_offsets
+        self.postings_data = postings_data
+        self.postings_starts = postings_starts
+        self.postings_counts = postings_counts
+
+    def decode_position(self, position):
+        """
+        Dekode postings term pada posisi tertentu di tabel term.
+
+        Parameters:
+            position (int): Posisi term.
+
+        Returns:
+            tuple: Nomor dokumen terurut (int64) dan frekuensi term pada dokumen tersebut.
+        """
+        start, end = (
+            self.postings_offsets[position],
+            self.postings_offsets[position + 1],
+        )
+        doc_numbers = np.cumsum(decode_varints(self.postings_data[start:end]))
+        start, end = self.postings_starts[position], self.postings_starts[position + 1]
+        return doc_numbers, self.postings_counts[start:end]
+
+    def decode(self, term):
+        """
+        Dekode postings sebuah term menjadi array untuk perhitungan skor.
+
+        Parameters:
+            term (str): Term yang dicari.
+
+        Returns:
+            tuple | None: Nomor dokumen terurut dan frekuensi term, atau None jika term
+                tidak ada di index.
+        """
+        position = self.terms.find(term)
+        if position < 0:
+            return None
+        return self.decode_position(position)
+
+    def decode_all(self):
+        """
+        Dekode seluruh postings sekaligus, misalnya untuk membangun matriks TF-IDF.
+
+        Returns:
+            tuple: Posisi term, nomor dokumen, dan frekuensi term untuk setiap posting.
+        """
+        starts = np.asarray(self.postings_starts[:-1])
+        sizes = np.diff(self.postings_starts)
+        totals = np.cumsum(decode_varints(self.postings_data))
+        # Delta direset pada awal postings setiap term, sehingga jumlah kumulatif
+        # dikurangi jumlah kumulatif sebelum postings term tersebut.
+        bases = np.zeros(len(starts), dtype=np.int64)
+        bases[starts > 0] = totals[starts[starts > 0] - 1]
+        doc_numbers = totals - np.repeat(bases, sizes)
+        term_numbers = np.repeat(np.arange(len(starts)), sizes)
+        return term_numbers, doc_numbers, np.asarray(self.postings_counts)
+
+    def __getitem__(self, term):
+        decoded = self.decode(term)
+        if decoded is None:
+            raise KeyError(term)
+        doc_numbers, counts = decoded
+        return {
+            self.doc_ids[doc]: count
+            for doc, count in zip(doc_numbers.tolist(), counts.tolist())
+        }
+
+    def __contains__(self, term):
+        return term in self.term_positions
+
+    def __iter__(self):
+        return iter(self.terms)
+
+    def __len__(self):
+        return len(self.terms)
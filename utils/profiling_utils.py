@@ -0,0 +1,176 @@
+import io
+import os
+import json
+import time
+import pstats
+import cProfile
+import logging
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger("temu_balik.profiling")
+
+CPROFILE_LIMIT = 30
+DIAGNOSTICS_LOG_PATH = "./logs/diagnostics.jsonl"
+
+
+class RequestProfiler:
+    """
+    Pencatat waktu per tahap untuk satu permintaan pencarian.
+
+    Setiap tahap mencatat jumlah pemanggilan, total waktu, dan penghitung tambahan
+    (misalnya jumlah token). Waktu ekstraksi dan pemrosesan per file dikumpulkan dari
+    hasil ingest_file, sehingga tetap tercatat walaupun file diproses di proses worker.
+    Statistik cache (misalnya cache hasil pencarian) dapat dicatat dengan record_cache.
+    Jika use_cprofile bernilai True, seluruh permintaan juga diprofil dengan cProfile
+    (hanya proses utama).
+    """
+
+    def __init__(self, label=None, use_cprofile=False):
+        self.label = label
+        self.use_cprofile = use_cprofile
+        self.started_at = None
+        self.total = 0.0
+        self.stages = {}
+        self.files = []
+        self.caches = {}
+        self.cprofile_report = None
+
+    def stage_entry(self, name):
+        return self.stages.setdefault(name, {"calls": 0, "total_s": 0.0})
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Mengukur waktu sebuah blok kode sebagai satu pemanggilan tahap.
+
+        Parameters:
+            name (str): Nama tahap.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.stage_entry(name)
+            entry["calls"] += 1
+            entry["total_s"] += time.perf_counter() - start
+
+    def add(self, name, counter, value=1):
+        """
+        Menambahkan nilai ke penghitung sebuah tahap.
+
+        Parameters:
+            name (str): Nama tahap.
+            counter (str): Nama penghitung, misalnya "tokens".
+            value (int | float): Nilai yang ditambahkan.
+        """
+        entry = self.stage_entry(name)
+        entry[counter] = entry.get(counter, 0) + value
+
+    def record_file(self, file_path, stats):
+        """
+        Mencatat statistik pemrosesan sebuah file dan menjumlahkannya ke tahap terkait.
+
+        Parameters:
+            file_path (str): Path file.
+            stats (dict): Statistik dari ingest_file dengan key extract_s, analyze_s, dan tokens.
+        """
+        self.files.append({"file_path": file_path, **stats})
+        for name, key in (("extract", "extract_s"), ("analyze", "analyze_s")):
+            entry = self.stage_entry(name)
+            entry["calls"] += 1
+            entry["total_s"] += stats[key]
+        self.add("analyze", "tokens", stats["tokens"])
+
+    def record_cache(self, name, stats):
+        """
+        Mencatat statistik terbaru sebuah cache.
+
+        Parameters:
+            name (str): Nama cache, misalnya "result_cache".
+            stats (dict): Statistik cache, misalnya hasil ResultCache.stats.
+        """
+        self.caches[name] = dict(stats)
+
+    @contextmanager
+    def request(self):
+        """
+        Mengukur seluruh permintaan, termasuk profil cProfile jika diaktifkan.
+        """
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        profile = cProfile.Profile() if self.use_cprofile else None
+        start = time.perf_counter()
+        if profile:
+            profile.enable()
+        try:
+            yield self
+        finally:
+            if profile:
+                profile.disable()
+                output = io.StringIO()
+                pstats.Stats(profile, stream=output).sort_stats(
+                    "cumulative"
+                ).print_stats(CPROFILE_LIMIT)
+                self.cprofile_report = output.getvalue()
+            self.total = time.perf_counter() - start
+            logger.info(self.to_json())
+
+    def report(self):
+        """
+        Mengembalikan hasil pengukuran sebagai struktur data biasa.
+
+        Returns:
+            dict: Label, waktu mulai, total waktu, statistik per tahap, statistik per file,
+                dan statistik cache.
+        """
+        return {
+            "label": self.label,
+            "started_at": self.started_at,
+            "total_s": self.total,
+            "stages": self.stages,
+            "files": self.files,
+            "caches": self.caches,
+        }
+
+    def to_json(self):
+        """
+        Serialisasi hasil pengukuran menjadi satu baris JSON untuk log terstruktur.
+
+        Returns:
+            str: Hasil report dalam format JSON.
+        """
+        return json.dumps(self.report(), ensure_ascii=False)
+
+
+def profile_stage(profiler, name):
+    """
+    Mengukur sebuah tahap jika profiler diberikan, atau tidak melakukan apa pun.
+
+    Parameters:
+        profiler (RequestProfiler | None): Profiler permintaan.
+        name (str): Nama tahap.
+
+    Returns:
+        context manager: Blok pengukuran tahap.
+    """
+    return profiler.stage(name) if profiler else nullcontext()
+
+
+def enable_log_file(log_path=DIAGNOSTICS_LOG_PATH):
+    """
+    Menulis log diagnostik setiap permintaan ke file JSON Lines.
+
+    Handler hanya ditambahkan sekali per path walaupun fungsi dipanggil berulang kali,
+    misalnya pada setiap rerun Streamlit.
+
+    Parameters:
+        log_path (str): Path file log.
+    """
+    log_path = os.path.abspath(log_path)
+    for handler in logger.handlers:
+        if getattr(handler, "baseFilename", None) == log_path:
+            return
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    handler = logging.FileHandler(log_path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
@@ -0,0 +1,119 @@
+import os
+import threading
+from functools import lru_cache
+from utils.document_reader_utils import DocumentError, load_dict, load_stopwords
+from utils.stem_cache_utils import STEM_CACHE_PATH, CachedStemmer
+from utils.stem_table_utils import STEM_TABLE_PATH, create_base_stemmer, load_stem_table
+
+# Satu lock untuk seluruh sumber daya bersama agar setiap sumber daya hanya
+# dibangun sekali walaupun diminta bersamaan oleh beberapa sesi Streamlit.
+resource_lock = threading.RLock()
+
+
+def file_signature(file_name):
+    """
+    Mengambil path absolut dan waktu modifikasi file sebagai key cache.
+
+    Parameters:
+        file_name (str): Path ke file.
+
+    Returns:
+        tuple: Path absolut dan waktu modifikasi file (None jika file tidak ada).
+    """
+    path = os.path.abspath(file_name)
+    try:
+        return path, os.stat(path).st_mtime_ns
+    except OSError:
+        return path, None
+
+
+@lru_cache(maxsize=8)
+def cached_dict(path, mtime):
+    return frozenset(load_dict(path))
+
+
+@lru_cache(maxsize=8)
+def cached_stopwords(path, mtime):
+    return frozenset(load_stopwords(path))
+
+
+@lru_cache(maxsize=1)
+def cached_base_stemmer():
+    return create_base_stemmer()
+
+
+@lru_cache(maxsize=4)
+def cached_stemmer(path, mtime):
+    return CachedStemmer(
+        cached_base_stemmer(),
+        cache_path=STEM_CACHE_PATH,
+        dictionary_path=path,
+        table=load_stem_table(STEM_TABLE_PATH, path),
+    )
+
+
+def get_shared_resources(dictionary_path, stopwords_path):
+    """
+    Mengambil kamus dan stopwords yang dipakai bersama oleh seluruh sesi dalam satu proses.
+
+    File hanya dibaca ulang jika path atau waktu modifikasinya berubah.
+
+    Parameters:
+        dictionary_path (str): Path ke file kamus.
+        stopwords_path (str): Path ke file stopwords.
+
+    Returns:
+        tuple: Kamus (frozenset) dan stopwords (frozenset).
+    """
+    with resource_lock:
+        dictionary = cached_dict(*file_signature(dictionary_path))
+        stopwords = cached_stopwords(*file_signature(stopwords_path))
+    return dictionary, stopwords
+
+
+def get_shared_stemmer(dictionary_path):
+    """
+    Mengambil stemmer ber-cache yang dipakai bersama oleh seluruh sesi dalam satu proses.
+
+    Stemmer Sastrawi hanya dibangun sekali per proses, sedangkan cache stemming dan tabel
+    kata dasar (jika sudah dibangun dengan build_stem_table.py) dimuat ulang jika file
+    kamus berubah.
+
+    Parameters:
+        dictionary_path (str): Path ke file kamus yang menjadi dasar validasi cache stemming.
+
+    Returns:
+        CachedStemmer: Stemmer dengan cache hasil stemming.
+    """
+    with resource_lock:
+        return cached_stemmer(*file_signature(dictionary_path))
+
+
+@lru_cache(maxsize=8)
+def warm_up_resources(dictionary_path, stopwords_path):
+    """
+    Memuat kamus, stopwords, dan stemmer (termasuk impor Sastrawi) di thread latar
+    belakang, sekali per proses untuk setiap pasangan path.
+
+    Aplikasi dapat tampil tanpa menunggu sumber daya tersebut, sedangkan query pertama
+    tidak lagi membayar waktu impor dan pemuatannya. Kesalahan diabaikan di sini karena
+    akan dilaporkan saat input divalidasi.
+
+    Parameters:
+        dictionary_path (str): Path ke file kamus.
+        stopwords_path (str): Path ke file stopwords.
+
+    Returns:
+        threading.Thread: Thread yang memuat sumber daya.
+    """
+
+    def load():
+        try:
+            get_shared_resources(dictionary_path, stopwords_path)
+            get_shared_stemmer(dictionary_path)
+        except DocumentError:
+            pass
+
+    thread = threading.Thread(target=load, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,139 @@
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from utils.resource_utils import file_signature
+from utils.storage_utils import index_signature
+
+RESULT_CACHE_SIZE = 256
+
+
+class ResultCache:
+    """
+    LRU cache hasil pencarian yang dipakai bersama oleh seluruh sesi dalam satu proses.
+
+    Key hasil berisi kata dasar query yang sudah dinormalisasi, generasi index, dan
+    tanda tangan file kamus serta stopwords, sehingga hasil lama tidak pernah dipakai
+    setelah kumpulan dokumen, kamus, atau stopwords berubah. Entri lama tersebut tidak
+    lagi diakses dan akhirnya dibuang oleh batas ukuran LRU.
+    """
+
+    def __init__(self, maxsize=RESULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Mengambil hasil pencarian dari cache.
+
+        Parameters:
+            key (tuple): Key hasil result_cache_key.
+
+        Returns:
+            list | None: Pasangan (id dokumen, skor), atau None jika tidak ada di cache.
+        """
+        with self.lock:
+            ranked = self.entries.get(key)
+            if ranked is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return ranked
+
+    def put(self, key, ranked):
+        """
+        Menyimpan hasil pencarian ke cache dan membuang entri yang paling lama tidak dipakai.
+
+        Parameters:
+            key (tuple): Key hasil result_cache_key.
+            ranked (list): Pasangan (id dokumen, skor).
+        """
+        with self.lock:
+            self.entries[key] = tuple(ranked)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Mengosongkan cache.
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """
+        Mengembalikan statistik pemakaian cache.
+
+        Returns:
+            dict: Jumlah hit, miss, rasio hit, jumlah entri, dan batas jumlah entri.
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0,
+                "entries": len(self.entries),
+                "maxsize": self.maxsize,
+            }
+
+
+def index_generation(index_dir):
+    """
+    Menghitung generasi index tersimpan dari path dan waktu modifikasi metadata index.
+
+    Parameters:
+        index_dir (str): Direktori index.
+
+    Returns:
+        str: Generasi index tersimpan.
+    """
+    return f"index:{os.path.abspath(index_dir)}:{index_signature(index_dir)}"
+
+
+def result_cache_key(
+    generation, terms, k, backend, tokenizer, dictionary_path, stopwords_path
+):
+    """
+    Membuat key cache hasil pencarian.
+
+    Kata dasar query diurutkan karena vektor query hanya bergantung pada jumlah
+    kemunculan setiap kata dasar, bukan urutannya.
+
+    Parameters:
+        generation (str): Generasi index, lihat index_generation.
+        terms (list): Kata dasar query hasil process_query.
+        k (int): Jumlah dokumen teratas.
+        backend (str): Metode perhitungan kemiripan.
+        tokenizer (str): Nama tokenizer.
+        dictionary_path (str): Path ke file kamus.
+        stopwords_path (str): Path ke file stopwords.
+
+    Returns:
+        tuple: Key cache.
+    """
+    return (
+        generation,
+        tuple(sorted(terms)),
+        k,
+        backend,
+        tokenizer,
+        file_signature(dictionary_path),
+        file_signature(stopwords_path),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_shared_result_cache():
+    """
+    Mengambil cache hasil pencarian yang dipakai bersama oleh seluruh sesi dalam satu proses.
+
+    Returns:
+        ResultCache: Cache hasil pencarian.
+    """
+    return ResultCache()
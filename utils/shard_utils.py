@@ -0,0 +1,331 @@
+import os
+import zlib
+import heapq
+import itertools
+import threading
+import multiprocessing
+import numpy as np
+from multiprocessing.connection import Client, Listener
+from utils.index_utils import (
+    compute_query_weights,
+    document_term_counts,
+    search_top_k,
+)
+from utils.postings_utils import StringIndex, StringTable
+from utils.snippet_utils import build_snippet
+from utils.storage_utils import (
+    ArrayMapping,
+    load_index,
+    load_index_arrays,
+    read_index_metadata,
+    resolve_index_dir,
+)
+
+SHARD_DIR = "shard-{:03d}"
+SHARD_HOST = "127.0.0.1"
+# Variabel lingkungan berisi kunci autentikasi shard server jika --authkey tidak diisi.
+SHARD_AUTHKEY_ENV = "SHARD_AUTHKEY"
+
+
+def shard_authkey(authkey=None):
+    """
+    Mengambil kunci autentikasi shard server dari argumen atau variabel lingkungan
+    SHARD_AUTHKEY_ENV. Tidak ada kunci bawaan.
+
+    Parameters:
+        authkey (str, optional): Kunci dari argumen baris perintah.
+
+    Returns:
+        bytes | None: Kunci autentikasi, atau None jika keduanya kosong.
+    """
+    authkey = authkey or os.environ.get(SHARD_AUTHKEY_ENV)
+    return authkey.encode("utf-8") if authkey else None
+
+
+def shard_of(doc_id, shard_count):
+    """
+    Menentukan shard sebuah dokumen dari hash path-nya, sehingga tetap sama antar build.
+
+    Parameters:
+        doc_id (str): Id dokumen (path file).
+        shard_count (int): Jumlah shard.
+
+    Returns:
+        int: Nomor shard.
+    """
+    return zlib.crc32(doc_id.encode("utf-8")) % shard_count
+
+
+def shard_count_of(index_dir):
+    """
+    Membaca jumlah shard index tersimpan.
+
+    Parameters:
+        index_dir (str): Direktori index.
+
+    Returns:
+        int: Jumlah shard, 1 untuk index yang tidak dibagi.
+    """
+    return read_index_metadata(index_dir).get("shards", 1)
+
+
+def load_sharded_arrays(index_dir):
+    """
+    Muat array-array seluruh shard index tersimpan sebagai memory-map.
+
+    Parameters:
+        index_dir (str): Direktori index yang dibagi menjadi shard (lihat merge_index).
+
+    Returns:
+        tuple: Array-array setiap shard (list) dan metadata yang disimpan bersama index.
+    """
+    index_dir = resolve_index_dir(index_dir)
+    stored = read_index_metadata(index_dir)
+    shards = [
+        load_index_arrays(os.path.join(index_dir, SHARD_DIR.format(number)))[0]
+        for number in range(stored["shards"])
+    ]
+    return shards, stored["metadata"]
+
+
+def handle_shard_connection(index, connection):
+    """
+    Melayani permintaan dari satu koneksi coordinator hingga koneksi ditutup.
+
+    Parameters:
+        index (dict): Index shard.
+        connection (Connection): Koneksi dari Listener.
+    """
+    with connection:
+        while True:
+            try:
+                command, *args = connection.recv()
+            except EOFError:
+                return
+            try:
+                if command == "search":
+                    query_weights, k = args
+                    result = search_top_k(index, [], k, query_weights)
+                elif command == "document":
+                    (doc_id,) = args
+                    result = document_term_counts(index, doc_id)
+                elif command == "snippet":
+                    doc_id, terms = args
+                    result = build_snippet(index, doc_id, terms)
+                elif command == "stats":
+                    result = {
+                        "documents": len(index["doc_lengths"]),
+                        "terms": len(index["postings"]),
+                    }
+                else:
+                    raise ValueError(f"Perintah tidak dikenal: {command}")
+                connection.send(("ok", result))
+            except Exception as e:
+                connection.send(("error", str(e)))
+
+
+def serve_shard(shard_dir, address=(SHARD_HOST, 0), authkey=None, ready=None):
+    """
+    Menjalankan shard server: memuat satu shard lalu melayani pencarian top-k.
+
+    Setiap koneksi dilayani oleh thread tersendiri sehingga beberapa coordinator dapat
+    memakai shard yang sama.
+
+    Parameters:
+        shard_dir (str): Direktori shard, lihat merge_index.
+        address (tuple): Host dan port; port 0 memilih port kosong.
+        authkey (bytes): Kunci autentikasi koneksi. Wajib diisi walaupun pada alamat
+            loopback, karena pesan dari koneksi yang tidak diautentikasi di-unpickle dan
+            dapat menjalankan kode apa pun sebagai pengguna server.
+        ready (Connection, optional): Pipe untuk mengirim alamat server setelah siap.
+
+    Raises:
+        ValueError: Jika authkey kosong.
+    """
+    if not authkey:
+        raise ValueError(
+            f"Shard server pada {address[0]} membutuhkan kunci autentikasi."
+        )
+    index, _ = load_index(shard_dir)
+    with Listener(address, authkey=authkey) as listener:
+        if ready is not None:
+            ready.send(listener.address)
+            ready.close()
+        while True:
+            try:
+                connection = listener.accept()
+            except multiprocessing.AuthenticationError:
+                continue
+            threading.Thread(
+                target=handle_shard_connection, args=(index, connection), daemon=True
+            ).start()
+
+
+class ShardedSearcher:
+    """
+    Coordinator pencarian scatter-gather untuk index yang dibagi menjadi shard.
+
+    Bobot query dihitung sekali dengan IDF global, dikirim ke seluruh shard server
+    sekaligus, lalu top-k setiap shard digabungkan menjadi top-k global. Tanpa addresses,
+    satu proses shard server dijalankan untuk setiap shard di mesin lokal.
+    """
+
+    def __init__(self, index_dir, addresses=None, authkey=None):
+        # Seluruh shard dibaca dari versi index yang sama walaupun index dibangun ulang.
+        index_dir = resolve_index_dir(index_dir)
+        stored = read_index_metadata(index_dir)
+        self.metadata = stored["metadata"]
+        self.doc_count = stored["doc_count"]
+        arrays = {
+            name: np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r")
+            for name in ("terms_blob", "terms_offsets", "idf")
+        }
+        self.idf = ArrayMapping(
+            StringIndex(StringTable(arrays["terms_blob"], arrays["terms_offsets"])),
+            arrays["idf"],
+        )
+        self.processes = []
+        self.lock = threading.Lock()
+
+        if addresses is None:
+            authkey = os.urandom(16)
+            context = multiprocessing.get_context("spawn")
+            pipes = []
+            for number in range(stored["shards"]):
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=serve_shard,
+                    args=(
+                        os.path.join(index_dir, SHARD_DIR.format(number)),
+                        (SHARD_HOST, 0),
+                        authkey,
+                        sender,
+                    ),
+                    daemon=True,
+                )
+                process.start()
+                sender.close()
+                pipes.append(receiver)
+                self.processes.append(process)
+            addresses = [receiver.recv() for receiver in pipes]
+        elif len(addresses) != stored["shards"]:
+            raise ValueError(
+                f"Index memiliki {stored['shards']} shard, "
+                f"tetapi diberikan {len(addresses)} alamat shard server."
+            )
+
+        self.connections = [Client(address, authkey=authkey) for address in addresses]
+
+    def request(self, *message):
+        """
+        Mengirim satu perintah ke seluruh shard lalu menunggu seluruh jawabannya.
+
+        Parameters:
+            *message: Nama perintah dan argumennya.
+
+        Returns:
+            list: Jawaban setiap shard.
+
+        Raises:
+            RuntimeError: Jika salah satu shard gagal memproses perintah.
+        """
+        with self.lock:
+            for connection in self.connections:
+                connection.send(message)
+            replies = [connection.recv() for connection in self.connections]
+        results = []
+        for number, (status, result) in enumerate(replies):
+            if status != "ok":
+                raise RuntimeError(f"Shard {number} gagal: {result}")
+            results.append(result)
+        return results
+
+    def request_shard(self, doc_id, *message):
+        """
+        Mengirim satu perintah ke shard yang menyimpan sebuah dokumen.
+
+        Parameters:
+            doc_id (str): Id dokumen, lihat shard_of.
+            *message: Nama perintah dan argumennya.
+
+        Returns:
+            object: Jawaban shard.
+
+        Raises:
+            RuntimeError: Jika shard gagal memproses perintah.
+        """
+        number = shard_of(doc_id, len(self.connections))
+        with self.lock:
+            connection = self.connections[number]
+            connection.send(message)
+            status, result = connection.recv()
+        if status != "ok":
+            raise RuntimeError(f"Shard {number} gagal: {result}")
+        return result
+
+    def document_term_counts(self, doc_id):
+        """
+        Mengambil jumlah kemunculan setiap term pada sebuah dokumen dari shard-nya.
+
+        Parameters:
+            doc_id (str): Id dokumen.
+
+        Returns:
+            dict | None: Pasangan term dan jumlah kemunculannya, atau None jika dokumen
+                tidak ada di index.
+        """
+        return self.request_shard(doc_id, "document", doc_id)
+
+    def snippet(self, doc_id, terms):
+        """
+        Membuat cuplikan dokumen dari index posisi pada shard-nya, lihat build_snippet.
+
+        Parameters:
+            doc_id (str): Id dokumen.
+            terms (list): Kata dasar query.
+
+        Returns:
+            str | None: Cuplikan dalam HTML, atau None jika posisi tidak disimpan.
+        """
+        return self.request_shard(doc_id, "snippet", doc_id, terms)
+
+    def search(self, query, k):
+        """
+        Mencari k dokumen dengan cosine similarity tertinggi di seluruh shard.
+
+        Parameters:
+            query (list): Daftar token query yang sudah di-stem.
+            k (int): Jumlah dokumen teratas.
+
+        Returns:
+            list: Pasangan (id dokumen, nilai kemiripan), terurut menurun seperti
+                search_top_k pada index yang tidak dibagi.
+        """
+        query_weights = compute_query_weights({"idf": self.idf}, query)
+        if not query_weights or k <= 0:
+            return []
+        return heapq.nlargest(
+            k,
+            itertools.chain.from_iterable(self.request("search", query_weights, k)),
+            key=lambda item: (item[1], item[0]),
+        )
+
+    def stats(self):
+        """
+        Mengembalikan jumlah dokumen dan term setiap shard.
+
+        Returns:
+            list: Statistik setiap shard.
+        """
+        return self.request("stats")
+
+    def close(self):
+        """
+        Menutup koneksi dan menghentikan shard server lokal.
+        """
+        for connection in self.connections:
+            connection.close()
+        for process in self.processes:
+            process.terminate()
+            process.join()
+        self.connections, self.processes = [], []
@@ -0,0 +1,156 @@
+import re
+import html
+
+SNIPPET_WINDOW = 240
+SNIPPET_COUNT = 2
+SNIPPET_SEPARATOR = " … "
+
+
+def term_positions(index, term, doc_id):
+    """
+    Mengambil posisi sebuah term dalam satu dokumen dari index tersimpan.
+
+    Parameters:
+        index (dict): Index hasil load_index yang menyimpan posisi term.
+        term (str): Term yang dicari.
+        doc_id (str): Id dokumen.
+
+    Returns:
+        list: Pasangan offset byte (awal, akhir), kosong jika term tidak muncul.
+    """
+    return index["positions"].lookup(term, doc_id).tolist()
+
+
+def read_text_range(index, doc_id, start, end):
+    """
+    Membaca rentang byte teks dokumen tersimpan tanpa memuat seluruh teks.
+
+    Parameters:
+        index (dict): Index hasil load_index yang menyimpan teks dokumen.
+        doc_id (str): Id dokumen.
+        start (int): Offset byte awal.
+        end (int): Offset byte akhir (eksklusif).
+
+    Returns:
+        bytes: Teks pada rentang tersebut.
+    """
+    return index["texts"].read_range(doc_id, start, end)
+
+
+def find_best_windows(hits, window=SNIPPET_WINDOW, count=SNIPPET_COUNT):
+    """
+    Memilih jendela teks yang memuat term query paling banyak.
+
+    Kemunculan term diurutkan berdasarkan posisi lalu ditelusuri dengan dua penunjuk,
+    sehingga setiap jendela dinilai dari jumlah term berbeda lalu jumlah kemunculannya.
+    Jendela terbaik dipilih secara rakus tanpa saling tumpang tindih.
+
+    Parameters:
+        hits (list): Tuple (awal, akhir, term) yang sudah diurutkan berdasarkan awal.
+        window (int): Panjang maksimum jendela dalam byte.
+        count (int): Jumlah jendela yang dipilih.
+
+    Returns:
+        list: Daftar daftar kemunculan (hits) untuk setiap jendela, terurut berdasarkan posisi.
+    """
+    candidates = []
+    terms = {}
+    left = 0
+    for right, (_, end, term) in enumerate(hits):
+        terms[term] = terms.get(term, 0) + 1
+        while left < right and end - hits[left][0] > window:
+            left_term = hits[left][2]
+            terms[left_term] -= 1
+            if not terms[left_term]:
+                del terms[left_term]
+            left += 1
+        candidates.append((len(terms), right - left + 1, -left, left, right))
+
+    selected = []
+    for _, _, _, left, right in sorted(candidates, reverse=True):
+        if len(selected) == count:
+            break
+        if all(right < start or left > end for start, end in selected):
+            selected.append((left, right))
+    return [hits[left : right + 1] for left, right in sorted(selected)]
+
+
+def render_window(index, doc_id, window_hits, window=SNIPPET_WINDOW):
+    """
+    Membaca satu jendela teks dan menyorot kemunculan term di dalamnya.
+
+    Parameters:
+        index (dict): Index yang menyimpan teks dokumen.
+        doc_id (str): Id dokumen.
+        window_hits (list): Kemunculan term dalam jendela.
+        window (int): Panjang jendela dalam byte.
+
+    Returns:
+        str: Potongan teks dengan term yang disorot menggunakan tag <mark>.
+    """
+    first, last = window_hits[0][0], window_hits[-1][1]
+    padding = max(0, window - (last - first)) // 2
+    start = max(0, first - padding)
+    text = read_text_range(index, doc_id, start, last + padding)
+
+    # Buang potongan kata di tepi jendela.
+    position, finish = 0, len(text)
+    if start > 0:
+        match = re.search(rb"\s", text[: first - start])
+        position = match.end() if match else first - start
+    if finish == last + padding - start:
+        match = re.search(rb"\s\S*$", text[last - start :])
+        finish = last - start + match.start() if match else finish
+
+    parts = []
+    for hit_start, hit_end, _ in window_hits:
+        hit_start, hit_end = hit_start - start, hit_end - start
+        if hit_start < position:
+            continue
+        parts.append(html.escape(text[position:hit_start].decode("utf-8", "ignore")))
+        parts.append(
+            f"<mark>{html.escape(text[hit_start:hit_end].decode('utf-8'))}</mark>"
+        )
+        position = hit_end
+    parts.append(html.escape(text[position:finish].decode("utf-8", "ignore")))
+
+    return " ".join("".join(parts).split())
+
+
+def build_snippet(
+    index, doc_id, query_terms, window=SNIPPET_WINDOW, count=SNIPPET_COUNT
+):
+    """
+    Membuat cuplikan dokumen berisi kemunculan term query dari index posisi.
+
+    Hanya rentang byte di sekitar jendela terpilih yang dibaca dari penyimpanan teks,
+    sehingga biayanya sebanding dengan ukuran cuplikan, bukan ukuran dokumen.
+
+    Parameters:
+        index (dict): Index hasil load_index yang menyimpan posisi term dan teks dokumen.
+        doc_id (str): Id dokumen.
+        query_terms (list): Kata dasar query.
+        window (int): Panjang setiap jendela dalam byte.
+        count (int): Jumlah jendela maksimum.
+
+    Returns:
+        str | None: Cuplikan dengan term yang disorot, atau None jika index tidak
+            menyimpan posisi untuk dokumen tersebut.
+    """
+    if "positions" not in index or doc_id not in index["texts"]:
+        return None
+
+    hits = sorted(
+        (start, end, term)
+        for term in set(query_terms)
+        for start, end in term_positions(index, term, doc_id)
+    )
+    if not hits:
+        text = read_text_range(index, doc_id, 0, window)
+        return html.escape(" ".join(text.decode("utf-8", "ignore").split())) + " …"
+
+    windows = [
+        render_window(index, doc_id, window_hits, window)
+        for window_hits in find_best_windows(hits, window, count)
+    ]
+    return f"… {SNIPPET_SEPARATOR.join(windows)} …"
@@ -0,0 +1,200 @@
+import numpy as np
+from collections import Counter
+
+
+def normalize_rows(matrix):
+    """
+    Normalisasi L2 setiap baris matriks sparse, baris bernilai nol dibiarkan nol.
+
+    Parameters:
+        matrix (csr_matrix): Matriks sparse yang akan dinormalisasi.
+
+    Returns:
+        csr_matrix: Matriks dengan panjang setiap baris bernilai 1.
+    """
+    from scipy.sparse import csr_matrix, diags
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms != 0)
+    return csr_matrix(diags(inverse) @ matrix)
+
+
+def build_tf_idf_matrix(index):
+    """
+    Bangun matriks TF-IDF dalam format CSR dari inverted index.
+
+    Setiap baris dinormalisasi sekali saat dibangun, sehingga cosine similarity
+    cukup dihitung dengan satu perkalian matriks sparse.
+
+    Parameters:
+        index (dict): Index hasil build_inverted_index.
+
+    Returns:
+        dict: Model berisi matriks TF-IDF ternormalisasi, posisi kolom setiap term,
+            nilai IDF per kolom, dan urutan id dokumen per baris.
+    """
+    from scipy.sparse import csr_matrix
+
+    if hasattr(index["postings"], "decode_all"):
+        return build_packed_tf_idf_matrix(index)
+
+    doc_ids = list(index["doc_lengths"])
+    doc_rows = {doc_id: row for row, doc_id in enumerate(doc_ids)}
+    terms = {term: column for column, term in enumerate(index["postings"])}
+
+    rows, columns, data = [], [], []
+    for term, column in terms.items():
+        term_idf = index["idf"][term]
+        for doc_id, count in index["postings"][term].items():
+            rows.append(doc_rows[doc_id])
+            columns.append(column)
+            data.append(count / index["doc_lengths"][doc_id] * term_idf)
+
+    matrix = csr_matrix(
+        (data, (rows, columns)), shape=(len(doc_ids), len(terms)), dtype=np.float64
+    )
+    idf = np.array([index["idf"][term] for term in terms], dtype=np.float64)
+    return {
+        "matrix": normalize_rows(matrix),
+        "terms": terms,
+        "idf": idf,
+        "doc_ids": doc_ids,
+    }
+
+
+def build_packed_tf_idf_matrix(index):
+    """
+    Bangun matriks TF-IDF dari index ringkas dengan mendekode seluruh postings sekaligus.
+
+    Baris dan kolom mengikuti urutan tabel id dokumen dan tabel term pada index.
+
+    Parameters:
+        index (dict): Index ringkas hasil load_index.
+
+    Returns:
+        dict: Model dengan struktur yang sama seperti build_tf_idf_matrix.
+    """
+    from scipy.sparse import csr_matrix
+
+    postings = index["postings"]
+    columns, rows, counts = postings.decode_all()
+    idf = np.asarray(index["idf"].values, dtype=np.float64)
+    lengths = np.asarray(index["doc_lengths"].values, dtype=np.float64)
+    matrix = csr_matrix(
+        (counts / lengths[rows] * idf[columns], (rows, columns)),
+        shape=(len(postings.doc_ids), len(postings.terms)),
+        dtype=np.float64,
+    )
+    return {
+        "matrix": normalize_rows(matrix),
+        "terms": postings.term_positions,
+        "idf": idf,
+        "doc_ids": postings.doc_ids,
+    }
+
+
+def vectorize_queries(model, queries):
+    """
+    Ubah sekumpulan query menjadi matriks TF-IDF sparse yang ternormalisasi.
+
+    Parameters:
+        model (dict): Model hasil build_tf_idf_matrix.
+        queries (list of list): Daftar query, masing-masing berupa daftar token yang sudah di-stem.
+
+    Returns:
+        csr_matrix: Matriks query berukuran jumlah query x jumlah term.
+    """
+    from scipy.sparse import csr_matrix
+
+    rows, columns, data = [], [], []
+    for row, query in enumerate(queries):
+        total_terms = len(query)
+        for term, count in Counter(query).items():
+            column = model["terms"].get(term)
+            if column is not None:
+                rows.append(row)
+                columns.append(column)
+                data.append(count / total_terms * model["idf"][column])
+
+    matrix = csr_matrix(
+        (data, (rows, columns)),
+        shape=(len(queries), len(model["terms"])),
+        dtype=np.float64,
+    )
+    return normalize_rows(matrix)
+
+
+def score_queries(model, queries):
+    """
+    Hitung cosine similarity banyak query terhadap seluruh dokumen sekaligus.
+
+    Parameters:
+        model (dict): Model hasil build_tf_idf_matrix.
+        queries (list of list): Daftar query yang sudah di-stem.
+
+    Returns:
+        numpy.ndarray: Matriks kemiripan berukuran jumlah query x jumlah dokumen.
+    """
+    query_matrix = vectorize_queries(model, queries)
+    return (query_matrix @ model["matrix"].T).toarray()
+
+
+def score_query_vectorized(model, query):
+    """
+    Hitung cosine similarity satu query terhadap seluruh dokumen.
+
+    Parameters:
+        model (dict): Model hasil build_tf_idf_matrix.
+        query (list): Daftar token query yang sudah di-stem.
+
+    Returns:
+        dict: Pasangan id dokumen dan nilai kemiripannya dengan query.
+    """
+    scores = model["matrix"] @ vectorize_queries(model, [query]).T
+    return dict(zip(model["doc_ids"], scores.toarray().ravel().tolist()))
+
+
+def select_top_k(doc_ids, positions, scores, k):
+    """
+    Pilih k skor positif tertinggi dengan partition tanpa mengurutkan seluruh skor.
+
+    Seluruh dokumen yang skornya sama dengan skor ke-k ikut dipertimbangkan, lalu dokumen
+    dengan skor sama diurutkan menurun berdasarkan posisinya seperti search_packed_top_k.
+    Untuk model dari index hasil load_index, posisi mengikuti urutan id dokumen.
+
+    Parameters:
+        doc_ids (list): Id dokumen sesuai urutan baris matriks TF-IDF.
+        positions (numpy.ndarray): Posisi dokumen untuk setiap skor.
+        scores (numpy.ndarray): Skor kemiripan.
+        k (int): Jumlah dokumen teratas yang dipilih.
+
+    Returns:
+        list: Pasangan (id dokumen, nilai kemiripan) dengan skor positif, terurut menurun.
+    """
+    if k <= 0:
+        return []
+    candidates = np.flatnonzero(scores > 0)
+    if len(candidates) > k:
+        kth = np.partition(scores[candidates], -k)[-k]
+        candidates = candidates[scores[candidates] >= kth]
+    top = candidates[np.lexsort((-positions[candidates], -scores[candidates]))[:k]]
+    return [(doc_ids[positions[item]], float(scores[item])) for item in top]
+
+
+def search_top_k_vectorized(model, query, k):
+    """
+    Cari k dokumen dengan cosine similarity tertinggi menggunakan backend vektorisasi.
+
+    Seluruh skor dihitung dengan satu perkalian matriks, lalu k teratas dipilih dengan
+    select_top_k tanpa mengurutkan seluruh dokumen.
+
+    Parameters:
+        model (dict): Model hasil build_tf_idf_matrix.
+        query (list): Daftar token query yang sudah di-stem.
+        k (int): Jumlah dokumen teratas yang dicari.
+
+    Returns:
+        list: Pasangan (id dokumen, nilai kemiripan) dengan skor positif, terurut menurun.
+    """
+    scores = (model["matrix"] @ vectorize_queries(model, [query]).T).toarray().ravel()
+    return select_top_k(model["doc_ids"], np.arange(len(scores)), scores, k)
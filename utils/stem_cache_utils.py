@@ -0,0 +1,174 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from utils.document_reader_utils import file_hash
+
+STEM_CACHE_PATH = "./cache/stems.sqlite3"
+STEM_CACHE_SIZE = 100_000
+FLUSH_THRESHOLD = 1000
+
+
+class CachedStemmer:
+    """
+    Pembungkus stemmer Sastrawi dengan cache hasil stemming.
+
+    Jika table diberikan (lihat build_stem_table), kata dicari lebih dulu pada tabel kata
+    -> kata dasar yang sudah dihitung sebelumnya; Sastrawi hanya dipanggil untuk kata
+    yang tidak ada di tabel. Hasil stemming disimpan di LRU cache dalam memori yang ukurannya dibatasi dan,
+    jika cache_path diberikan, di tabel token -> kata dasar pada SQLite sehingga dapat
+    dipakai ulang antar proses. Tabel di disk dikosongkan ketika isi file kamus berubah.
+    Objek ini memiliki method stem yang sama dengan stemmer Sastrawi sehingga dapat
+    langsung menggantikannya.
+    """
+
+    def __init__(
+        self,
+        stemmer,
+        maxsize=STEM_CACHE_SIZE,
+        cache_path=None,
+        dictionary_path=None,
+        table=None,
+    ):
+        self.stemmer = stemmer
+        self.table = table or {}
+        self.maxsize = maxsize
+        self.memory = OrderedDict()
+        self.pending = {}
+        self.table_hits = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.connection = None
+        if cache_path:
+            self.connection = open_stem_table(cache_path, dictionary_path)
+
+    def stem(self, word):
+        """
+        Mengembalikan kata dasar dari sebuah kata, memakai cache jika tersedia.
+
+        Parameters:
+            word (str): Kata yang akan di-stem.
+
+        Returns:
+            str: Kata dasar.
+        """
+        stemmed = self.table.get(word)
+        if stemmed is not None:
+            self.table_hits += 1
+            return stemmed
+
+        with self.lock:
+            stemmed = self.memory.get(word)
+            if stemmed is not None:
+                self.memory.move_to_end(word)
+                self.hits += 1
+                return stemmed
+
+            stemmed = self.lookup_disk(word)
+            if stemmed is not None:
+                self.disk_hits += 1
+            else:
+                stemmed = self.stemmer.stem(word)
+                self.misses += 1
+                if self.connection is not None:
+                    self.pending[word] = stemmed
+                    if len(self.pending) >= FLUSH_THRESHOLD:
+                        self.flush_pending()
+
+            self.memory[word] = stemmed
+            if len(self.memory) > self.maxsize:
+                self.memory.popitem(last=False)
+            return stemmed
+
+    def lookup_disk(self, word):
+        if self.connection is None:
+            return None
+        stemmed = self.pending.get(word)
+        if stemmed is not None:
+            return stemmed
+        row = self.connection.execute(
+            "SELECT stem FROM stems WHERE token = ?", (word,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def flush_pending(self):
+        if self.connection is None or not self.pending:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO stems (token, stem) VALUES (?, ?)",
+                self.pending.items(),
+            )
+        self.pending.clear()
+
+    def flush(self):
+        """
+        Menyimpan hasil stemming yang belum tertulis ke tabel di disk.
+        """
+        with self.lock:
+            self.flush_pending()
+
+    def stats(self):
+        """
+        Mengembalikan statistik pemakaian cache.
+
+        Returns:
+            dict: Jumlah hit tabel, hit memori, hit disk, miss, rasio hit, ukuran cache
+                memori, dan ukuran tabel.
+        """
+        with self.lock:
+            found = self.table_hits + self.hits + self.disk_hits
+            lookups = found + self.misses
+            return {
+                "table_hits": self.table_hits,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": found / lookups if lookups else 0,
+                "size": len(self.memory),
+                "table_size": len(self.table),
+            }
+
+
+def open_stem_table(cache_path, dictionary_path=None):
+    """
+    Membuka tabel stemming SQLite dan mengosongkannya jika file kamus berubah.
+
+    Parameters:
+        cache_path (str): Path ke file SQLite.
+        dictionary_path (str, optional): Path ke file kamus yang menjadi dasar validasi cache.
+
+    Returns:
+        sqlite3.Connection: Koneksi ke tabel stemming.
+    """
+    directory = os.path.dirname(cache_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(cache_path, timeout=30, check_same_thread=False)
+    with connection:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS stems (token TEXT PRIMARY KEY, stem TEXT NOT NULL)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+    signature = (
+        file_hash(dictionary_path)
+        if dictionary_path and os.path.exists(dictionary_path)
+        else ""
+    )
+    row = connection.execute(
+        "SELECT value FROM meta WHERE key = 'dictionary'"
+    ).fetchone()
+    if row is None or row[0] != signature:
+        with connection:
+            connection.execute("DELETE FROM stems")
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('dictionary', ?)",
+                (signature,),
+            )
+    return connection
@@ -0,0 +1,242 @@
+import os
+import gzip
+import multiprocessing
+from importlib.metadata import version
+from concurrent.futures import ProcessPoolExecutor
+from utils.document_reader_utils import file_hash
+
+STEM_TABLE_PATH = "./cache/stem_table.tsv.gz"
+STEM_TABLE_CHUNK_SIZE = 5000
+
+# Awalan meN-/peN- luluh mengikuti huruf awal kata dasar, misalnya tulis -> menulis,
+# pukul -> memukul, kirim -> mengirim, dan sapu -> menyapu.
+NASAL_PREFIXES = [
+    ("k", "ng", 1),
+    ("p", "m", 1),
+    ("t", "n", 1),
+    ("s", "ny", 1),
+    ("aiueogh", "ng", 0),
+    ("bfv", "m", 0),
+    ("dcjz", "n", 0),
+]
+AFFIX_PATTERNS = [
+    ("meN", ""),
+    ("di", ""),
+    ("ber", ""),
+    ("ter", ""),
+    ("peN", ""),
+    ("se", ""),
+    ("", "an"),
+    ("", "kan"),
+    ("", "i"),
+    ("", "nya"),
+    ("meN", "kan"),
+    ("meN", "i"),
+    ("di", "kan"),
+    ("di", "i"),
+    ("peN", "an"),
+    ("per", "an"),
+    ("ke", "an"),
+    ("ber", "an"),
+]
+
+
+class SetDictionary:
+    """
+    Kamus kata dasar untuk Stemmer Sastrawi yang disimpan sebagai set.
+
+    ArrayDictionary Sastrawi menyimpan kamus sebagai list sehingga setiap pengecekan kata
+    dasar memindai seluruh kamus. Kelas ini memiliki method yang sama dengan
+    ArrayDictionary, tetapi pengecekannya memakai set sehingga hasil stemming sama dengan
+    pengecekan yang jauh lebih cepat.
+    """
+
+    def __init__(self, words=None):
+        self.words = set()
+        if words:
+            self.add_words(words)
+
+    def contains(self, word):
+        return word in self.words
+
+    def count(self):
+        return len(self.words)
+
+    def add_words(self, words):
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        if word and word.strip():
+            self.words.add(word)
+
+
+def create_base_stemmer():
+    """
+    Membuat stemmer Sastrawi dengan kamus bawaannya, tanpa cache hasil stemming.
+
+    Stemmer dibangun langsung dengan konstruktor Stemmer Sastrawi dan SetDictionary,
+    bukan StemmerFactory, sehingga tidak dibungkus CachedStemmer Sastrawi yang cachenya
+    tidak dibatasi. Cache hasil stemming diatur oleh CachedStemmer dari stem_cache_utils.
+
+    Returns:
+        Stemmer: Stemmer Sastrawi tanpa cache.
+    """
+    from Sastrawi.Stemmer.Stemmer import Stemmer
+    from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+
+    return Stemmer(SetDictionary(StemmerFactory().get_words()))
+
+
+def nasal_prefix(base, root):
+    """
+    Menggabungkan awalan meN- atau peN- dengan kata dasar.
+
+    Parameters:
+        base (str): Awalan tanpa nasal, "me" atau "pe".
+        root (str): Kata dasar.
+
+    Returns:
+        str: Kata berimbuhan, misalnya nasal_prefix("me", "tulis") -> "menulis".
+    """
+    for letters, nasal, dropped in NASAL_PREFIXES:
+        if root[0] in letters:
+            return base + nasal + root[dropped:]
+    return base + root
+
+
+def affix_forms(root):
+    """
+    Membentuk kata berimbuhan umum dari sebuah kata dasar (lihat AFFIX_PATTERNS).
+
+    Parameters:
+        root (str): Kata dasar.
+
+    Returns:
+        list: Kata-kata berimbuhan.
+    """
+    forms = []
+    for prefix, suffix in AFFIX_PATTERNS:
+        if prefix in ("meN", "peN"):
+            word = nasal_prefix(prefix[:2], root)
+        else:
+            word = prefix + root
+        forms.append(word + suffix)
+    return forms
+
+
+def stem_words(words):
+    """
+    Melakukan stemming sekumpulan kata dengan Sastrawi, dijalankan di proses worker.
+
+    Parameters:
+        words (list): Daftar kata.
+
+    Returns:
+        list: Pasangan (kata, kata dasar).
+    """
+    stemmer = create_base_stemmer()
+    return [(word, stemmer.stem(word)) for word in words]
+
+
+def build_stem_table(words, dictionary, affix_roots=(), workers=1):
+    """
+    Menghitung tabel kata -> kata dasar dengan Sastrawi.
+
+    Setiap kata pada words selalu dimasukkan ke tabel. Kata berimbuhan yang dibentuk dari
+    affix_roots hanya dimasukkan jika kata dasarnya ada di kamus, karena bentuk lain tidak
+    pernah dipakai untuk index maupun query.
+
+    Parameters:
+        words (iterable): Kata yang harus ada di tabel, misalnya kamus dan kosakata korpus.
+        dictionary (set): Kamus kata dasar.
+        affix_roots (iterable): Kata dasar yang dibentuk menjadi kata berimbuhan.
+        workers (int): Jumlah proses worker.
+
+    Returns:
+        dict: Kata -> kata dasar, sama dengan hasil stemmer.stem.
+    """
+    words = sorted(set(words))
+    forms = sorted(
+        {form for root in affix_roots for form in affix_forms(root)} - set(words)
+    )
+    chunks = [
+        batch[start : start + STEM_TABLE_CHUNK_SIZE]
+        for batch in (words, forms)
+        for start in range(0, len(batch), STEM_TABLE_CHUNK_SIZE)
+    ]
+    if workers > 1 and len(chunks) > 1:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            results = list(executor.map(stem_words, chunks))
+    else:
+        results = [stem_words(chunk) for chunk in chunks]
+
+    required = set(words)
+    return {
+        word: stem
+        for pairs in results
+        for word, stem in pairs
+        if word in required or stem in dictionary
+    }
+
+
+def stem_table_signature(dictionary_path):
+    """
+    Membuat tanda tangan tabel dari isi kamus dan versi Sastrawi.
+
+    Parameters:
+        dictionary_path (str): Path ke file kamus.
+
+    Returns:
+        str: Tanda tangan tabel.
+    """
+    return f"dictionary={file_hash(dictionary_path)};sastrawi={version('Sastrawi')}"
+
+
+def save_stem_table(table, path, dictionary_path):
+    """
+    Simpan tabel kata -> kata dasar sebagai TSV terkompresi gzip.
+
+    Baris pertama berisi tanda tangan tabel. Kata yang kata dasarnya sama dengan kata
+    itu sendiri disimpan tanpa kolom kedua.
+
+    Parameters:
+        table (dict): Hasil build_stem_table.
+        path (str): Path file tabel.
+        dictionary_path (str): Path ke file kamus yang dipakai saat membangun tabel.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with gzip.open(temp_path, "wt", encoding="utf-8") as file:
+        file.write(f"#{stem_table_signature(dictionary_path)}\n")
+        for word in sorted(table):
+            stem = table[word]
+            file.write(f"{word}\n" if stem == word else f"{word}\t{stem}\n")
+    os.replace(temp_path, path)
+
+
+def load_stem_table(path, dictionary_path):
+    """
+    Muat tabel kata -> kata dasar hasil save_stem_table.
+
+    Parameters:
+        path (str): Path file tabel.
+        dictionary_path (str): Path ke file kamus yang sedang dipakai.
+
+    Returns:
+        dict: Kata -> kata dasar, kosong jika tabel belum ada atau dibangun dengan kamus
+            maupun versi Sastrawi yang berbeda.
+    """
+    if not os.path.exists(path) or not os.path.exists(dictionary_path):
+        return {}
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        if file.readline().rstrip("\n") != f"#{stem_table_signature(dictionary_path)}":
+            return {}
+        table = {}
+        for line in file:
+            word, separator, stem = line.rstrip("\n").partition("\t")
+            table[word] = stem if separator else word
+    return table
@@ -0,0 +1,542 @@
+import os
+import re
+import json
+import shutil
+import numpy as np
+from collections.abc import Mapping
+from contextlib import contextmanager
+from utils.postings_utils import (
+    CompressedPostings,
+    StringIndex,
+    StringTable,
+    encode_varints,
+    pack_strings,
+    varint_sizes,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+INDEX_FORMAT_VERSION = 7
+METADATA_FILE = "metadata.json"
+# File penunjuk berisi nama direktori versi index yang aktif.
+CURRENT_FILE = "CURRENT"
+VERSION_DIR = "v-{:06d}"
+VERSION_PATTERN = re.compile(r"v-(\d{6})")
+# File lock yang dipegang selama index dibangun dan versi barunya diaktifkan.
+LOCK_FILE = "LOCK"
+# File dan direktori index yang ditulis langsung di direktori index sebelum ada versi.
+LEGACY_PATTERN = re.compile(r"metadata\.json|\w+\.npy|shard-\d{3}")
+
+
+class ArrayMapping(Mapping):
+    """
+    Mapping read-only dari key ke nilai pada array NumPy (dapat berupa memory-map).
+    """
+
+    def __init__(self, positions, values):
+        self.positions = positions
+        self.values = values
+
+    def __getitem__(self, key):
+        return self.values[self.positions[key]].item()
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def __iter__(self):
+        return iter(self.positions)
+
+    def __len__(self):
+        return len(self.positions)
+
+
+class MappedPositions(Mapping):
+    """
+    Posisi term read-only yang dibaca dari array (dapat berupa memory-map).
+
+    Array posisi disusun sejajar dengan postings ringkas: posisi posting ke-j (urutan
+    term lalu nomor dokumen) berada pada baris position_offsets[j]:position_offsets[j + 1]
+    dari array positions berukuran n x 2 (offset byte awal dan akhir).
+    """
+
+    def __init__(self, postings, doc_positions, position_offsets, positions):
+        self.postings = postings
+        self.doc_positions = doc_positions
+        self.position_offsets = position_offsets
+        self.positions = positions
+
+    def posting_positions(self, posting):
+        start, end = self.position_offsets[posting], self.position_offsets[posting + 1]
+        return self.positions[start:end]
+
+    def lookup(self, term, doc_id):
+        """
+        Mengambil posisi sebuah term dalam satu dokumen tanpa membaca posting lainnya.
+
+        Parameters:
+            term (str): Term yang dicari.
+            doc_id (str): Id dokumen.
+
+        Returns:
+            numpy.ndarray: Pasangan offset byte awal dan akhir, kosong jika tidak ada.
+        """
+        position = self.postings.terms.find(term)
+        doc_position = self.postings.doc_ids.find(doc_id)
+        if position < 0 or doc_position < 0:
+            return self.positions[:0]
+        doc_numbers, _ = self.postings.decode_position(position)
+        found = np.searchsorted(doc_numbers, doc_position)
+        if found == len(doc_numbers) or doc_numbers[found] != doc_position:
+            return self.positions[:0]
+        return self.posting_positions(self.postings.postings_starts[position] + found)
+
+    def __getitem__(self, term):
+        position = self.postings.terms.find(term)
+        if position < 0:
+            raise KeyError(term)
+        doc_numbers, _ = self.postings.decode_position(position)
+        start = self.postings.postings_starts[position]
+        return {
+            self.postings.doc_ids[doc]: self.posting_positions(posting)
+            for posting, doc in enumerate(doc_numbers.tolist(), start)
+        }
+
+    def __contains__(self, term):
+        return term in self.postings
+
+    def __iter__(self):
+        return iter(self.postings)
+
+    def __len__(self):
+        return len(self.postings)
+
+
+class TextStore(Mapping):
+    """
+    Teks UTF-8 seluruh dokumen dalam satu array byte, dibaca per rentang sesuai kebutuhan.
+    """
+
+    def __init__(self, data, doc_positions, text_offsets):
+        self.data = data
+        self.doc_positions = doc_positions
+        self.text_offsets = text_offsets
+
+    def read_range(self, doc_id, start, end):
+        """
+        Membaca sebagian teks sebuah dokumen.
+
+        Parameters:
+            doc_id (str): Id dokumen.
+            start (int): Offset byte awal dalam teks dokumen.
+            end (int): Offset byte akhir (eksklusif) dalam teks dokumen.
+
+        Returns:
+            bytes: Teks pada rentang tersebut.
+        """
+        position = self.doc_positions[doc_id]
+        base = int(self.text_offsets[position])
+        limit = int(self.text_offsets[position + 1])
+        start, end = base + max(0, start), min(limit, base + end)
+        if start >= end:
+            return b""
+        return self.data[start:end].tobytes()
+
+    def __getitem__(self, doc_id):
+        position = self.doc_positions[doc_id]
+        return self.read_range(
+            doc_id,
+            0,
+            int(self.text_offsets[position + 1] - self.text_offsets[position]),
+        )
+
+    def __contains__(self, doc_id):
+        return doc_id in self.doc_positions
+
+    def __iter__(self):
+        return iter(self.doc_positions)
+
+    def __len__(self):
+        return len(self.doc_positions)
+
+
+def pack_index(index):
+    """
+    Ubah postings index menjadi kumpulan array ringkas.
+
+    Term dan id dokumen diurutkan lalu disimpan sebagai tabel string, nomor dokumen
+    pada postings disimpan sebagai delta varint, dan frekuensi term disimpan dengan tipe
+    bilangan bulat terkecil yang cukup. Jika index menyimpan posisi term untuk seluruh
+    dokumen, posisi disimpan sejajar dengan postings, sedangkan teks dokumen tetap berada
+    di file teks hasil ingest_file dan hanya lokasinya yang disimpan: text_spools berisi
+    memory-map setiap file teks dan text_spans berisi nomor file serta offset awal dan
+    akhir teks setiap dokumen. Bobot (IDF, norma dokumen, dan bobot maksimum) tidak ikut dikemas,
+    karena dihitung saat array digabungkan dengan index lain (lihat merge_index).
+
+    Parameters:
+        index (dict): Index berisi postings dan panjang dokumen, serta posisi term dan
+            teks dokumen jika ada (lihat update_index).
+
+    Returns:
+        tuple: Array-array index (dict) dan penanda apakah posisi term ikut disimpan.
+    """
+    terms = sorted(index["postings"])
+    doc_ids = sorted(index["doc_lengths"])
+    doc_positions = {doc_id: position for position, doc_id in enumerate(doc_ids)}
+
+    texts = index.get("texts", {})
+    has_positions = bool(doc_ids) and all(doc_id in texts for doc_id in doc_ids)
+
+    postings_starts = np.zeros(len(terms) + 1, dtype=np.int64)
+    deltas, counts = [], []
+    position_counts, positions = [], []
+    for position, term in enumerate(terms):
+        postings = index["postings"][term]
+        doc_numbers = np.fromiter(
+            (doc_positions[doc_id] for doc_id in postings), np.int64, len(postings)
+        )
+        order = np.argsort(doc_numbers)
+        doc_numbers = doc_numbers[order]
+        deltas.append(np.diff(doc_numbers, prepend=0))
+        counts.append(np.fromiter(postings.values(), np.int64, len(postings))[order])
+        postings_starts[position + 1] = postings_starts[position] + len(postings)
+        if has_positions:
+            term_positions = index["positions"].get(term, {})
+            for doc_number in doc_numbers.tolist():
+                posting = np.asarray(
+                    term_positions.get(doc_ids[doc_number], ()), dtype=np.uint32
+                )
+                positions.append(posting.reshape(-1, 2))
+                position_counts.append(len(positions[-1]))
+
+    deltas = np.concatenate(deltas) if deltas else np.zeros(0, dtype=np.int64)
+    counts = np.concatenate(counts) if counts else np.zeros(0, dtype=np.int64)
+    byte_offsets = np.concatenate(([0], np.cumsum(varint_sizes(deltas))))
+
+    terms_blob, terms_offsets = pack_strings(terms)
+    docs_blob, docs_offsets = pack_strings(doc_ids)
+    arrays = {
+        "terms_blob": terms_blob,
+        "terms_offsets": terms_offsets,
+        "docs_blob": docs_blob,
+        "docs_offsets": docs_offsets,
+        "postings_offsets": byte_offsets[postings_starts],
+        "postings_data": encode_varints(deltas),
+        "postings_starts": postings_starts,
+        "postings_counts": counts.astype(
+            np.min_scalar_type(int(counts.max(initial=0)))
+        ),
+        "doc_lengths": np.array(
+            [index["doc_lengths"][doc_id] for doc_id in doc_ids], dtype=np.int64
+        ),
+    }
+
+    if has_positions:
+        arrays["position_offsets"] = np.concatenate(
+            ([0], np.cumsum(position_counts, dtype=np.int64))
+        )
+        arrays["positions"] = (
+            np.concatenate(positions) if positions else np.zeros((0, 2), np.uint32)
+        )
+        spools = sorted({texts[doc_id][0] for doc_id in doc_ids})
+        spool_numbers = {path: number for number, path in enumerate(spools)}
+        arrays["text_spools"] = [
+            (
+                np.memmap(path, dtype=np.uint8, mode="r")
+                if os.path.getsize(path)
+                else np.zeros(0, dtype=np.uint8)
+            )
+            for path in spools
+        ]
+        arrays["text_spans"] = np.array(
+            [
+                (spool_numbers[path], start, end)
+                for path, start, end in (texts[doc_id] for doc_id in doc_ids)
+            ],
+            dtype=np.int64,
+        )
+    return arrays, has_positions
+
+
+def unpack_index(arrays, has_positions):
+    """
+    Bangun index read-only dari array index tersimpan (lihat merge_index).
+
+    Parameters:
+        arrays (dict): Array-array index, di memori maupun memory-map.
+        has_positions (bool): Apakah array posisi term dan teks dokumen tersedia.
+
+    Returns:
+        dict: Index dengan struktur yang sama seperti build_inverted_index, ditambah
+            doc_terms berisi term dan frekuensinya pada setiap dokumen.
+    """
+    terms = StringTable(arrays["terms_blob"], arrays["terms_offsets"])
+    doc_ids = StringTable(arrays["docs_blob"], arrays["docs_offsets"])
+    term_positions = StringIndex(terms)
+    doc_positions = StringIndex(doc_ids)
+    postings = CompressedPostings(
+        terms,
+        doc_ids,
+        arrays["postings_offsets"],
+        arrays["postings_data"],
+        arrays["postings_starts"],
+        arrays["postings_counts"],
+    )
+
+    index = {
+        "postings": postings,
+        # Postings per dokumen: term dan frekuensinya pada setiap dokumen.
+        "doc_terms": CompressedPostings(
+            doc_ids,
+            terms,
+            arrays["doc_terms_offsets"],
+            arrays["doc_terms_data"],
+            arrays["doc_terms_starts"],
+            arrays["doc_terms_counts"],
+        ),
+        "doc_lengths": ArrayMapping(doc_positions, arrays["doc_lengths"]),
+        "idf": ArrayMapping(term_positions, arrays["idf"]),
+        "doc_norms": ArrayMapping(doc_positions, arrays["doc_norms"]),
+        "max_weights": ArrayMapping(term_positions, arrays["max_weights"]),
+    }
+
+    if has_positions:
+        index["positions"] = MappedPositions(
+            postings,
+            doc_positions,
+            arrays["position_offsets"],
+            arrays["positions"],
+        )
+        index["texts"] = TextStore(
+            arrays["texts"], doc_positions, arrays["text_offsets"]
+        )
+    return index
+
+
+def write_index_metadata(index_dir, arrays, has_positions, counts, metadata=None):
+    """
+    Tulis metadata.json untuk direktori index yang array .npy-nya sudah disimpan.
+
+    Parameters:
+        index_dir (str): Direktori index.
+        arrays (iterable): Nama array yang disimpan di direktori index.
+        has_positions (bool): Apakah array posisi term dan teks dokumen tersedia.
+        counts (dict): Jumlah dokumen (key documents) dan term (key terms) pada index.
+        metadata (dict, optional): Metadata tambahan, misalnya informasi file sumber.
+    """
+    with open(os.path.join(index_dir, METADATA_FILE), "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "version": INDEX_FORMAT_VERSION,
+                "arrays": sorted(arrays),
+                "positions": has_positions,
+                "doc_count": counts["documents"],
+                "term_count": counts["terms"],
+                "metadata": metadata or {},
+            },
+            file,
+        )
+
+
+def resolve_index_dir(index_dir):
+    """
+    Mengikuti file penunjuk CURRENT ke direktori versi index yang aktif.
+
+    Parameters:
+        index_dir (str): Direktori index, atau langsung direktori versi index.
+
+    Returns:
+        str: Direktori versi yang ditunjuk CURRENT, atau index_dir jika tidak ada
+            penunjuk (misalnya index_dir sudah berupa direktori versi atau shard).
+    """
+    try:
+        with open(os.path.join(index_dir, CURRENT_FILE), encoding="utf-8") as file:
+            version = file.read().strip()
+    except (FileNotFoundError, NotADirectoryError):
+        return index_dir
+    return os.path.join(index_dir, version)
+
+
+def create_index_version(index_dir):
+    """
+    Membuat direktori versi baru yang kosong untuk build index berikutnya.
+
+    Nomor versi selalu lebih besar dari seluruh direktori versi yang ada, termasuk
+    versi yang tidak selesai ditulis, sehingga direktori versi tidak pernah dipakai ulang.
+
+    Parameters:
+        index_dir (str): Direktori index.
+
+    Returns:
+        str: Direktori versi baru.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    numbers = [
+        int(match.group(1))
+        for match in map(VERSION_PATTERN.fullmatch, os.listdir(index_dir))
+        if match
+    ]
+    version_dir = os.path.join(
+        index_dir, VERSION_DIR.format(max(numbers, default=0) + 1)
+    )
+    os.makedirs(version_dir)
+    return version_dir
+
+
+@contextmanager
+def index_lock(index_dir):
+    """
+    Menunggu lalu memegang lock eksklusif direktori index selama blok dijalankan.
+
+    Lock dipegang oleh sistem operasi pada file LOCK_FILE, sehingga berlaku antar thread
+    maupun proses (misalnya pekerjaan build di aplikasi dan build_index.py) dan dilepas
+    otomatis jika proses berhenti.
+
+    Parameters:
+        index_dir (str): Direktori index, dibuat jika belum ada.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    with open(os.path.join(index_dir, LOCK_FILE), "a+b") as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def publish_index_version(index_dir, version_dir):
+    """
+    Menjadikan direktori versi yang sudah lengkap sebagai index aktif.
+
+    File penunjuk CURRENT ditulis ke file sementara lalu diganti dengan os.replace yang
+    atomik, sehingga pembaca (lihat resolve_index_dir) hanya melihat versi lama atau versi
+    baru yang utuh. Versi sebelumnya dipertahankan untuk pembaca yang baru saja mengikuti
+    penunjuk lama, sedangkan versi yang lebih lama, versi yang tidak selesai ditulis, dan
+    file index dengan susunan lama (tanpa direktori versi) dihapus. Engine yang masih
+    memakai memory-map versi yang dihapus tetap dapat mencari sampai engine diganti.
+    Pemanggil harus memegang index_lock sejak create_index_version agar tidak ada versi
+    lain yang sedang ditulis.
+
+    Parameters:
+        index_dir (str): Direktori index.
+        version_dir (str): Direktori versi hasil create_index_version.
+    """
+    previous = os.path.basename(resolve_index_dir(index_dir))
+    current = os.path.basename(version_dir)
+    pointer = os.path.join(index_dir, CURRENT_FILE)
+    with open(f"{pointer}.tmp", "w", encoding="utf-8") as file:
+        file.write(current)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(f"{pointer}.tmp", pointer)
+
+    for name in os.listdir(index_dir):
+        path = os.path.join(index_dir, name)
+        if VERSION_PATTERN.fullmatch(name) and name not in (current, previous):
+            shutil.rmtree(path, ignore_errors=True)
+        elif LEGACY_PATTERN.fullmatch(name):
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+
+def load_index(index_dir):
+    """
+    Muat inverted index dari direktori index dengan array memory-map.
+
+    Parameters:
+        index_dir (str): Direktori index.
+
+    Returns:
+        tuple: Index (dict) dengan struktur yang sama seperti build_inverted_index
+            dan metadata yang disimpan bersama index.
+
+    Raises:
+        ValueError: Jika versi format index tidak didukung atau index dibagi menjadi shard.
+    """
+    arrays, stored = load_index_arrays(index_dir)
+    return unpack_index(arrays, stored["positions"]), stored["metadata"]
+
+
+def load_index_arrays(index_dir):
+    """
+    Muat array-array index dari direktori index sebagai memory-map.
+
+    Parameters:
+        index_dir (str): Direktori index.
+
+    Returns:
+        tuple: Array-array index (dict) dan isi metadata.json.
+
+    Raises:
+        ValueError: Jika versi format index tidak didukung atau index dibagi menjadi shard.
+    """
+    index_dir = resolve_index_dir(index_dir)
+    stored = read_index_metadata(index_dir)
+    if stored.get("shards"):
+        raise ValueError(
+            f"Index {index_dir} dibagi menjadi {stored['shards']} shard, "
+            "muat dengan ShardedSearcher."
+        )
+    arrays = {
+        name: np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r")
+        for name in stored["arrays"]
+    }
+    return arrays, stored
+
+
+def read_index_metadata(index_dir):
+    """
+    Membaca dan memvalidasi metadata.json versi aktif sebuah direktori index.
+
+    Parameters:
+        index_dir (str): Direktori index.
+
+    Returns:
+        dict: Isi metadata.json.
+
+    Raises:
+        ValueError: Jika versi format index tidak didukung.
+    """
+    metadata_path = os.path.join(resolve_index_dir(index_dir), METADATA_FILE)
+    with open(metadata_path, "r", encoding="utf-8") as file:
+        stored = json.load(file)
+    if stored.get("version") != INDEX_FORMAT_VERSION:
+        raise ValueError(
+            f"Versi index {stored.get('version')} tidak didukung, "
+            f"bangun ulang index dengan versi {INDEX_FORMAT_VERSION}."
+        )
+    return stored
+
+
+def index_signature(index_dir):
+    """
+    Ambil tanda waktu modifikasi metadata versi aktif index, digunakan sebagai key cache.
+
+    Parameters:
+        index_dir (str): Direktori index.
+
+    Returns:
+        float | None: Waktu modifikasi file metadata, atau None jika index belum ada.
+    """
+    metadata_path = os.path.join(resolve_index_dir(index_dir), METADATA_FILE)
+    if not os.path.exists(metadata_path):
+        return None
+    return os.path.getmtime(metadata_path)
@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from functools import lru_cache
+
+TEXT_CACHE_PATH = "./cache/texts.sqlite3"
+TEXT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+TEXT_CACHE_MAX_ENTRY_BYTES = 16 * 1024 * 1024
+
+
+class TextCache:
+    """
+    Cache teks hasil ekstraksi file PDF dan DOCX pada SQLite.
+
+    Key cache berisi hash konten file dan versi ekstraktor, sehingga teks dipakai ulang
+    selama isi file sama walaupun path, kamus, stopwords, atau pengaturan stemming
+    berubah, dan otomatis tidak dipakai lagi jika cara ekstraksi berubah. Teks disimpan
+    per potongan (halaman atau paragraf) dalam bentuk terkompresi. Total ukuran dibatasi
+    max_bytes; entri yang paling lama tidak diakses dibuang lebih dulu. Tabel dapat
+    dipakai bersama oleh beberapa proses.
+    """
+
+    def __init__(
+        self,
+        cache_path=TEXT_CACHE_PATH,
+        max_bytes=TEXT_CACHE_MAX_BYTES,
+        max_entry_bytes=TEXT_CACHE_MAX_ENTRY_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.connection = open_text_table(cache_path)
+
+    def get(self, content_hash, extractor):
+        """
+        Mengambil potongan teks sebuah file dari cache.
+
+        Parameters:
+            content_hash (str): Hash konten file, lihat file_hash.
+            extractor (str): Versi ekstraktor untuk format file tersebut.
+
+        Returns:
+            list | None: Potongan teks, atau None jika tidak ada di cache.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT data FROM texts WHERE hash = ? AND extractor = ?",
+                (content_hash, extractor),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE texts SET accessed = ? WHERE hash = ? AND extractor = ?",
+                    (time.time(), content_hash, extractor),
+                )
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def put(self, content_hash, extractor, chunks):
+        """
+        Menyimpan potongan teks sebuah file lalu membuang entri lama jika total ukuran
+        melebihi batas. Teks yang lebih besar dari max_entry_bytes tidak disimpan.
+
+        Parameters:
+            content_hash (str): Hash konten file, lihat file_hash.
+            extractor (str): Versi ekstraktor untuk format file tersebut.
+            chunks (list): Potongan teks hasil ekstraksi.
+        """
+        data = zlib.compress(json.dumps(chunks, ensure_ascii=False).encode("utf-8"))
+        if len(data) <= self.max_entry_bytes:
+            self.insert(content_hash, extractor, data)
+
+    def store(self, content_hash, extractor, chunks):
+        """
+        Meneruskan potongan teks satu per satu sambil mengompresinya, lalu menyimpannya
+        ke cache setelah potongan terakhir, seperti put tanpa menampung seluruh teks.
+
+        Hanya data terkompresi yang ditampung, dan penampungan dihentikan begitu
+        ukurannya melebihi max_entry_bytes. Tidak ada yang disimpan jika chunks kosong,
+        gagal di tengah jalan, atau tidak dibaca sampai habis.
+
+        Parameters:
+            content_hash (str): Hash konten file, lihat file_hash.
+            extractor (str): Versi ekstraktor untuk format file tersebut.
+            chunks (iterable): Potongan teks hasil ekstraksi.
+
+        Yields:
+            str: Potongan teks yang sama dengan chunks.
+        """
+        compressor = zlib.compressobj()
+        parts, size, count = [], 0, 0
+        for chunk in chunks:
+            if parts is not None:
+                text = ("," if count else "[") + json.dumps(chunk, ensure_ascii=False)
+                data = compressor.compress(text.encode("utf-8"))
+                parts.append(data)
+                size += len(data)
+                if size > self.max_entry_bytes:
+                    parts = None
+            count += 1
+            yield chunk
+        if parts is None or not count:
+            return
+        parts.append(compressor.compress(b"]"))
+        parts.append(compressor.flush())
+        data = b"".join(parts)
+        if len(data) <= self.max_entry_bytes:
+            self.insert(content_hash, extractor, data)
+
+    def insert(self, content_hash, extractor, data):
+        """
+        Menyimpan data terkompresi sebuah file lalu membuang entri lama jika total ukuran
+        melebihi batas.
+
+        Parameters:
+            content_hash (str): Hash konten file, lihat file_hash.
+            extractor (str): Versi ekstraktor untuk format file tersebut.
+            data (bytes): Daftar potongan teks dalam JSON yang dikompresi zlib.
+        """
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO texts (hash, extractor, data, size, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (content_hash, extractor, data, len(data), time.time()),
+            )
+            # Pertahankan entri terbaru yang total ukurannya masih di bawah batas.
+            self.connection.execute(
+                "DELETE FROM texts WHERE rowid IN ("
+                "SELECT rowid FROM (SELECT rowid, SUM(size) OVER "
+                "(ORDER BY accessed DESC, rowid DESC) AS total FROM texts) "
+                "WHERE total > ?)",
+                (self.max_bytes,),
+            )
+
+    def stats(self):
+        """
+        Mengembalikan statistik pemakaian cache.
+
+        Returns:
+            dict: Jumlah hit, miss, rasio hit, jumlah entri, total ukuran dalam byte, dan
+                batas ukuran.
+        """
+        with self.lock:
+            entries, size = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM texts"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def open_text_table(cache_path):
+    """
+    Membuka tabel teks hasil ekstraksi pada SQLite.
+
+    Parameters:
+        cache_path (str): Path ke file SQLite.
+
+    Returns:
+        sqlite3.Connection: Koneksi ke tabel teks.
+    """
+    directory = os.path.dirname(cache_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(cache_path, timeout=30, check_same_thread=False)
+    with connection:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS texts (hash TEXT NOT NULL, "
+            "extractor TEXT NOT NULL, data BLOB NOT NULL, size INTEGER NOT NULL, "
+            "accessed REAL NOT NULL, PRIMARY KEY (hash, extractor))"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS texts_accessed ON texts (accessed)"
+        )
+    return connection
+
+
+@lru_cache(maxsize=1)
+def get_shared_text_cache():
+    """
+    Mengambil cache teks hasil ekstraksi yang dipakai bersama dalam satu proses.
+
+    Returns:
+        TextCache: Cache teks hasil ekstraksi pada TEXT_CACHE_PATH.
+    """
+    return TextCache(TEXT_CACHE_PATH)
@@ -1,38 +1,39 @@
 import os
-import string
-import streamlit as st
 from collections import Counter
-from nltk.tokenize import word_tokenize
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-from utils.vsm_utils import compute_tf, compute_idf, compute_tf_idf, cosine_similarity
+from utils.discovery_utils import scan_files
+from utils.index_utils import score_query
+from utils.sparse_vsm_utils import score_query_vectorized
 from utils.document_reader_utils import (
+    DocumentError,
     load_dict,
     load_stopwords,
     read_file,
 )
+from utils.tokenizer_utils import (
+    DEFAULT_TOKENIZER,
+    align_chunks,
+    get_tokenizer,
+    iter_tokens,
+)
 
 
-def preprocess(text, stopwords):
+def preprocess(text, stopwords, tokenizer=DEFAULT_TOKENIZER):
     """
     Melakukan preprocessing teks, termasuk case folding, tokenizing, dan filtering.
 
     Args:
         text (str): Teks yang akan diproses.
         stopwords (set): Daftar stopwords untuk filtering.
+        tokenizer (str): "regex" untuk tokenizer regex atau "nltk" untuk word_tokenize.
 
     Returns:
         list: Token hasil preprocessing.
     """
-    # Tokenisasi
-    tokens = word_tokenize(text.lower())
-
-    # Menghapus tanda baca
-    tokens = [word for word in tokens if word not in string.punctuation]
+    # Tokenisasi, case folding, dan penghapusan tanda baca
+    tokens = get_tokenizer(tokenizer)(text)
 
     # Filter stopwords
-    filtered_tokens = [
-        word for word in tokens if word.isalnum() and word not in stopwords
-    ]
+    filtered_tokens = [word for word in tokens if word not in stopwords]
 
     return filtered_tokens
 
@@ -71,18 +72,18 @@ def highlight_query(text, query_tokens, stemmer):
     Returns:
         str: Teks dengan kata-kata yang cocok disorot menggunakan tag <mark>.
     """
-    words = word_tokenize(text)
     highlighted_text = []
+    position = 0
 
-    for word in words:
-        stemmed_word = stemmer.stem(word.lower())
-        if stemmed_word in query_tokens:
-            # Sorot kata yang cocok
-            highlighted_text.append(f"<mark>{word}</mark>")
-        else:
-            highlighted_text.append(word)
+    for word, start, end in iter_tokens(text):
+        if stemmer.stem(word) in query_tokens:
+            # Sorot kata yang cocok, teks di antaranya dipertahankan apa adanya
+            highlighted_text.append(text[position:start])
+            highlighted_text.append(f"<mark>{text[start:end]}</mark>")
+            position = end
 
-    return " ".join(highlighted_text)
+    highlighted_text.append(text[position:])
+    return "".join(highlighted_text)
 
 
 def validate_inputs(directory, dictionary_path, stopwords_path, query):
@@ -97,21 +98,18 @@ def validate_inputs(directory, dictionary_path, stopwords_path, query):
         query (str): Query yang diberikan oleh pengguna.
 
     Returns:
-        bool: True jika semua input valid, False jika ada yang tidak valid.
+        str | None: Pesan kesalahan untuk input pertama yang tidak valid, atau None jika
+            semua input valid.
     """
     if not os.path.exists(directory):
-        st.error(f"Direktori **{directory}** tidak ditemukan!", icon="‼️")
-        return False
+        return f"Direktori **{directory}** tidak ditemukan!"
     elif not os.path.exists(dictionary_path):
-        st.error(f"File kamus **{dictionary_path}** tidak ditemukan!", icon="‼️")
-        return False
+        return f"File kamus **{dictionary_path}** tidak ditemukan!"
     elif not os.path.exists(stopwords_path):
-        st.error(f"File stopwords **{stopwords_path}** tidak ditemukan!", icon="‼️")
-        return False
+        return f"File stopwords **{stopwords_path}** tidak ditemukan!"
     elif query == "":
-        st.error("Query tidak boleh kosong!", icon="‼️")
-        return False
-    return True
+        return "Query tidak boleh kosong!"
+    return None
 
 
 def load_resources(dictionary_path, stopwords_path):
@@ -130,7 +128,9 @@ def load_resources(dictionary_path, stopwords_path):
     return dictionary, stopwords
 
 
-def process_document(file_path, stopwords, dictionary, stemmer):
+def process_document(
+    file_path, stopwords, dictionary, stemmer, tokenizer=DEFAULT_TOKENIZER
+):
     """
     Memproses sebuah dokumen, mulai dari membaca konten file, melakukan preprocessing,
     dan mengembalikan token dan hasil stemming yang telah difilter berdasarkan kamus.
@@ -140,13 +140,17 @@ def process_document(file_path, stopwords, dictionary, stemmer):
         stopwords (list): Daftar kata-kata stopwords.
         dictionary (list): Daftar kata-kata valid dalam kamus.
         stemmer (object): Objek stemmer untuk melakukan stemming pada kata.
+        tokenizer (str): Nama tokenizer, lihat preprocess.
 
     Returns:
         dict: Sebuah dictionary yang berisi konten asli, token, stemmed tokens, dan jumlah kata dasar.
+
+    Raises:
+        DocumentError: Jika file gagal dibaca atau diproses.
     """
     try:
         content = read_file(file_path)
-        tokens = preprocess(content, stopwords)
+        tokens = preprocess(content, stopwords, tokenizer)
         stemmed_tokens = [
             stemmer.stem(token) for token in tokens if token in dictionary
         ]
@@ -156,167 +160,158 @@ def process_document(file_path, stopwords, dictionary, stemmer):
             "stemmed": stemmed_tokens,
             "stemming_count": len(stemmed_tokens),
         }
+    except DocumentError:
+        raise
     except Exception as e:
-        st.error(f"Kesalahan memproses file `{os.path.basename(file_path)}`: {e}")
-        return None
+        raise DocumentError(
+            f"Kesalahan memproses file `{os.path.basename(file_path)}`: {e}"
+        ) from e
 
 
-def process_query(query, stopwords, dictionary, stemmer):
+def count_stemmed_terms(
+    chunks, stopwords, dictionary, stemmer, tokenizer=DEFAULT_TOKENIZER, sequence=None
+):
     """
-    Memproses query pengguna dengan cara yang sama seperti dokumen, termasuk preprocessing
-    dan stemming terhadap token-token dalam query.
+    Memproses potongan-potongan teks secara bertahap dan hanya menyimpan jumlah kata dasar.
+
+    Setiap potongan di-preprocessing dan di-stem lalu dibuang, sehingga penggunaan memori
+    mengikuti ukuran potongan terbesar, bukan ukuran seluruh dokumen. Batas potongan
+    digeser dengan align_chunks agar hasilnya sama dengan memproses teks utuh.
 
     Args:
-        query (str): Query yang dimasukkan oleh pengguna.
+        chunks (iterable): Potongan teks, misalnya hasil iter_file.
         stopwords (list): Daftar kata-kata stopwords.
         dictionary (list): Daftar kata-kata valid dalam kamus.
-        stemmer (object): Objek stemmer untuk melakukan stemming.
+        stemmer (object): Objek stemmer untuk melakukan stemming pada kata.
+        tokenizer (str): Nama tokenizer, lihat preprocess.
+        sequence (list, optional): Jika diberikan, setiap kata dasar ditambahkan ke list
+            ini sesuai urutan kemunculannya.
 
     Returns:
-        list: Daftar kata dasar (stemmed tokens) dari query pengguna.
+        Counter: Jumlah kemunculan setiap kata dasar dalam dokumen.
     """
-    query_tokens = preprocess(query, stopwords)
-    stemmed_query = [
-        stemmer.stem(token) for token in query_tokens if token in dictionary
-    ]
-    return stemmed_query
+    term_counts = Counter()
+    for chunk in align_chunks(chunks):
+        terms = [
+            stemmer.stem(token)
+            for token in preprocess(chunk, stopwords, tokenizer)
+            if token in dictionary
+        ]
+        term_counts.update(terms)
+        if sequence is not None:
+            sequence.extend(terms)
+    return term_counts
 
 
-def compute_similarity(documents, query, unique_terms):
+def collect_term_positions(
+    chunks, stopwords, dictionary, stemmer, text_file, sequence=None
+):
     """
-    Menghitung kemiripan antara dokumen-dokumen dan query menggunakan metode TF-IDF dan cosine similarity.
+    Memproses potongan-potongan teks dan mencatat posisi setiap kata dasar.
+
+    Posisi berupa offset byte awal dan akhir kata asli dalam teks UTF-8 hasil
+    penggabungan seluruh potongan (sama dengan read_file untuk potongan dari iter_file),
+    sehingga potongan teks di sekitar kata tersebut dapat dibaca kembali tanpa memuat
+    seluruh dokumen. Teks ditulis ke text_file per potongan dan tidak ditampung di
+    memori. Token diambil dengan tokenizer regex karena hanya tokenizer tersebut yang
+    menyimpan offset.
 
     Args:
-        documents (list): Daftar dokumen yang sudah diproses.
-        query (list): Query yang sudah diproses.
-        unique_terms (list): Daftar istilah unik yang ada pada dokumen.
+        chunks (iterable): Potongan teks, misalnya hasil iter_file.
+        stopwords (list): Daftar kata-kata stopwords.
+        dictionary (list): Daftar kata-kata valid dalam kamus.
+        stemmer (object): Objek stemmer untuk melakukan stemming pada kata.
+        text_file (file): File biner tujuan teks dokumen dalam UTF-8.
+        sequence (list, optional): Jika diberikan, setiap kata dasar ditambahkan ke list
+            ini sesuai urutan kemunculannya.
 
     Returns:
-        list: Daftar nilai kemiripan antara setiap dokumen dengan query.
+        tuple: Jumlah kemunculan setiap kata dasar (Counter), posisi setiap kata dasar
+            berupa daftar pasangan (awal, akhir) dalam byte (dict), dan panjang teks
+            dokumen dalam byte (int).
     """
-    tf_idf_matrix, _ = compute_tf_idf(documents)
-    query_tf_idf = [
-        compute_tf(term, query) * compute_idf(term, documents) for term in unique_terms
-    ]
-    similarities = [
-        cosine_similarity(doc_vector, query_tf_idf) for doc_vector in tf_idf_matrix
-    ]
-    return similarities
-
-
-def display_results(directory, sorted_results, file_contents, stemmed_query, stemmer):
+    term_counts = Counter()
+    positions = {}
+    offset = 0
+    for chunk in align_chunks(chunks):
+        ascii_only = chunk.isascii()
+        byte_position, char_position = offset, 0
+        for token, start, end in iter_tokens(chunk):
+            if token in stopwords or token not in dictionary:
+                continue
+            if ascii_only:
+                token_start, token_end = offset + start, offset + end
+            else:
+                byte_position += len(chunk[char_position:start].encode("utf-8"))
+                token_start = byte_position
+                byte_position += len(chunk[start:end].encode("utf-8"))
+                token_end, char_position = byte_position, end
+            term = stemmer.stem(token)
+            term_counts[term] += 1
+            positions.setdefault(term, []).append((token_start, token_end))
+            if sequence is not None:
+                sequence.append(term)
+        encoded = chunk.encode("utf-8")
+        text_file.write(encoded)
+        offset += len(encoded)
+    return term_counts, positions, offset
+
+
+def list_files(directory, filters=None):
     """
-    Menampilkan hasil kemiripan antara dokumen dan query beserta informasi terkait
-    dokumen-dokumen yang relevan, termasuk konten yang disorot dan hasil preprocessing.
+    Mengambil daftar path file pada sebuah direktori beserta seluruh subdirektorinya.
 
     Args:
-        sorted_results (list): Daftar hasil yang sudah diurutkan berdasarkan kemiripan.
-        file_contents (dict): Dictionary yang berisi konten dan hasil dari setiap dokumen.
-        stemmed_query (list): Query yang sudah diproses dan di-stem.
-        stemmer (object): Objek stemmer untuk menampilkan hasil stemming.
-    """
-    with st.container(height=393, border=True):
-        cols_mr = st.columns([10.9, 0.2, 10.9])
-        with cols_mr[0].container(height=350, border=False):
-            st.write(f"#### File ditemukan dalam direktori `{directory}`:")
-            for file_path, _ in sorted_results:
-                st.write(f"- {os.path.basename(file_path)}")
-        with cols_mr[1]:
-            st.html(
-                """
-                <div class="divider-vertical-line"></div>
-                <style>
-                    .divider-vertical-line {
-                        border-left: 2px solid rgba(49, 51, 63, 0.2);
-                        height: 350px;
-                        margin: auto;
-                    }
-                </style>
-            """
-            )
-        with cols_mr[2].container(height=350, border=False):
-            st.write("#### Hasil Similiarity:")
-            for idx, (file_path, similarity) in enumerate(sorted_results, start=1):
-                st.write(
-                    f"{idx}. **{os.path.basename(file_path)}** - *Similarity*: {similarity:.4f}"
-                )
-
-    st.divider()
-
-    for idx, (file_path, similarity) in enumerate(sorted_results, start=1):
-        st.write(
-            f"#### {idx}. **{os.path.basename(file_path)}** - *Similarity*: {similarity:.4f}"
-        )
-        if similarity > 0:
-            st.write(f"###### Isi file `{os.path.basename(file_path)}`:")
-            highlighted_content = highlight_query(
-                file_contents[file_path]["original"], stemmed_query, stemmer
-            )
-            if len(highlighted_content) > 500:
-                st.markdown(highlighted_content[:1000], unsafe_allow_html=True)
-            else:
-                st.markdown(highlighted_content, unsafe_allow_html=True)
+        directory (str): Direktori yang berisi dokumen.
+        filters (dict, optional): Argumen scan_files, yaitu include, exclude, min_size,
+            dan max_size.
 
-            st.write("##### Hasil Preprocessing:")
-            st.write(file_contents[file_path]["tokens"])
-            st.write("##### Hasil Stemming:")
-            for token in file_contents[file_path]["stemmed"]:
-                st.write(f"- {token}")
-            st.write(
-                f"##### Jumlah kata dasar: {file_contents[file_path]['stemming_count']}"
-            )
-            st.divider()
+    Returns:
+        list: Daftar path file yang terurut.
+    """
+    return scan_files(directory, **(filters or {}))
 
 
-def process_documents(directory, dictionary_path, stopwords_path, query):
+def process_query(query, stopwords, dictionary, stemmer, tokenizer=DEFAULT_TOKENIZER):
     """
-    Fungsi utama untuk memproses dokumen dalam sebuah direktori, melakukan preprocessing dan
-    perhitungan kemiripan antara dokumen dengan query yang diberikan pengguna.
-
-    Fungsi ini menggabungkan beberapa proses, termasuk validasi input, pemuatan sumber daya,
-    pemrosesan dokumen dan query, perhitungan TF-IDF, dan perhitungan kemiripan menggunakan
-    cosine similarity.
+    Memproses query pengguna dengan cara yang sama seperti dokumen, termasuk preprocessing
+    dan stemming terhadap token-token dalam query.
 
     Args:
-        directory (str): Direktori yang berisi file-file yang akan diproses.
-        dictionary_path (str): Path ke file kamus yang digunakan untuk validasi token.
-        stopwords_path (str): Path ke file stopwords yang digunakan untuk menghapus kata-kata tidak penting.
-        query (str): Query dari pengguna untuk dihitung kemiripannya dengan dokumen.
+        query (str): Query yang dimasukkan oleh pengguna.
+        stopwords (list): Daftar kata-kata stopwords.
+        dictionary (list): Daftar kata-kata valid dalam kamus.
+        stemmer (object): Objek stemmer untuk melakukan stemming.
+        tokenizer (str): Nama tokenizer, lihat preprocess.
 
     Returns:
-        None: Fungsi ini tidak mengembalikan nilai, melainkan menampilkan hasil ke dalam antarmuka pengguna (UI).
+        list: Daftar kata dasar (stemmed tokens) dari query pengguna.
     """
-    if not validate_inputs(directory, dictionary_path, stopwords_path, query):
-        return
-
-    dictionary, stopwords = load_resources(dictionary_path, stopwords_path)
-
-    factory = StemmerFactory()
-    stemmer = factory.create_stemmer()
-
-    files = [
-        os.path.join(directory, f)
-        for f in os.listdir(directory)
-        if os.path.isfile(os.path.join(directory, f))
+    query_tokens = preprocess(query, stopwords, tokenizer)
+    stemmed_query = [
+        stemmer.stem(token) for token in query_tokens if token in dictionary
     ]
+    return stemmed_query
 
-    if not files:
-        st.warning(f"Tidak ada file dalam direktori **{directory}**.", icon="⚠️")
-        return
 
-    documents = []
-    file_contents = {}
-    for file_path in files:
-        result = process_document(file_path, stopwords, dictionary, stemmer)
-        if result:
-            documents.append(result["stemmed"])
-            file_contents[file_path] = result
+def compute_similarity(index, query, model=None):
+    """
+    Menghitung kemiripan antara dokumen-dokumen dan query menggunakan metode TF-IDF dan cosine similarity.
 
-    stemmed_query = process_query(query, stopwords, dictionary, stemmer)
+    Tanpa model, hanya dokumen yang memiliki term yang sama dengan query yang dihitung melalui
+    inverted index dan dokumen lainnya bernilai 0. Jika model matriks sparse diberikan, seluruh
+    dokumen dihitung dengan satu perkalian matriks.
 
-    tf_idf_matrix, unique_terms = compute_tf_idf(documents)
-    similarities = compute_similarity(documents, stemmed_query, unique_terms)
+    Args:
+        index (dict): Inverted index dari dokumen yang sudah diproses.
+        query (list): Query yang sudah diproses.
+        model (dict, optional): Model hasil build_tf_idf_matrix untuk backend vektorisasi.
 
-    sorted_results = sorted(zip(files, similarities), key=lambda x: x[1], reverse=True)
+    Returns:
+        dict: Pasangan id dokumen dan nilai kemiripannya dengan query, sesuai urutan dokumen.
+    """
+    if model is not None:
+        return score_query_vectorized(model, query)
 
-    display_results(directory, sorted_results, file_contents, stemmed_query, stemmer)
+    scores = score_query(index, query)
+    return {doc_id: scores.get(doc_id, 0) for doc_id in index["doc_lengths"]}
@@ -0,0 +1,141 @@
+import re
+import string
+
+DEFAULT_TOKENIZER = "regex"
+# Revisi aturan setiap tokenizer yang disimpan di metadata index: naikkan revisi jika
+# token yang dihasilkan berubah, sehingga index dibangun ulang dari awal.
+TOKENIZER_REVISIONS = {"regex": 2, "nltk": 1}
+
+# Karakter yang selalu memisahkan token, mengikuti aturan NLTKWordTokenizer.
+SEPARATORS = r"\s;@#$%&?!()\[\]{}<>*\"`“”‘’«»„\u2012-\u2015"
+
+# Token adalah deretan huruf/angka yang dibatasi pemisah. Tanda hubung, garis miring,
+# titik di tengah kata, dan garis bawah tidak memisahkan token, sehingga kata seperti
+# "sampai-sampai" atau "3.5" tidak dianggap token, sama seperti hasil word_tokenize
+# yang kemudian difilter dengan isalnum. Titik di akhir kata dianggap akhir kalimat.
+# Setelah angka atau satu huruf (misalnya nomor urut "1." dan "e."), titik hanya dianggap
+# akhir kalimat jika tidak diikuti huruf atau tanda baca ;:,.!?, mengikuti heuristik punkt.
+# Seperti word_tokenize, koma dan titik dua berurutan dipisahkan berpasangan, petik
+# tunggal di awal kata (misalnya 'bagus') dipisahkan kecuali diikuti kontraksi bahasa
+# Inggris, dan petik di akhir kata dipisahkan beserta kontraksi 's, 'll, n't, dan
+# sejenisnya. Kata dengan petik di tengah (misalnya "Jum'at") tidak dianggap token.
+SPACED = rf"\s|[{SEPARATORS}]|[,:](?!\d)|\.\.|--"
+QUOTE_END = rf"(?=$|{SPACED}|''|'\s|\.+[\])}}>\"']*(?:\s|$))"
+TOKEN_START = (
+    rf"(?:^|(?<=[{SEPARATORS}])|(?:(?<=(?<![,:])[,:])|(?<=(?<![,:])[,:]{{3}}))(?!\d)"
+    r"|(?<=\.\.)|(?<=(?<!-)--)|(?<=(?<!-)-{4})|(?<='')"
+    r"|(?<=(?<!\w)')(?!(?i:re|ve|ll|m|t|s|d|n)\b))"
+)
+TOKEN_END = (
+    rf"(?=$|[{SEPARATORS}]|[,:](?!\d)|\.\.|--|(?<=\w[^\W\d_])\.+[\])}}>\"']*(?:\s|$)"
+    r"|(?:(?<=\d)|(?<=(?<![^\W_])[^\W\d_]))\.(?=[\])}>\"']|\s*$|\s++(?![^\W\d_]|[;:,.!?]))"
+    rf"|''|'(?i:s|m|d|ll|re|ve)?{QUOTE_END})"
+)
+TOKEN_PATTERN = re.compile(
+    # Dua syarat pertama hanya mempercepat: posisi yang bukan awal deretan huruf/angka
+    # langsung ditolak sebelum syarat TOKEN_START diperiksa.
+    rf"(?<![^\W_])(?=[^\W_]){TOKEN_START}"
+    rf"([^\W_]++{TOKEN_END}|[^\W_]+?(?=[nN]'[tT]{QUOTE_END}))"
+)
+
+# Batas potongan teks yang aman: tepat setelah spasi yang tidak didahului titik, sehingga
+# tidak ada aturan TOKEN_PATTERN yang perlu melihat teks di seberang batas tersebut.
+CHUNK_BOUNDARY = re.compile(r"[^\s.]\s+(?=\S)")
+
+
+def align_chunks(chunks):
+    """
+    Menggeser batas potongan teks ke batas token yang aman (lihat CHUNK_BOUNDARY).
+
+    Potongan dari iter_file dapat berakhir di tengah kata, misalnya halaman PDF yang
+    digabungkan tanpa pemisah. Sisa setelah batas terakhir setiap potongan dibawa ke
+    potongan berikutnya, sehingga token setiap potongan sama dengan token teks utuh.
+
+    Parameters:
+        chunks (iterable): Potongan teks yang jika digabungkan membentuk teks utuh.
+
+    Yields:
+        str: Potongan teks yang jika digabungkan sama dengan gabungan chunks.
+    """
+    pending = ""
+    for chunk in chunks:
+        text = pending + chunk
+        boundary = None
+        for boundary in CHUNK_BOUNDARY.finditer(text):
+            pass
+        if boundary is None:
+            pending = text
+            continue
+        yield text[: boundary.end()]
+        pending = text[boundary.end() :]
+    if pending:
+        yield pending
+
+
+def iter_tokens(text):
+    """
+    Menghasilkan token alfanumerik huruf kecil beserta posisi karakternya dalam teks.
+
+    Parameters:
+        text (str): Teks yang akan ditokenisasi.
+
+    Yields:
+        tuple: Token huruf kecil, posisi awal, dan posisi akhir (eksklusif) dalam teks asli.
+    """
+    for match in TOKEN_PATTERN.finditer(text):
+        yield match.group(1).lower(), match.start(1), match.end(1)
+
+
+def regex_tokenize(text):
+    """
+    Tokenisasi teks dengan satu regex yang sudah dikompilasi.
+
+    Parameters:
+        text (str): Teks yang akan ditokenisasi.
+
+    Returns:
+        list: Token alfanumerik huruf kecil.
+    """
+    return [match.lower() for match in TOKEN_PATTERN.findall(text)]
+
+
+def nltk_tokenize(text):
+    """
+    Tokenisasi teks dengan word_tokenize NLTK lalu membuang tanda baca dan token
+    non-alfanumerik. NLTK dan model punkt baru dimuat saat fungsi ini pertama dipanggil.
+
+    Parameters:
+        text (str): Teks yang akan ditokenisasi.
+
+    Returns:
+        list: Token alfanumerik huruf kecil.
+    """
+    from nltk.tokenize import word_tokenize
+
+    return [
+        word
+        for word in word_tokenize(text.lower())
+        if word not in string.punctuation and word.isalnum()
+    ]
+
+
+TOKENIZERS = {"regex": regex_tokenize, "nltk": nltk_tokenize}
+
+
+def get_tokenizer(name=DEFAULT_TOKENIZER):
+    """
+    Mengambil fungsi tokenisasi berdasarkan namanya.
+
+    Parameters:
+        name (str): "regex" atau "nltk".
+
+    Returns:
+        callable: Fungsi yang menerima teks dan mengembalikan daftar token.
+
+    Raises:
+        ValueError: Jika nama tokenizer tidak dikenal.
+    """
+    try:
+        return TOKENIZERS[name]
+    except KeyError:
+        raise ValueError(f"Tokenizer tidak dikenal: {name}") from None
@@ -0,0 +1,362 @@
+import os
+import math
+from contextlib import nullcontext
+import streamlit as st
+from utils.document_reader_utils import DocumentError
+from utils.profiling_utils import profile_stage
+from utils.text_utils import validate_inputs
+
+MESSAGE_ICONS = {"error": "‼️", "warning": "⚠️", "info": "ℹ️"}
+RESULTS_PER_PAGE = 5
+SEARCH_STATE_KEY = "search_state"
+INDEXING_STAGES = {
+    "scan": "Memeriksa file",
+    "process": "Memproses file",
+    "save": "Menyimpan index",
+}
+
+
+def show_message(message, level="error"):
+    """
+    Menampilkan pesan ke UI sesuai tingkatannya.
+
+    Args:
+        message (str): Pesan yang ditampilkan.
+        level (str): Tingkat pesan, "error", "warning", atau "info".
+    """
+    getattr(st, level)(message, icon=MESSAGE_ICONS[level])
+
+
+def display_document_details(state, file_path, profiler=None):
+    """
+    Menampilkan cuplikan dan hasil stemming sebuah dokumen.
+
+    Cuplikan dibuat dari posisi kata yang disimpan di index dan jumlah kata dasar diambil
+    dari index, sehingga file tidak dibaca maupun diproses ulang. Detail dokumen disimpan
+    pada state hasil pencarian saat pertama kali dibuka.
+
+    Args:
+        state (dict): State hasil pencarian dari session state.
+        file_path (str): Path dokumen.
+        profiler (RequestProfiler, optional): Pencatat waktu per tahap.
+    """
+    engine = state["engine"]
+    stemmed_query = state["search_result"]["terms"]
+    details = state["details"].get(file_path)
+    if details is None:
+        try:
+            details = engine.document_details(file_path, profiler)
+        except DocumentError as e:
+            show_message(e.message, e.level)
+            return
+        state["details"][file_path] = details
+
+    st.write(f"###### Isi file `{os.path.basename(file_path)}`:")
+    snippet = engine.snippet(file_path, stemmed_query, profiler)
+    if snippet is not None:
+        st.markdown(snippet, unsafe_allow_html=True)
+    else:
+        show_message(
+            "Cuplikan tidak tersedia karena index tidak menyimpan posisi kata "
+            "(misalnya dibangun dengan tokenizer NLTK).",
+            "info",
+        )
+
+    st.write("##### Hasil Stemming:")
+    for term, count in details["counts"].items():
+        st.write(f"- {term} ({count}×)")
+    st.write(f"##### Jumlah kata dasar: {details['stemming_count']}")
+
+
+def display_results(state, profiler=None):
+    """
+    Menampilkan hasil kemiripan antara dokumen dan query beserta informasi terkait
+    dokumen-dokumen yang relevan, termasuk konten yang disorot dan hasil preprocessing.
+
+    Daftar peringkat ditampilkan lebih dulu dan dibagi per halaman. Cuplikan dan hasil
+    stemming sebuah dokumen baru diambil dari index ketika pengguna membuka detail
+    dokumen tersebut.
+
+    Args:
+        state (dict): State hasil pencarian dengan key id, directory, search_result,
+            engine, dan details.
+        profiler (RequestProfiler, optional): Pencatat waktu per tahap.
+    """
+    directory = state["directory"]
+    sorted_results = [
+        (result["file_path"], result["similarity"])
+        for result in state["search_result"]["results"]
+    ]
+
+    with st.container(height=393, border=True):
+        cols_mr = st.columns([10.9, 0.2, 10.9])
+        with cols_mr[0].container(height=350, border=False):
+            st.write(f"#### Dokumen relevan dalam direktori `{directory}`:")
+            for file_path, _ in sorted_results:
+                st.write(f"- {os.path.basename(file_path)}")
+        with cols_mr[1]:
+            st.html(
+                """
+                <div class="divider-vertical-line"></div>
+                <style>
+                    .divider-vertical-line {
+                        border-left: 2px solid rgba(49, 51, 63, 0.2);
+                        height: 350px;
+                        margin: auto;
+                    }
+                </style>
+            """
+            )
+        with cols_mr[2].container(height=350, border=False):
+            st.write("#### Hasil Similiarity:")
+            for idx, (file_path, similarity) in enumerate(sorted_results, start=1):
+                st.write(
+                    f"{idx}. **{os.path.basename(file_path)}** - *Similarity*: {similarity:.4f}"
+                )
+
+    st.divider()
+
+    pages = max(1, math.ceil(len(sorted_results) / RESULTS_PER_PAGE))
+    page = 1
+    if pages > 1:
+        page = st.number_input(
+            f"Halaman (dari {pages}):",
+            min_value=1,
+            max_value=pages,
+            key=f"results-page-{state['id']}",
+        )
+    first = (page - 1) * RESULTS_PER_PAGE
+
+    for idx, (file_path, similarity) in enumerate(
+        sorted_results[first : first + RESULTS_PER_PAGE], start=first + 1
+    ):
+        st.write(
+            f"#### {idx}. **{os.path.basename(file_path)}** - *Similarity*: {similarity:.4f}"
+        )
+        if similarity > 0 and st.toggle(
+            "Tampilkan cuplikan dan hasil stemming",
+            key=f"details-{state['id']}-{file_path}",
+        ):
+            display_document_details(state, file_path, profiler)
+        st.divider()
+
+
+def display_saved_results():
+    """
+    Menampilkan ulang hasil pencarian terakhir yang disimpan di session state, misalnya
+    setelah pengguna berpindah halaman atau membuka detail dokumen.
+    """
+    state = st.session_state.get(SEARCH_STATE_KEY)
+    if state is None:
+        return
+    display_results(state)
+    state["engine"].stemmer.flush()
+
+
+def process_documents(
+    directory,
+    dictionary_path,
+    stopwords_path,
+    query,
+    engine,
+    backend="index",
+    top_k=10,
+    profiler=None,
+):
+    """
+    Fungsi utama UI untuk mencari dokumen dalam sebuah direktori yang paling mirip dengan
+    query pengguna dan menampilkan hasilnya.
+
+    Seluruh perhitungan dilakukan oleh SearchEngine; fungsi ini hanya memvalidasi input,
+    memanggil engine, dan menampilkan hasil maupun kesalahan ke UI.
+
+    Args:
+        directory (str): Direktori yang berisi file-file yang akan diproses.
+        dictionary_path (str): Path ke file kamus yang digunakan untuk validasi token.
+        stopwords_path (str): Path ke file stopwords yang digunakan untuk menghapus kata-kata tidak penting.
+        query (str): Query dari pengguna untuk dihitung kemiripannya dengan dokumen.
+        engine (SearchEngine): Engine dengan index tersimpan yang sudah dimuat (lihat
+            build_index.py).
+        backend (str): Metode perhitungan kemiripan, "index" untuk inverted index atau
+            "sparse" untuk perkalian matriks sparse NumPy/SciPy.
+        top_k (int): Jumlah dokumen dengan kemiripan tertinggi yang ditampilkan.
+        profiler (RequestProfiler, optional): Pencatat waktu per tahap untuk permintaan ini.
+
+    Returns:
+        None: Fungsi ini tidak mengembalikan nilai, melainkan menampilkan hasil ke dalam antarmuka pengguna (UI).
+    """
+    with profiler.request() if profiler else nullcontext():
+        with profile_stage(profiler, "validate"):
+            error = validate_inputs(directory, dictionary_path, stopwords_path, query)
+        if error:
+            show_message(error)
+            return
+
+        try:
+            search_result = engine.search(query, top_k, backend, profiler)
+        except DocumentError as e:
+            show_message(e.message, e.level)
+            return
+
+        if not search_result["results"]:
+            if not engine.stats()["documents"]:
+                show_message(
+                    f"Tidak ada dokumen yang dapat diproses dalam direktori **{directory}**.",
+                    "warning",
+                )
+            else:
+                show_message("Tidak ada dokumen yang cocok dengan query.", "info")
+            return
+
+        previous = st.session_state.get(SEARCH_STATE_KEY)
+        state = {
+            "id": previous["id"] + 1 if previous else 0,
+            "directory": directory,
+            "search_result": search_result,
+            "engine": engine,
+            "details": {},
+        }
+        st.session_state[SEARCH_STATE_KEY] = state
+
+        with profile_stage(profiler, "display"):
+            display_results(state, profiler)
+        engine.stemmer.flush()
+
+    stats = engine.stats()
+    stem_stats = stats["stem_cache"]
+    caption = (
+        f"Cache stemming: {stem_stats['table_hits']} hit tabel, "
+        f"{stem_stats['hits']} hit memori, {stem_stats['disk_hits']} hit disk, "
+        f"{stem_stats['misses']} miss (hit rate {stem_stats['hit_rate']:.1%})."
+    )
+    if stats["duplicates"]:
+        caption += f" {stats['duplicates']} file duplikat tidak diindeks."
+    if search_result["cached"]:
+        caption += " Hasil pencarian diambil dari cache."
+    st.caption(caption)
+
+
+def format_duration(seconds):
+    """
+    Mengubah durasi dalam detik menjadi teks singkat.
+
+    Args:
+        seconds (float): Durasi dalam detik.
+
+    Returns:
+        str: Durasi, misalnya "42 detik", "3 menit 5 detik", atau "1 jam 20 menit".
+    """
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} detik"
+    if seconds < 3600:
+        return f"{seconds // 60} menit {seconds % 60} detik"
+    return f"{seconds // 3600} jam {seconds % 3600 // 60} menit"
+
+
+@st.fragment(run_every=1)
+def display_indexing_progress(job):
+    """
+    Menampilkan progres pembangunan index di latar belakang: jumlah file yang sudah
+    diproses, kecepatan, dan perkiraan sisa waktu.
+
+    Bagian ini diperbarui setiap detik tanpa menjalankan ulang seluruh aplikasi. Setelah
+    pekerjaan selesai, seluruh aplikasi dijalankan ulang agar index baru dimuat.
+
+    Args:
+        job (BackgroundJob): Pekerjaan build_index yang sedang berjalan.
+    """
+    progress = job.progress()
+    if progress["status"] != "running":
+        st.rerun()
+
+    text = INDEXING_STAGES.get(progress["stage"], "Menyiapkan index")
+    if progress["stage"] in ("scan", "process"):
+        text += f": {progress['done']}/{progress['total']} file"
+        if progress["rate"]:
+            text += f", {progress['rate']:.1f} file/detik"
+        if progress["eta_s"] is not None:
+            text += f", sisa sekitar {format_duration(progress['eta_s'])}"
+    text += f" (berjalan {format_duration(progress['elapsed_s'])})"
+    st.progress(progress["fraction"], text=text)
+
+
+def display_indexing_result(job):
+    """
+    Menampilkan ringkasan pekerjaan build_index yang sudah selesai, beserta diagnostik
+    build jika pekerjaan dijalankan dengan profiler.
+
+    Args:
+        job (BackgroundJob): Pekerjaan build_index yang sudah selesai.
+    """
+    if job.error is not None:
+        show_message(f"Index gagal dibangun: {job.error}")
+        return
+    _, changes = job.result
+    st.success(
+        f"Index diperbarui dalam {format_duration(job.progress()['elapsed_s'])}: "
+        f"{len(changes['added'])} file ditambahkan, {len(changes['modified'])} diubah, "
+        f"{len(changes['removed'])} dihapus, {len(changes['duplicates'])} duplikat "
+        "dilewati.",
+        icon="✅",
+    )
+    for error in changes["errors"]:
+        show_message(
+            f"Gagal memproses `{os.path.basename(error['file_path'])}`: {error['message']}"
+        )
+    if job.kwargs.get("profiler") is not None:
+        display_diagnostics(job.kwargs["profiler"])
+
+
+def display_diagnostics(profiler, container=st.sidebar):
+    """
+    Menampilkan panel diagnostik berisi waktu per tahap, waktu per file, dan profil cProfile.
+
+    Args:
+        profiler (RequestProfiler): Profiler permintaan yang sudah selesai.
+        container (DeltaGenerator): Tempat panel ditampilkan, bawaan sidebar.
+    """
+    report = profiler.report()
+    with container.expander("Diagnostik permintaan", expanded=True):
+        st.write(f"Total waktu: **{report['total_s'] * 1000:.1f} ms**")
+        st.dataframe(
+            [
+                {
+                    "Tahap": name,
+                    "Panggilan": stage["calls"],
+                    "Waktu (ms)": round(stage["total_s"] * 1000, 2),
+                    "Token": stage.get("tokens"),
+                }
+                for name, stage in report["stages"].items()
+            ],
+            hide_index=True,
+        )
+        if report["files"]:
+            st.write("Waktu per file:")
+            st.dataframe(
+                [
+                    {
+                        "File": os.path.basename(item["file_path"]),
+                        "Ekstraksi (ms)": round(item["extract_s"] * 1000, 2),
+                        "Analisis (ms)": round(item["analyze_s"] * 1000, 2),
+                        "Token": item["tokens"],
+                    }
+                    for item in report["files"]
+                ],
+                hide_index=True,
+            )
+        for name, stats in report["caches"].items():
+            st.write(
+                f"Cache `{name}`: {stats['entries']}/{stats['maxsize']} entri, "
+                f"{stats['hits']} hit, {stats['misses']} miss "
+                f"(hit rate {stats['hit_rate']:.1%})."
+            )
+        if profiler.cprofile_report:
+            st.write("Profil cProfile:")
+            st.code(profiler.cprofile_report, language="text")
+        st.download_button(
+            "Unduh log diagnostik (JSON)",
+            profiler.to_json(),
+            file_name="diagnostik.json",
+            mime="application/json",
+        )
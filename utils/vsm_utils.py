@@ -30,6 +30,20 @@ def compute_idf(term, documents):
     """
     doc_count = sum(1 for doc in documents if term in doc)
     total_docs = len(documents)
+    return compute_idf_from_df(doc_count, total_docs)
+
+
+def compute_idf_from_df(doc_count, total_docs):
+    """
+    Hitung IDF dari document frequency yang sudah diketahui.
+
+    Parameters:
+        doc_count (int): Jumlah dokumen yang mengandung term (document frequency).
+        total_docs (int): Jumlah seluruh dokumen.
+
+    Returns:
+        float: Nilai IDF untuk term.
+    """
     return math.log10(total_docs / (1 + doc_count)) if doc_count != 0 else 0
 
 